@@ -0,0 +1,107 @@
+"""
+Audio device arbitration for the interview
+Text-to-speech playback and microphone capture must not use the audio device
+at the same time. Instead of sleeping for a fixed time after every prompt, each
+side acquires the device from the arbiter and releases it when it is really
+done, so the other side can start as soon as the device is free. Each
+interview has its own arbiter, so one candidate's open microphone never
+holds up another candidate's prompts.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+PLAYBACK = 'playback'
+CAPTURE = 'capture'
+
+# Longest wait for the device. A holder that never releases it is a bug, and a
+# timeout turns it into an error instead of hanging the interview
+DEFAULT_TIMEOUT = 30.0
+
+
+class AudioDeviceArbiter:
+    """Gives the audio device to TTS playback or microphone capture, one at a time"""
+
+    def __init__(self, settle=0.15):
+        self.settle = settle  # Seconds the driver gets between one owner releasing and the next starting
+        self._cond = threading.Condition()
+        self.owner = None
+        self._released_at = 0.0
+        self.playback_done = threading.Event()  # Set while no TTS is playing
+        self.capture_done = threading.Event()  # Set while the microphone is closed
+        self.playback_done.set()
+        self.capture_done.set()
+
+    def _done_event(self, owner):
+        return self.playback_done if owner == PLAYBACK else self.capture_done
+
+    def acquire(self, owner, timeout=DEFAULT_TIMEOUT):
+        """Wait until the device is free and has settled, then take it. Returns False on timeout"""
+        deadline = None if timeout is None else time.time() + timeout
+        with self._cond:
+            while True:
+                now = time.time()
+                settle_left = self._released_at + self.settle - now
+                if self.owner is None and settle_left <= 0:
+                    break
+                wait = settle_left if self.owner is None else None
+                if deadline is not None:
+                    if now >= deadline:
+                        return False
+                    wait = min(wait, deadline - now) if wait is not None else deadline - now
+                self._cond.wait(wait)
+            self.owner = owner
+            self._done_event(owner).clear()
+            return True
+
+    def release(self, owner):
+        with self._cond:
+            if self.owner != owner:
+                return
+            self.owner = None
+            self._released_at = time.time()
+            self._done_event(owner).set()
+            self._cond.notify_all()
+
+    @contextmanager
+    def use(self, owner, timeout=DEFAULT_TIMEOUT):
+        """Hold the device for the duration of the with block"""
+        if not self.acquire(owner, timeout):
+            raise TimeoutError(f"audio device busy ({self.owner})")
+        try:
+            yield self
+        finally:
+            self.release(owner)
+
+    def speaking(self, timeout=DEFAULT_TIMEOUT):
+        return self.use(PLAYBACK, timeout)
+
+    def listening(self, timeout=DEFAULT_TIMEOUT):
+        return self.use(CAPTURE, timeout)
+
+
+class HandoffStats:
+    """Seconds from a prompt ending to the microphone opening, across all interviews"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._handoffs = []
+
+    def record(self, seconds):
+        """Record how long listening started after the prompt ended"""
+        with self._lock:
+            self._handoffs.append(seconds)
+            del self._handoffs[:-500]  # Keep recent samples only
+
+    def stats(self):
+        with self._lock:
+            handoffs = sorted(self._handoffs)
+        if not handoffs:
+            return {'handoffs': 0}
+        return {
+            'handoffs': len(handoffs),
+            'handoff_avg_ms': round(sum(handoffs) / len(handoffs) * 1000, 1),
+            'handoff_p50_ms': round(handoffs[len(handoffs) // 2] * 1000, 1),
+            'handoff_max_ms': round(handoffs[-1] * 1000, 1)
+        }
@@ -0,0 +1,900 @@
+"""
+Benchmarks and load tests for the web application
+Run with: python benchmarks.py <name> [options]
+"""
+
+import argparse
+import threading
+import time
+
+BENCHMARKS = {}
+
+
+def benchmark(func):
+    """Register a benchmark under its function name"""
+    BENCHMARKS[func.__name__] = func
+    return func
+
+
+def print_header(title):
+    print("=" * 60)
+    print(title)
+    print("=" * 60)
+
+
+# --- Sessions load test ---
+UTTERANCES = 5
+
+
+def simulated_listen_speech(practice, utterances=UTTERANCES, delay=0.05):
+    """Stand-in for the microphone thread - feeds canned utterances into a session"""
+    import web_app
+    for i in range(utterances):
+        if not practice.is_recording:
+            break
+        text = f"{practice.scroll_text} attempt {i}"
+        practice.add_result(text, web_app.analyze_text_softskills(text))
+        time.sleep(delay)
+
+
+def simulated_interview_thread(interview, delay=0.05):
+    """Stand-in for the interview thread - answers every question with a fixed reply"""
+    while interview.active and interview.current_question_index < len(interview.questions):
+        question = interview.questions[interview.current_question_index]
+        interview.post_message('ai', question)
+        time.sleep(delay)
+        answer = f"My answer to question {interview.current_question_index + 1}"
+        interview.post_message('user', answer)
+        interview.add_response(question, answer)
+    interview.active = False
+
+
+def run_simulated_candidate(app, index, results, rounds):
+    """One browser: a practice recording followed by a full interview"""
+    client = app.test_client()
+    errors = []
+    latencies = []
+
+    def timed(method, url, **kwargs):
+        start = time.perf_counter()
+        response = getattr(client, method)(url, **kwargs)
+        latencies.append(time.perf_counter() - start)
+        return response.get_json()
+
+    started = timed('post', '/start_recording')
+    if started.get('status') != 'started':
+        errors.append(f"start_recording: {started}")
+    for _ in range(rounds):
+        feedback = timed('get', '/get_feedback')
+        if feedback.get('text') and not feedback['text'].startswith(started['text']):
+            errors.append("feedback from another session")
+        time.sleep(0.02)
+    stopped = timed('post', '/stop_recording')
+    if stopped.get('status') != 'stopped':
+        errors.append(f"stop_recording: {stopped}")
+    elif stopped['report']['session_summary'].get('total_segments', 0) > UTTERANCES:
+        errors.append("transcript mixed with another session")
+
+    timed('post', '/start_interview')
+    seen = []
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        state = timed('get', '/get_interview_state')
+        seen.extend(state['new_messages'])
+        if state['interview_complete']:
+            break
+        time.sleep(0.02)
+    answers = [m for m in seen if m['type'] == 'user']
+    if len(answers) != state['questions_answered']:
+        errors.append(f"saw {len(answers)} answers, server reports {state['questions_answered']}")
+
+    results[index] = (errors, latencies)
+
+
+@benchmark
+def sessions(args):
+    """Run N simulated candidates against one app instance in parallel"""
+    import web_app
+    web_app.listen_speech = simulated_listen_speech
+    web_app.interview_conversation_thread = simulated_interview_thread
+    web_app.app.config['TESTING'] = True
+
+    print_header(f"SESSIONS LOAD TEST - {args.n} parallel candidates")
+    results = [None] * args.n
+    threads = [threading.Thread(target=run_simulated_candidate,
+                                args=(web_app.app, i, results, args.rounds))
+               for i in range(args.n)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(l for _, lats in results for l in lats)
+    failures = [(i, e) for i, (e, _) in enumerate(results) if e]
+    print(f"Sessions in registry: {len(web_app.sessions)}")
+    print(f"Requests: {len(latencies)} in {elapsed:.2f}s ({len(latencies) / elapsed:.0f} req/s)")
+    print(f"Latency p50: {latencies[len(latencies) // 2] * 1000:.1f} ms, "
+          f"p99: {latencies[int(len(latencies) * 0.99)] * 1000:.1f} ms")
+    for i, errors in failures:
+        print(f"❌ Candidate {i}: {'; '.join(errors)}")
+    print("✅ All sessions isolated" if not failures else f"❌ {len(failures)} sessions failed")
+    return not failures
+
+
+# --- Video feed encode cache ---
+@benchmark
+def video_encode(args):
+    """Compare per-client JPEG encoding with the shared encode cache for N viewers"""
+    import numpy as np
+    import cv2
+    from camera_stream import EncodedFrameCache
+
+    print_header(f"VIDEO ENCODE - {args.n} viewers, {args.rounds} frames")
+    rng = np.random.default_rng(0)
+    frames = [rng.integers(0, 255, (480, 640, 3), dtype=np.uint8) for _ in range(args.rounds)]
+    overlay = (False, "", 0, None)
+
+    start = time.perf_counter()
+    for frame in frames:
+        for _ in range(args.n):
+            cv2.imencode('.jpg', frame.copy())
+    per_client = time.perf_counter() - start
+
+    cache = EncodedFrameCache()
+    start = time.perf_counter()
+    for version, frame in enumerate(frames, 1):
+        for _ in range(args.n):
+            cache.get(version, overlay, 95, None, frame.copy)
+    cached = time.perf_counter() - start
+
+    print(f"Per-client encode: {per_client * 1000 / args.rounds:.2f} ms/frame")
+    print(f"Shared cache:      {cached * 1000 / args.rounds:.2f} ms/frame "
+          f"({cache.encodes} encodes, {cache.hits} hits)")
+    print(f"Speedup: {per_client / cached:.1f}x")
+
+
+# --- Overlay compositing ---
+def legacy_overlay(frame, scroll_text, scroll_x, feedback_lines):
+    """The original per-frame overlay: full-frame copy, addWeighted and putText calls"""
+    import cv2
+    overlay = frame.copy()
+    cv2.rectangle(overlay, (0, 10), (frame.shape[1], 60), (0, 0, 0), -1)
+    cv2.addWeighted(overlay, 0.5, frame, 0.5, 0, frame)
+    cv2.putText(frame, scroll_text, (scroll_x, 45), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 255), 2)
+    y_offset = 80
+    for line in feedback_lines:
+        cv2.putText(frame, line, (10, y_offset), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
+        y_offset += 30
+
+
+@benchmark
+def overlay(args):
+    """Per-frame cost of the practice overlays: legacy drawing vs the cached compositor"""
+    import numpy as np
+    from overlays import OverlayCompositor
+
+    frames = args.rounds * 10
+    print_header(f"OVERLAY COMPOSITING - {frames} frames at 640x480")
+    rng = np.random.default_rng(0)
+    base = rng.integers(0, 255, (480, 640, 3), dtype=np.uint8)
+    scroll_text = "Effective communication is the cornerstone of professional success in any field"
+    feedback_lines = ["Confidence: 21.4/30", "Clarity: 25.0/30", "Fluency: 14.2/20", "Total: 60.6/80"]
+    # Scroll positions as PracticeSession.overlay_state produces them, wrapping around
+    cycle = (640 + len(scroll_text) * 15) // 3
+    positions = [640 - 3 * (i % cycle) for i in range(frames)]
+
+    legacy_frame = base.copy()
+    start = time.perf_counter()
+    for x in positions:
+        legacy_frame[:] = base
+        legacy_overlay(legacy_frame, scroll_text, x, feedback_lines)
+    legacy = time.perf_counter() - start
+
+    compositor = OverlayCompositor()
+    frame = base.copy()
+    start = time.perf_counter()
+    for x in positions:
+        frame[:] = base
+        compositor.banner(frame, 10, 60, 0.5)
+        compositor.text(frame, [(scroll_text, (0, 255, 255))], (x, 45), 0.8, 2)
+        compositor.text(frame, [(line, (0, 255, 0)) for line in feedback_lines], (10, 80), 0.6, 2)
+    composited = time.perf_counter() - start
+
+    print(f"Legacy:     {legacy * 1e6 / frames:.0f} µs/frame")
+    print(f"Compositor: {composited * 1e6 / frames:.0f} µs/frame ({compositor.layers_built} layers built)")
+    print(f"Speedup: {legacy / composited:.1f}x")
+
+    # Compare every scroll position once, including those where the frame edges cut the text
+    for x in range(640, 640 - 3 * cycle, -3):
+        legacy_frame[:] = base
+        legacy_overlay(legacy_frame, scroll_text, x, feedback_lines)
+        frame[:] = base
+        compositor.banner(frame, 10, 60, 0.5)
+        compositor.text(frame, [(scroll_text, (0, 255, 255))], (x, 45), 0.8, 2)
+        compositor.text(frame, [(line, (0, 255, 0)) for line in feedback_lines], (10, 80), 0.6, 2)
+        if not np.array_equal(frame, legacy_frame):
+            print(f"⚠️ Output differs from legacy drawing at scroll position {x}")
+            return False
+    print(f"✅ Output identical to legacy drawing at all {cycle} scroll positions")
+    return True
+
+
+# --- Speech recognition pool ---
+@benchmark
+def transcription(args):
+    """Throughput of the transcription pool with a fixed-latency fake backend"""
+    import numpy as np
+    import speech_recognition as sr
+    from transcription import FakeBackend, TranscriptionService
+
+    utterances = args.n * args.rounds
+    print_header(f"TRANSCRIPTION POOL - {utterances} utterances, 200 ms backend")
+    rng = np.random.default_rng(0)
+    audio = [sr.AudioData(rng.integers(-3000, 3000, 16000, dtype=np.int16).tobytes(), 16000, 2)
+             for _ in range(utterances)]
+    for workers in (1, 4, 8):
+        service = TranscriptionService(FakeBackend(delay=0.2), max_workers=workers)
+        start = time.perf_counter()
+        futures = [service.submit(a) for a in audio]
+        for f in futures:
+            f.result()
+        elapsed = time.perf_counter() - start
+        stats = service.stats()
+        print(f"{workers} workers: {utterances / elapsed:.1f} utterances/s, "
+              f"p50 {stats['latency_p50_ms']} ms, p95 {stats['latency_p95_ms']} ms")
+
+
+# --- Interview turn-taking ---
+LEGACY_TURN_GAP = 0.5 + 3.0  # speak_text_sync's trailing sleeps plus the pause before listening
+
+
+@benchmark
+def turn_taking(args):
+    """Gap between a prompt ending and the microphone opening: fixed sleeps vs the audio device arbiter"""
+    from audio_device import AudioDeviceArbiter, CAPTURE
+
+    print_header(f"TURN TAKING - {args.rounds} prompts")
+    arbiter = AudioDeviceArbiter()
+    gaps = []
+    for _ in range(args.rounds):
+        opened = []
+
+        def capture():
+            with arbiter.use(CAPTURE):
+                opened.append(time.time())
+
+        with arbiter.speaking():
+            listener = threading.Thread(target=capture)
+            listener.start()  # The microphone is requested while the prompt is still playing
+            time.sleep(0.05)
+            ended = time.time()
+        listener.join()
+        gaps.append(opened[0] - ended)
+
+    gaps.sort()
+    print(f"Legacy fixed sleeps: {LEGACY_TURN_GAP * 1000:.0f} ms per turn")
+    print(f"Arbiter handoff: p50 {gaps[len(gaps) // 2] * 1000:.0f} ms, max {gaps[-1] * 1000:.0f} ms "
+          f"(settle {arbiter.settle * 1000:.0f} ms)")
+    return gaps[-1] < LEGACY_TURN_GAP
+
+
+# --- Speculative interviewer replies ---
+@benchmark
+def speculation(args):
+    """Reply latency after an answer ends: composing afterwards vs drafting from partial transcripts"""
+    from concurrent.futures import ThreadPoolExecutor
+    from speculation import SpeculativeReply
+
+    compose_delay = 0.8  # A typical LLM round trip
+    print_header(f"SPECULATIVE REPLIES - {args.rounds} answers, {compose_delay * 1000:.0f} ms composer")
+
+    def compose(text):
+        time.sleep(compose_delay)
+        return f"Thanks for telling me about {text.split()[-1]}."
+
+    answer = "i led a small team that rebuilt our billing service in python and cut costs".split()
+    executor = ThreadPoolExecutor(max_workers=2)
+    legacy, speculative = [], []
+    for _ in range(args.rounds):
+        start = time.perf_counter()
+        compose(" ".join(answer))
+        legacy.append(time.perf_counter() - start)
+
+        reply = SpeculativeReply(executor, compose)
+        for words in range(1, len(answer) + 1):  # Partial transcripts arrive as the candidate talks
+            reply.update(" ".join(answer[:words]))
+            time.sleep(0.15)
+        start = time.perf_counter()
+        reply.reply(" ".join(answer))
+        speculative.append(time.perf_counter() - start)
+
+    legacy.sort()
+    speculative.sort()
+    print(f"Compose after answer: p50 {legacy[len(legacy) // 2] * 1000:.0f} ms")
+    print(f"Drafted while listening: p50 {speculative[len(speculative) // 2] * 1000:.0f} ms, "
+          f"max {speculative[-1] * 1000:.0f} ms")
+    return speculative[-1] < legacy[0]
+
+
+# --- AI client ---
+@benchmark
+def llm(args):
+    """LLM client against the fake model: cache hits, timeouts with fallback, and rate limiting"""
+    from llm_client import FakeModel, LLMClient, LLMUnavailable
+
+    print_header(f"LLM CLIENT - {args.n} parallel callers")
+    client = LLMClient(FakeModel(delay=0.2), max_workers=4, rate=50, burst=10)
+    prompts = [f"Generate questions for resume {i % 5}" for i in range(args.n)]
+    outcomes = {'ok': 0, 'fallback': 0}
+    lock = threading.Lock()
+
+    def call(prompt, timeout):
+        try:
+            client.generate(prompt, timeout=timeout)
+            result = 'ok'
+        except (LLMUnavailable, RuntimeError):
+            result = 'fallback'
+        with lock:
+            outcomes[result] += 1
+
+    def run(timeout):
+        threads = [threading.Thread(target=call, args=(p, timeout)) for p in prompts]
+        start = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return time.perf_counter() - start
+
+    elapsed = run(5.0)
+    print(f"Cold: {elapsed * 1000:.0f} ms, {outcomes}")
+    elapsed = run(5.0)
+    print(f"Warm (cached): {elapsed * 1000:.0f} ms")
+
+    slow = LLMClient(FakeModel(delay=2.0), timeout=0.3)
+    start = time.perf_counter()
+    try:
+        slow.generate("slow prompt")
+    except LLMUnavailable as e:
+        print(f"Slow model: fell back after {(time.perf_counter() - start) * 1000:.0f} ms ({e})")
+
+    flaky = LLMClient(FakeModel(fail_every=2), retries=1)
+    flaky.generate("first call succeeds")
+    flaky.generate("second call fails once, then the retry succeeds")
+    limited = LLMClient(FakeModel(), rate=0.1, burst=2)
+    for i in range(4):
+        try:
+            limited.generate(f"burst {i}", timeout=0.1)
+        except LLMUnavailable:
+            pass
+    print(f"Flaky model: {flaky.stats()['errors']} error retried")
+    print(f"Rate limited: {limited.stats()['rate_limited']} of 4 burst calls")
+    print(f"Stats: {client.stats()}")
+    return client.stats()['cache_hits'] >= args.n and slow.stats()['timeouts'] == 1
+
+
+# --- Resume PDF extraction ---
+def write_synthetic_pdf(path, pages, lines_per_page=40):
+    """Write a plain-text PDF with the given number of pages (no PDF library needed)"""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None,
+               "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for page in range(pages):
+        lines = [f"Page {page + 1} line {i}: Python developer who led a team project on machine learning"
+                 for i in range(lines_per_page)]
+        stream = "BT /F1 9 Tf 40 800 Td 11 TL " + " ".join(f"({line}) '" for line in lines) + " ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>")
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {pages} >>"
+
+    out = "%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n"
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n"
+    with open(path, 'w', encoding='latin-1') as f:
+        f.write(out)
+
+
+def legacy_extract_text_from_pdf(pdf_path):
+    import PyPDF2
+    text = ""
+    with open(pdf_path, 'rb') as file:
+        pdf_reader = PyPDF2.PdfReader(file)
+        for page in pdf_reader.pages:
+            text += page.extract_text() + "\n"
+    return text.strip()
+
+
+@benchmark
+def pdf_extract(args):
+    """Resume PDF extraction on synthetic 1-200 page documents: legacy loop vs streaming with caps"""
+    import os
+    import tempfile
+    from pdf_extract import extract_pdf_text
+
+    print_header(f"PDF EXTRACTION - synthetic resumes, {os.cpu_count()} CPUs")
+    ok = True
+    with tempfile.TemporaryDirectory() as folder:
+        for pages in (1, 2, 10, 50, 200):
+            path = os.path.join(folder, f"resume_{pages}.pdf")
+            write_synthetic_pdf(path, pages)
+
+            start = time.perf_counter()
+            legacy = legacy_extract_text_from_pdf(path)
+            legacy_time = time.perf_counter() - start
+            start = time.perf_counter()
+            capped = extract_pdf_text(path)
+            capped_time = time.perf_counter() - start
+            start = time.perf_counter()
+            full = extract_pdf_text(path, max_chars=None, max_pages=None, budget=60)
+            full_time = time.perf_counter() - start
+
+            ok = ok and legacy.startswith(capped) and full == legacy
+            print(f"{pages:>3} pages: legacy {legacy_time * 1000:7.1f} ms ({len(legacy)} chars) | "
+                  f"capped {capped_time * 1000:6.1f} ms ({len(capped)} chars) | "
+                  f"uncapped {full_time * 1000:7.1f} ms")
+    print("✅ Extracted text matches the legacy extractor" if ok else "❌ Extracted text differs")
+    return ok
+
+
+# --- Skill keyword index ---
+@benchmark
+def skill_index(args):
+    """Topic matching over answers: substring scans and per-topic regexes vs one compiled trie regex"""
+    import random
+    from skill_index import SkillIndex, SkillTaxonomy, _compile_terms, _parse_term
+
+    taxonomy = SkillTaxonomy()
+    # The legacy code ran one any(word in text) scan per topic, and matched inside words
+    legacy_topics = {name: [t.rstrip('*') for t in topic['terms']] for name, topic in taxonomy.answer_topics.items()}
+    rng = random.Random(0)
+    words = ("i maintained our data pipeline and worked with the team to build machine learning "
+             "services while mentoring new people on difficult problems in the company").split()
+    answers = [" ".join(rng.choice(words) for _ in range(60)) for _ in range(args.n * args.rounds)]
+    print_header(f"SKILL INDEX - {len(answers)} answers")
+
+    def legacy(text):
+        text_lower = text.lower()
+        return [name for name, terms in legacy_topics.items() if any(t in text_lower for t in terms)]
+
+    answer_terms = {name: topic['terms'] for name, topic in taxonomy.answer_topics.items()}
+    for label, topics in (("7 topics", answer_terms),
+                          ("500 skills", {f"skill{i}": [f"skillword{i}", f"tool{i}*"] for i in range(500)})):
+        index = SkillIndex(topics)
+        plain_topics = {name: [t.rstrip('*') for t in terms] for name, terms in topics.items()}
+        # Whole-word matching done naively: one regex per topic, each searched in turn
+        per_topic = {name: _compile_terms([_parse_term(term) for term in terms]) for name, terms in topics.items()}
+        timings = {'substring': float('inf'), 'per-topic': float('inf'), 'index': float('inf')}
+        for _ in range(5):  # Best of 5 passes
+            start = time.perf_counter()
+            for text in answers:
+                text_lower = text.lower()
+                [name for name, terms in plain_topics.items() if any(t in text_lower for t in terms)]
+            timings['substring'] = min(timings['substring'], time.perf_counter() - start)
+            start = time.perf_counter()
+            for text in answers:
+                text_lower = text.lower()
+                [name for name, pattern in per_topic.items() if pattern.search(text_lower)]
+            timings['per-topic'] = min(timings['per-topic'], time.perf_counter() - start)
+            start = time.perf_counter()
+            for text in answers:
+                index.match(text)
+            timings['index'] = min(timings['index'], time.perf_counter() - start)
+        print(f"{label}: substring scans {timings['substring'] * 1000:.1f} ms (match inside words), "
+              f"per-topic regexes {timings['per-topic'] * 1000:.1f} ms, "
+              f"trie regex {timings['index'] * 1000:.1f} ms")
+
+    ok = True
+    for sample, expected in (("I maintain the main pipeline", []),
+                             ("We do machine learning on our data", ['skills', 'ai']),
+                             ("Working with people", ['career', 'team'])):
+        found = taxonomy.answers.match(sample)
+        ok = ok and found == expected
+        print(f"'{sample}': legacy {legacy(sample)}, index {found}")
+    languages = SkillIndex({'c++': ['c++'], 'c#': ['c#'], 'c': ['c']})
+    ok = ok and languages.match("C++, C# and C") == ['c++', 'c#', 'c'] and languages.match("abc++ c#x") == []
+    print("✅ Whole words and phrases matched" if ok else "❌ Unexpected topics")
+    return ok
+
+
+# --- Soft-skill scoring ---
+GOLDEN_ANSWERS = [
+    "I am a software developer with five years of experience in Python and Java.",
+    "Um, I think, uh, I like working with people, you know.",
+    "My biggest challenge was a difficult migration. We planned it carefully and finished early.",
+    "I dont realy know how to explane it but I workd on a machien lerning projct last yeer.",
+    "Honestly it was terrible and I hated it. The team was bad.",
+    "Yes.",
+    "",
+    "I led a team of six engineers. We shipped the product on time! Customers loved it?",
+    "So like, um, basically I was like responsible for the, uh, the backend and like the database.",
+    "Leadership means listening first, then deciding. I mentor two junior developers every week.",
+    "My goal is to grow into an architect role and build reliable systems at scale.",
+    "The Quick brown fox jumpd over the lazzy dog near the rivr bank in Sumer.",
+]
+
+
+def legacy_analyze_text_softskills(text):
+    from textblob import TextBlob
+    feedback = {}
+    blob = TextBlob(text)
+    feedback["confidence"] = round(((blob.sentiment.polarity + 1) / 2) * 30, 1)
+    try:
+        corrected = blob.correct()
+        errors = len(str(corrected).split()) - len(str(blob).split())
+        clarity_score = max(0, 30 - abs(errors) * 5)
+    except Exception:
+        clarity_score = 25
+    feedback["clarity"] = round(clarity_score, 1)
+    sentences = text.split(".")
+    avg_sentence_length = sum(len(s.split()) for s in sentences) / max(1, len(sentences))
+    filler_words = sum(text.lower().count(w) for w in ["um", "uh", "like", "you know"])
+    feedback["fluency"] = round(min(max(avg_sentence_length * 3 - filler_words * 5, 0), 20), 1)
+    feedback["score"] = round(feedback["confidence"] + feedback["clarity"] + feedback["fluency"], 1)
+    return feedback
+
+
+FILLER_CASES = [
+    ("I carried an umbrella and will likely stay.", 0),
+    ("Um, I think, uh, I like working with people, you know.", 4),
+    ("So basically I was, I mean, kind of responsible for it.", 3),
+]
+
+
+@benchmark
+def soft_skills(args):
+    """Soft-skill scoring of a golden answer set: TextBlob per utterance vs the cached batch scorer"""
+    from soft_skills import SoftSkillScorer
+
+    answers = GOLDEN_ANSWERS * args.rounds
+    print_header(f"SOFT-SKILL SCORING - {len(answers)} answers")
+
+    start = time.perf_counter()
+    expected = [legacy_analyze_text_softskills(text) for text in answers]
+    legacy_time = time.perf_counter() - start
+
+    scorer = SoftSkillScorer()
+    start = time.perf_counter()
+    single = [scorer.score(text) for text in answers]
+    single_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = scorer.score_batch(answers)
+    batch_time = time.perf_counter() - start
+
+    # Confidence and clarity are unchanged; fluency now counts whole-word fillers and real sentences
+    keys = ("confidence", "clarity")
+    mismatches = [text for text, a, b, c in zip(answers, expected, single, batch)
+                  if b != c or any(a[k] != b[k] for k in keys)]
+    fluency_changed = sum(a["fluency"] != b["fluency"] for a, b in zip(expected[:len(GOLDEN_ANSWERS)], single))
+    print(f"Legacy TextBlob: {legacy_time * 1000:.0f} ms")
+    print(f"Scorer, one by one (cold cache): {single_time * 1000:.0f} ms ({legacy_time / single_time:.1f}x)")
+    print(f"Scorer, score_batch (warm cache): {batch_time * 1000:.0f} ms ({legacy_time / batch_time:.1f}x)")
+    print(f"Correction cache: {scorer.stats()}")
+    print(f"Fluency changed for {fluency_changed} of {len(GOLDEN_ANSWERS)} golden answers")
+    for text in mismatches[:5]:
+        print(f"❌ Score differs for: {text!r}")
+
+    filler_ok = True
+    for text, fillers in FILLER_CASES:
+        found = scorer.features(text).fillers
+        legacy_count = sum(text.lower().count(w) for w in ["um", "uh", "like", "you know"])
+        print(f"{'✅' if len(found) == fillers else '❌'} {text!r}: {found} (legacy count {legacy_count})")
+        filler_ok = filler_ok and len(found) == fillers
+    if not mismatches:
+        print("✅ Confidence and clarity identical to the TextBlob version")
+    return not mismatches and filler_ok
+
+
+# --- Prosody ---
+def synthetic_speech(sample_rate=16000, seconds=10.0, pitch=140.0, glide=30.0, syllable_rate=4.0,
+                     pause_every=2.0, pause_s=0.5, seed=0):
+    """int16 voice-like signal: a harmonic tone with gliding pitch, syllable-rate loudness and regular pauses"""
+    import numpy as np
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(sample_rate * seconds)) / sample_rate
+    phase = 2 * np.pi * np.cumsum(pitch + glide * np.sin(2 * np.pi * 0.5 * t)) / sample_rate
+    voice = sum(np.sin(k * phase) / k for k in range(1, 6))
+    envelope = np.abs(np.sin(np.pi * syllable_rate * t)) ** 1.5
+    gate = (t % pause_every) < (pause_every - pause_s)
+    y = voice * envelope * gate * 6000 + rng.normal(0, 30, len(t))
+    return np.clip(y, -32768, 32767).astype(np.int16)
+
+
+@benchmark
+def prosody(args):
+    """Prosody of 1024-sample microphone chunks: streaming tracker vs re-analyzing the whole utterance per chunk"""
+    from prosody import ProsodyTracker, delivery_score
+
+    sample_rate, chunk, seconds = 16000, 1024, 10.0
+    print_header(f"PROSODY - {seconds:g}s utterances, {chunk}-sample chunks")
+    ok = True
+    for pitch in (110.0, 220.0):
+        samples = synthetic_speech(sample_rate, seconds, pitch=pitch, glide=0.0)
+        tracker = ProsodyTracker(sample_rate)
+        start = time.process_time()
+        for _ in range(args.rounds):
+            tracker.reset()
+            for i in range(0, len(samples), chunk):
+                tracker.feed(samples[i:i + chunk])
+        streaming = seconds * args.rounds / (time.process_time() - start)
+        summary = tracker.summary()
+
+        # What analyze_audio_tone() did whenever it was asked: analyze everything heard so far again
+        start = time.process_time()
+        for end in range(chunk, len(samples) + chunk, chunk):
+            ProsodyTracker(sample_rate).feed(samples[:end])
+        recompute = seconds / (time.process_time() - start)
+
+        pitch_ok = abs(summary['pitch_hz'] - pitch) / pitch < 0.03
+        pauses_ok = 0.15 < summary['pause_ratio'] < 0.35  # A quarter of the signal is pauses
+        ok = ok and pitch_ok and pauses_ok
+        print(f"{pitch:g} Hz voice: streaming {streaming:.0f} s/CPU-s, re-analyzing {recompute:.0f} s/CPU-s")
+        print(f"  {'✅' if pitch_ok and pauses_ok else '❌'} {summary}, delivery {delivery_score(summary)}/20")
+    return ok
+
+
+# --- Startup ---
+EAGER_IMPORTS = "import cv2, speech_recognition, google.generativeai, PyPDF2, docx, textblob.en, textblob.en.sentiments"
+
+STARTUP_SCRIPT = """
+import time
+start = time.perf_counter()
+{prelude}
+import web_app
+{warm_up}
+response = web_app.app.test_client().get('/')
+first_response = time.perf_counter() - start
+{check}
+print('FIRST_RESPONSE', first_response, response.status_code)
+"""
+
+
+def run_startup(prelude="", warm_up="", check="", importtime=False):
+    import os
+    import re
+    import subprocess
+    import sys
+    script = STARTUP_SCRIPT.format(prelude=prelude, warm_up=warm_up, check=check)
+    command = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", script]
+    result = subprocess.run(command, capture_output=True, text=True, env=dict(os.environ, LLM_BACKEND='fake'))
+    found = re.search(r"FIRST_RESPONSE (\S+) (\d+)", result.stdout)  # Warm-up output may share the line
+    if not found:
+        raise RuntimeError(result.stderr[-2000:])
+    return float(found.group(1)), int(found.group(2)), result.stdout, result.stderr
+
+
+def import_profile(stderr, top=8):
+    """Slowest modules imported directly by the script or web_app, from -X importtime output"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        if len(name) - len(name.lstrip()) <= 3:  # Top-level and web_app's own imports
+            rows.append((int(cumulative) / 1e6, name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+@benchmark
+def startup(args):
+    """Import-time profile and time to the first home() response: eager imports vs lazy loading"""
+    print_header("STARTUP - fresh interpreter, time to first response for /")
+    runs = {
+        "eager (all libraries at import)": dict(prelude=EAGER_IMPORTS),
+        "lazy": dict(check="assert not any(m['loaded'] for m in web_app.models.stats().values())"),
+        "lazy + background warm-up": dict(warm_up="web_app.models.warm_up()"),
+    }
+    times = {}
+    for label, options in runs.items():
+        samples = [run_startup(**options)[0] for _ in range(3)]
+        times[label] = min(samples)
+        print(f"{label}: {times[label]:.2f}s")
+
+    for label, prelude in (("eager", EAGER_IMPORTS), ("lazy", "")):
+        _, _, _, stderr = run_startup(prelude=prelude, importtime=True)
+        print(f"\nSlowest imports ({label}):")
+        for seconds, name in import_profile(stderr):
+            print(f"  {seconds * 1000:7.0f} ms  {name}")
+
+    # Everything registered must still load when it is needed
+    _, status, stdout, _ = run_startup(
+        warm_up="web_app.models.warm_up(background=False)",
+        check="assert all(m['loaded'] for m in web_app.models.stats().values()), web_app.models.stats()")
+    print(f"\nWarm-up loaded every registered model: {'✅' if status == 200 else '❌'}")
+    return status == 200 and times["lazy"] < times["eager (all libraries at import)"]
+
+
+# --- Sentiment inference ---
+@benchmark
+def sentiment(args):
+    """Micro-batched sentiment inference: utterances/s at batch sizes 1, 8 and 32 for concurrent sessions"""
+    import os
+    from concurrent.futures import ThreadPoolExecutor
+    from sentiment_service import SentimentService, TextBlobBackend, create_sentiment_backend
+    from soft_skills import SoftSkillScorer
+
+    # SENTIMENT_BACKEND=transformer (or -quantized/-torch) measures the real model when it is installed
+    backend_name = os.environ.get('SENTIMENT_BACKEND', 'fake')
+    sessions_count = max(args.n, 32)
+    per_session = args.rounds * 2
+    texts = [f"{GOLDEN_ANSWERS[i % len(GOLDEN_ANSWERS)]} I loved it" if i % 3 == 0 else GOLDEN_ANSWERS[i % len(GOLDEN_ANSWERS)]
+             for i in range(sessions_count * per_session)]
+    print_header(f"SENTIMENT - {sessions_count} sessions x {per_session} utterances")
+    backend = create_sentiment_backend(backend_name)
+    expected = [backend.predict([text])[0] for text in texts[:len(GOLDEN_ANSWERS) * 2]]
+
+    ok = True
+    for max_batch in (1, 8, 32):
+        service = SentimentService(backend, max_batch=max_batch, max_wait=0.005)
+
+        def session(index):
+            # Each session scores its utterances one at a time, like the practice loop
+            return [service.predict([texts[index * per_session + i]])[0] for i in range(per_session)]
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=sessions_count) as pool:
+            results = [r for rs in pool.map(session, range(sessions_count)) for r in rs]
+        elapsed = time.perf_counter() - start
+        stats = service.stats()
+        routed = results[:len(expected)] == expected  # Every caller got the result for its own text
+        ok = ok and routed
+        print(f"batch {max_batch:2d}: {len(texts) / elapsed:7.1f} utterances/s, avg batch {stats['avg_batch_size']}, "
+              f"p50 {stats['latency_p50_ms']} ms {'✅' if routed else '❌ results mixed up'}")
+
+    # The TextBlob backend through the service gives the same confidence as the default scorer
+    plain = SoftSkillScorer().score_batch(GOLDEN_ANSWERS)
+    served = SoftSkillScorer(sentiment=SentimentService(TextBlobBackend())).score_batch(GOLDEN_ANSWERS)
+    same = [a["confidence"] for a in plain] == [b["confidence"] for b in served]
+    print(f"{'✅' if same else '❌'} TextBlob through the service matches the default confidence scores")
+    return ok and same
+
+
+# --- Report store ---
+@benchmark
+def reports(args):
+    """Saving reports on the request thread vs the background store, and listing by index vs directory scan"""
+    import json
+    import os
+    import tempfile
+    from concurrent.futures import ThreadPoolExecutor
+    from datetime import datetime
+    from report_store import ReportStore, INTERVIEW
+
+    count = args.n * args.rounds * 10
+    report = {'resume_filename': 'resume.pdf', 'duration': 612.0, 'average_score_percent': 71.5,
+              'responses': [{'question': f"Question {i}?", 'answer': GOLDEN_ANSWERS[i % len(GOLDEN_ANSWERS)] * 8,
+                             'analysis': {'confidence': 20.0, 'clarity': 30.0, 'fluency': 15.0, 'score': 65.0}}
+                            for i in range(12)]}
+    print_header(f"REPORTS - {count} interview reports from {args.n} threads")
+
+    with tempfile.TemporaryDirectory() as folder:
+        # Legacy: json.dump on the request thread into a file named by the second
+        legacy_folder = os.path.join(folder, 'legacy')
+        os.makedirs(legacy_folder)
+
+        def legacy_save(_):
+            start = time.perf_counter()
+            path = os.path.join(legacy_folder, f"interview_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2, ensure_ascii=False)
+            return time.perf_counter() - start
+
+        with ThreadPoolExecutor(max_workers=args.n) as pool:
+            legacy_times = sorted(pool.map(legacy_save, range(count)))
+        legacy_files = len(os.listdir(legacy_folder))
+
+        store = ReportStore(os.path.join(folder, 'store'))
+
+        def store_save(index):
+            start = time.perf_counter()
+            store.save(INTERVIEW, report, session_id=f"session-{index % args.n}")
+            return time.perf_counter() - start
+
+        with ThreadPoolExecutor(max_workers=args.n) as pool:
+            store_times = sorted(pool.map(store_save, range(count)))
+        store.flush()
+        store_files = len([n for n in os.listdir(os.path.join(folder, 'store', 'interviews')) if n.endswith('.json')])
+
+        print(f"Request thread, json.dump: p50 {legacy_times[len(legacy_times) // 2] * 1000:.2f} ms, "
+              f"{legacy_files} of {count} files kept (same-second names collide)")
+        print(f"Request thread, store:     p50 {store_times[len(store_times) // 2] * 1000:.3f} ms, "
+              f"{store_files} of {count} files kept")
+
+        # Latest report of one session: scan and parse every file vs one indexed query
+        start = time.perf_counter()
+        for _ in range(args.rounds):
+            folder_path = os.path.join(folder, 'store', 'interviews')
+            mine = []
+            for name in os.listdir(folder_path):
+                with open(os.path.join(folder_path, name), 'r', encoding='utf-8') as f:
+                    json.load(f)
+                mine.append(name)
+        scan = (time.perf_counter() - start) / args.rounds
+        start = time.perf_counter()
+        for _ in range(args.rounds):
+            latest = store.latest(INTERVIEW, "session-0")
+        query = (time.perf_counter() - start) / args.rounds
+        print(f"Find a session's latest report: directory scan {scan * 1000:.1f} ms, index query {query * 1000:.2f} ms")
+        ok = store_files == count and store.stats()['indexed'] == count and latest is not None
+        print(f"{'✅' if ok else '❌'} Every report written, indexed and found: {store.stats()}")
+    return ok
+
+
+# --- Report history ---
+@benchmark
+def history(args):
+    """Score history of one user: re-parsing every report vs the incrementally maintained progress index"""
+    import json
+    import os
+    import random
+    import tempfile
+    from report_store import ReportStore, PRACTICE
+
+    count = args.n * args.rounds * 100
+    users = args.n * 10
+    print_header(f"HISTORY - {count} practice reports from {users} users")
+    rng = random.Random(0)
+
+    with tempfile.TemporaryDirectory() as folder:
+        store = ReportStore(folder)
+        start = time.perf_counter()
+        for index in range(count):
+            confidence, clarity, fluency = rng.uniform(10, 30), rng.uniform(10, 30), rng.uniform(5, 20)
+            score = round(confidence + clarity + fluency, 1)
+            store.save(PRACTICE, {'session_summary': {'overall_score': score, 'max_score': 80},
+                                  'performance_metrics': {'confidence': round(confidence, 1), 'clarity': round(clarity, 1),
+                                                          'fluency': round(fluency, 1)}},
+                       session_id=f"user-{index % users}")
+        store.flush()
+        print(f"Saved and indexed {count} reports in {time.perf_counter() - start:.1f}s")
+
+        # Without the index: read every report to total one user's scores
+        start = time.perf_counter()
+        scores = []
+        for name in os.listdir(folder):
+            if name.endswith('.json'):
+                with open(os.path.join(folder, name), 'r', encoding='utf-8') as f:
+                    scores.append(json.load(f)['session_summary']['overall_score'])
+        scan = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for index in range(args.rounds * 10):
+            result = store.history(f"user-{index % users}", limit=100)
+        query = (time.perf_counter() - start) / (args.rounds * 10)
+        print(f"One user's history: parse every report {scan * 1000:.0f} ms, progress index {query * 1000:.2f} ms "
+              f"({scan / query:.0f}x)")
+
+        # The running totals must agree with the reports themselves
+        everything = store.history("user-0", limit=count)
+        series = everything['series']
+        expected = round(sum(p['score_percent'] for p in series) / len(series), 1)
+        summary = everything['summary']
+        ok = (summary['reports'] == len(series) == count // users and summary['average']['score_percent'] == expected
+              and summary['latest_score_percent'] == series[-1]['score_percent'] and len(result['series']) == 100)
+        print(f"{'✅' if ok else '❌'} Summary matches the reports: {summary['reports']} reports, "
+              f"average {summary['average']['score_percent']}%, change {summary['change_percent']}%")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('name', choices=sorted(BENCHMARKS))
+    parser.add_argument('--n', type=int, default=20, help="number of parallel sessions/clients")
+    parser.add_argument('--rounds', type=int, default=10, help="polling rounds per session")
+    args = parser.parse_args()
+    ok = BENCHMARKS[args.name](args)
+    raise SystemExit(0 if ok is not False else 1)
+
+
+if __name__ == '__main__':
+    main()
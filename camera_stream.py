@@ -0,0 +1,309 @@
+"""
+Shared camera capture for the video feed
+One thread reads the camera and publishes the newest frame with a version
+counter. Every /video_feed client waits on a condition variable for the next
+version instead of calling camera.read() itself, so adding viewers does not
+split the frames between them. Encoded JPEGs are cached per frame version and
+overlay state, so clients that show the same picture share one encode.
+Adaptive clients measure how fast they drain and step down frame rate, JPEG
+quality and resolution to keep up.
+"""
+
+import itertools
+import threading
+import time
+
+from lazy_models import lazy_import
+
+cv2 = lazy_import('cv2')
+
+
+class CameraStream:
+    """Single capture thread that fans the latest frame out to many readers"""
+
+    def __init__(self, device=0, idle_timeout=5.0):
+        self.device = device
+        self.idle_timeout = idle_timeout  # Seconds without clients before the camera is released
+        self._cond = threading.Condition()
+        self._frame = None
+        self._version = 0
+        self._clients = 0
+        self._last_client_time = time.time()
+        self._running = False
+        self._thread = None
+        self.frames_captured = 0
+
+    def _capture_loop(self):
+        camera = cv2.VideoCapture(self.device)
+        print("📷 Camera capture thread started")
+        idle = False
+        try:
+            while True:
+                with self._cond:
+                    if self._clients == 0 and time.time() - self._last_client_time > self.idle_timeout:
+                        idle = True
+                        break
+                success, frame = camera.read()
+                if not success:
+                    print("⚠️ Camera read failed - stopping capture")
+                    break
+                frame = cv2.flip(frame, 1)
+                with self._cond:
+                    self._frame = frame
+                    self._version += 1
+                    self.frames_captured += 1
+                    self._cond.notify_all()
+        finally:
+            camera.release()
+            print("📷 Camera capture thread stopped")
+            with self._cond:
+                self._running = False
+                # A reader that subscribed while this thread was shutting down saw it still running
+                if idle and self._clients > 0:
+                    self._ensure_running()
+                self._cond.notify_all()
+
+    def _ensure_running(self):
+        # Caller holds self._cond
+        if not self._running:
+            self._running = True
+            self._thread = threading.Thread(target=self._capture_loop, daemon=True)
+            self._thread.start()
+
+    def subscribe(self):
+        """Register a reader and start the capture thread if needed"""
+        with self._cond:
+            self._clients += 1
+            self._ensure_running()
+
+    def unsubscribe(self):
+        """Unregister a reader. The camera is released once idle_timeout passes with no readers"""
+        with self._cond:
+            self._clients = max(0, self._clients - 1)
+            self._last_client_time = time.time()
+
+    def wait_for_frame(self, last_version, timeout=2.0):
+        """
+        Block until a frame newer than last_version is published.
+        Returns (version, frame), or (last_version, None) if the capture stopped or timed out.
+        The frame is shared between readers and must not be modified in place.
+        """
+        with self._cond:
+            ready = self._cond.wait_for(
+                lambda: self._version > last_version or not self._running, timeout)
+            if not ready or self._version <= last_version:
+                return last_version, None
+            return self._version, self._frame
+
+    @property
+    def running(self):
+        with self._cond:
+            return self._running
+
+    def frames(self):
+        """
+        Generator of (version, frame) for one reader, skipping to the newest frame each time.
+        Ends when the capture stops; a slow camera (e.g. still opening) is waited for.
+        """
+        self.subscribe()
+        try:
+            version = 0
+            while True:
+                version, frame = self.wait_for_frame(version)
+                if frame is None:
+                    if not self.running:
+                        break
+                    continue
+                yield version, frame
+        finally:
+            self.unsubscribe()
+
+    @property
+    def client_count(self):
+        with self._cond:
+            return self._clients
+
+
+class _PendingEncode:
+    def __init__(self):
+        self.ready = threading.Event()
+        self.data = None
+
+
+class EncodedFrameCache:
+    """JPEG encodes shared between clients, keyed by frame version, overlay state, quality and size"""
+
+    def __init__(self, keep_versions=3):
+        self.keep_versions = keep_versions
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._latest_version = 0
+        self.encodes = 0
+        self.hits = 0
+
+    def _evict(self):
+        # Caller holds self._lock
+        oldest = self._latest_version - self.keep_versions
+        for key in [k for k in self._entries if k[0] <= oldest]:
+            del self._entries[key]
+
+    def get(self, version, overlay_key, quality, width, render):
+        """
+        Return the JPEG bytes for this frame, calling render() and encoding only
+        if no other client has already done so. render() returns the BGR image to encode.
+        """
+        key = (version, overlay_key, quality, width)
+        with self._lock:
+            entry = self._entries.get(key)
+            owner = entry is None
+            if owner:
+                entry = _PendingEncode()
+                self._entries[key] = entry
+                if version > self._latest_version:
+                    self._latest_version = version
+                    self._evict()
+            else:
+                self.hits += 1
+
+        if owner:
+            try:
+                success, buffer = cv2.imencode('.jpg', render(), [cv2.IMWRITE_JPEG_QUALITY, quality])
+                entry.data = buffer.tobytes() if success else None
+                with self._lock:
+                    self.encodes += 1
+            finally:
+                entry.ready.set()
+        else:
+            entry.ready.wait()
+        return entry.data
+
+
+# Adaptive streaming ladder: (JPEG quality, width scale, max fps). Level 0 is the
+# stream's requested quality at full size. Discrete steps keep encodes shareable.
+ADAPTIVE_LEVELS = [
+    (None, 1.0, None),
+    (70, 1.0, None),
+    (60, 0.75, 20),
+    (50, 0.5, 15),
+    (40, 0.5, 10),
+    (40, 0.25, 5),
+]
+
+
+class StreamClient:
+    """Pacing, adaptation and statistics for one /video_feed client"""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, session_id, quality, width=None, adaptive=False,
+                 target_latency=0.15, adapt_interval=1.0):
+        self.id = next(self._ids)
+        self.session_id = session_id
+        self.quality = quality
+        self.width = width
+        self.adaptive = adaptive
+        self.target_latency = target_latency  # Max seconds the client may take to drain one frame
+        self.adapt_interval = adapt_interval
+        self.level = 0
+        self.started = time.time()
+        self.frames_sent = 0
+        self.frames_dropped = 0
+        self.bytes_sent = 0
+        self.send_time_avg = 0.0  # Moving average of seconds spent handing a frame to the client
+        self._last_version = 0
+        self._last_sent = 0.0
+        self._last_adapt = time.time()
+        self._yield_started = None
+        self._window = []  # (time, bytes) of recent frames for fps and bytes/s
+
+    def encode_settings(self, frame_width):
+        """(quality, width) to encode the next frame with"""
+        quality, scale, _ = ADAPTIVE_LEVELS[self.level]
+        quality = min(quality or self.quality, self.quality)
+        width = self.width or frame_width
+        if scale < 1.0:
+            width = int(width * scale) // 16 * 16
+        return quality, (width if width < frame_width else None)
+
+    def should_send(self, version):
+        """Decide whether to send camera frame `version`, counting skipped frames as dropped"""
+        if self._last_version:
+            self.frames_dropped += max(0, version - self._last_version - 1)
+        self._last_version = version
+
+        max_fps = ADAPTIVE_LEVELS[self.level][2]
+        if max_fps and time.time() - self._last_sent < 1.0 / max_fps:
+            self.frames_dropped += 1
+            return False
+        return True
+
+    def before_yield(self, nbytes):
+        now = time.time()
+        self._yield_started = now
+        self._last_sent = now
+        self.frames_sent += 1
+        self.bytes_sent += nbytes
+        self._window.append((now, nbytes))
+
+    def after_yield(self):
+        """Called when the server asks for the next frame - the gap is the time to drain this one"""
+        now = time.time()
+        send_time = now - self._yield_started
+        self.send_time_avg = 0.8 * self.send_time_avg + 0.2 * send_time
+        while self._window and now - self._window[0][0] > 2.0:
+            self._window.pop(0)
+        if self.adaptive and now - self._last_adapt >= self.adapt_interval:
+            self._adapt()
+            self._last_adapt = now
+
+    def _adapt(self):
+        if self.send_time_avg > self.target_latency and self.level < len(ADAPTIVE_LEVELS) - 1:
+            self.level += 1
+            print(f"📉 Stream {self.id}: client is slow ({self.send_time_avg * 1000:.0f} ms/frame) - level {self.level}")
+        elif self.send_time_avg < self.target_latency * 0.3 and self.level > 0:
+            self.level -= 1
+            print(f"📈 Stream {self.id}: client caught up - level {self.level}")
+
+    def stats(self):
+        """Per-client statistics as a JSON-serializable dict"""
+        now = time.time()
+        window = [(t, n) for t, n in self._window if now - t <= 2.0]
+        span = now - window[0][0] if len(window) > 1 else 0
+        quality, scale, max_fps = ADAPTIVE_LEVELS[self.level]
+        return {
+            'id': self.id,
+            'adaptive': self.adaptive,
+            'level': self.level,
+            'quality': min(quality or self.quality, self.quality),
+            'width_scale': scale,
+            'max_fps': max_fps,
+            'fps_sent': round(len(window) / span, 1) if span else 0.0,
+            'bytes_per_sec': round(sum(n for _, n in window) / span) if span else 0,
+            'frames_sent': self.frames_sent,
+            'frames_dropped': self.frames_dropped,
+            'avg_send_ms': round(self.send_time_avg * 1000, 1),
+            'connected_seconds': round(now - self.started, 1)
+        }
+
+
+class StreamRegistry:
+    """Thread-safe set of connected StreamClients"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._clients = {}
+
+    def add(self, client):
+        with self._lock:
+            self._clients[client.id] = client
+        return client
+
+    def remove(self, client):
+        with self._lock:
+            self._clients.pop(client.id, None)
+
+    def stats(self, session_id=None):
+        """Stats for every connected client, or only those of one session"""
+        with self._lock:
+            clients = list(self._clients.values())
+        return [c.stats() for c in clients if session_id is None or c.session_id == session_id]
@@ -0,0 +1,13 @@
+# Headless checks live in tests/ - run them with: python -m pytest -q
+import pytest
+
+# test.py and test_tts.py are interactive scripts (camera window, speakers), not tests
+collect_ignore = ["test.py", "test_tts.py"]
+
+
+@pytest.fixture(autouse=True, scope="session")
+def runtime_folders(tmp_path_factory):
+    """Run from a temporary folder, so reports/, tts_cache/ and uploads/ are not created in the repo"""
+    with pytest.MonkeyPatch.context() as patch:
+        patch.chdir(tmp_path_factory.mktemp("runtime"))
+        yield
@@ -0,0 +1,121 @@
+"""
+Lazy loading of heavy libraries and models
+Importing web_app used to import google.generativeai, TextBlob/NLTK, OpenCV,
+PyPDF2, python-docx and speech_recognition and set up Gemini before the first
+request could be served. They are now registered here and loaded the first
+time something is used from them. lazy_import() and lazy() return stand-ins
+that load on first attribute access, so call sites stay as they were. warm_up()
+loads everything on a background thread once the server is up.
+"""
+
+import importlib
+import threading
+import time
+
+
+class LazyResource:
+    """A value built by factory() on first use, exactly once even with concurrent callers"""
+
+    def __init__(self, name, factory):
+        self.name = name
+        self.factory = factory
+        self.load_seconds = None
+        self._value = None
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self):
+        return self._loaded
+
+    def get(self):
+        if self._loaded:
+            return self._value
+        with self._lock:
+            if not self._loaded:  # A failed load raises and is tried again next time
+                start = time.perf_counter()
+                self._value = self.factory()
+                self.load_seconds = time.perf_counter() - start
+                self._loaded = True
+                print(f"📦 Loaded {self.name} in {self.load_seconds:.2f}s")
+        return self._value
+
+
+class LazyProxy:
+    """Stands in for a LazyResource's value and loads it on first attribute access or call"""
+
+    def __init__(self, resource):
+        object.__setattr__(self, '_resource', resource)
+
+    def __getattr__(self, attr):
+        return getattr(self._resource.get(), attr)
+
+    def __call__(self, *args, **kwargs):
+        return self._resource.get()(*args, **kwargs)
+
+    def __setattr__(self, attr, value):
+        setattr(self._resource.get(), attr, value)
+
+    def __repr__(self):
+        state = "loaded" if self._resource.loaded else "not loaded"
+        return f"<lazy {self._resource.name} ({state})>"
+
+
+class ModelRegistry:
+    """Named LazyResources with warm-up and load-time statistics"""
+
+    def __init__(self):
+        self._resources = {}
+        self._lock = threading.Lock()
+
+    def register(self, name, factory):
+        """Register factory under name (once) and return its LazyResource"""
+        with self._lock:
+            if name not in self._resources:
+                self._resources[name] = LazyResource(name, factory)
+            return self._resources[name]
+
+    def get(self, name):
+        return self._resources[name].get()
+
+    def warm_up(self, names=None, background=True):
+        """Load the given (default: all) resources, on a daemon thread unless background is False"""
+        def load_all():
+            for name in names or list(self._resources):
+                try:
+                    self._resources[name].get()
+                except Exception as e:
+                    print(f"⚠️ Could not load {name}: {e}")
+
+        if not background:
+            load_all()
+            return None
+        thread = threading.Thread(target=load_all, name="warm-up", daemon=True)
+        thread.start()
+        return thread
+
+    def stats(self):
+        with self._lock:
+            resources = list(self._resources.values())
+        return {r.name: {'loaded': r.loaded,
+                         'load_seconds': round(r.load_seconds, 3) if r.load_seconds is not None else None}
+                for r in resources}
+
+
+# Shared by every module, so one warm-up covers them all
+models = ModelRegistry()
+
+
+def lazy(name, factory):
+    """Stand-in for factory()'s result, built on first use"""
+    return LazyProxy(models.register(name, factory))
+
+
+def is_loaded(value):
+    """False if value is a lazy stand-in that has not been built yet. Never loads it"""
+    return not isinstance(value, LazyProxy) or value._resource.loaded
+
+
+def lazy_import(module_name):
+    """Stand-in for a module, imported on first attribute access"""
+    return lazy(module_name, lambda: importlib.import_module(module_name))
@@ -0,0 +1,239 @@
+"""
+Client layer for Gemini calls
+Question generation, interview replies and reports used to call
+generate_content() directly on request and interview threads, with no timeout,
+retry, cache or concurrency limit. Calls now go through LLMClient: a bounded
+worker pool with per-call timeouts, a token-bucket rate limiter and a response
+cache keyed by a hash of the prompt. Every failure raises, so callers keep
+using their existing keyword/template fallbacks. FakeModel stands in for
+Gemini when testing offline.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+
+class LLMUnavailable(Exception):
+    """The call was not made or did not finish in time - use the fallback"""
+
+
+class TokenBucket:
+    """Allows `rate` calls per second on average with bursts of up to `capacity`"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout=0.0):
+        """Take a token, waiting up to timeout seconds for one. Returns False if none came"""
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+            if now + wait > deadline:
+                return False
+            time.sleep(wait)
+
+
+class ResponseCache:
+    """LRU cache of prompt hash -> text with a time-to-live"""
+
+    def __init__(self, max_entries=128, ttl=3600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(prompt):
+        return hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored, text = entry
+            if time.time() - stored > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return text
+
+    def put(self, key, text):
+        with self._lock:
+            self._entries[key] = (time.time(), text)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+
+class LLMClient:
+    """Timeouts, rate limiting, caching and a bounded pool around a generate_content() model"""
+
+    def __init__(self, model, max_workers=2, timeout=20.0, rate=1.0, burst=5,
+                 cache_size=128, cache_ttl=3600, retries=1):
+        self.model = model
+        self.timeout = timeout
+        self.retries = retries  # Extra attempts after an error (not after a timeout)
+        self.limiter = TokenBucket(rate, burst)
+        self.cache = ResponseCache(cache_size, cache_ttl)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="llm")
+        self._lock = threading.Lock()
+        self._inflight = {}  # Prompt hash -> (future of the call in progress, its deadline)
+        self._latencies = []
+        self.calls = 0
+        self.cache_hits = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.rate_limited = 0
+        self.expired = 0
+
+    @property
+    def available(self):
+        return self.model is not None
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def _call(self, prompt, deadline):
+        # Runs on the pool, so waiting for a rate-limit token never blocks the caller past its timeout
+        if time.time() >= deadline:
+            # The caller already gave up while this job was queued
+            self._count('expired')
+            raise LLMUnavailable("deadline passed before the call started")
+        if not self.limiter.acquire(timeout=max(0.0, deadline - time.time())):
+            self._count('rate_limited')
+            raise LLMUnavailable("rate limit reached")
+        self._count('calls')
+        start = time.time()
+        try:
+            # The transport timeout frees this worker when the caller's deadline passes
+            remaining = max(1.0, deadline - time.time())
+            text = self.model.generate_content(prompt, request_options={'timeout': remaining}).text.strip()
+        except Exception:
+            self._count('errors')
+            raise
+        with self._lock:
+            self._latencies.append(time.time() - start)
+            del self._latencies[:-200]  # Keep recent samples only
+        return text
+
+    def _finished(self, key, future):
+        with self._lock:
+            if self._inflight.get(key, (None,))[0] is future:
+                del self._inflight[key]
+        if not future.cancelled() and future.exception() is None:
+            self.cache.put(key, future.result())
+
+    def generate(self, prompt, timeout=None, use_cache=True):
+        """
+        Generate text for prompt. Raises LLMUnavailable if there is no model, the
+        rate limit is exhausted or the call times out, and re-raises model errors.
+        Identical prompts already in flight share one call, unless that call's
+        deadline ends before this caller's timeout does.
+        """
+        if self.model is None:
+            raise LLMUnavailable("no model configured")
+        key = self.cache.key(prompt)
+        if use_cache:
+            cached = self.cache.get(key)
+            if cached is not None:
+                self._count('cache_hits')
+                return cached
+
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.time() + timeout
+        for attempt in range(self.retries + 1):
+            with self._lock:
+                future, call_deadline = self._inflight.get(key, (None, None)) if use_cache else (None, None)
+                # Join a call in flight only if it may run as long as this caller waits
+                if future is None or future.done() or call_deadline < deadline:
+                    future = self._executor.submit(self._call, prompt, deadline)
+                    if use_cache:
+                        self._inflight[key] = (future, deadline)
+                        future.add_done_callback(lambda f, key=key: self._finished(key, f))
+            try:
+                return future.result(timeout=max(0.0, deadline - time.time()))
+            except FutureTimeout:
+                self._count('timeouts')
+                raise LLMUnavailable(f"no response within {timeout:g}s")
+            except LLMUnavailable:
+                raise
+            except Exception:
+                if attempt == self.retries or time.time() >= deadline:
+                    raise
+
+    def stats(self):
+        with self._lock:
+            latencies = sorted(self._latencies)
+            stats = {
+                'available': self.available,
+                'calls': self.calls,
+                'cache_hits': self.cache_hits,
+                'timeouts': self.timeouts,
+                'errors': self.errors,
+                'rate_limited': self.rate_limited,
+                'expired': self.expired,
+                'cached_responses': len(self.cache)
+            }
+        if latencies:
+            stats['latency_p50_ms'] = round(latencies[len(latencies) // 2] * 1000, 1)
+            stats['latency_max_ms'] = round(latencies[-1] * 1000, 1)
+        return stats
+
+
+class _FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeModel:
+    """
+    Offline stand-in for genai.GenerativeModel. Returns the scripted responses
+    in order, then a deterministic answer derived from the prompt. Can be made
+    slow or failing to exercise timeouts and fallbacks.
+    """
+
+    def __init__(self, responses=None, delay=0.0, fail_every=0):
+        self.responses = list(responses or [])
+        self.delay = delay
+        self.fail_every = fail_every  # Raise on every n-th call (0 = never)
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def generate_content(self, prompt, request_options=None):
+        with self._lock:
+            self.calls += 1
+            calls = self.calls
+            scripted = self.responses.pop(0) if self.responses else None
+        timeout = (request_options or {}).get('timeout')
+        if self.delay:
+            if timeout is not None and self.delay > timeout:
+                time.sleep(timeout)
+                raise TimeoutError("fake model request timed out")
+            time.sleep(self.delay)
+        if self.fail_every and calls % self.fail_every == 0:
+            raise RuntimeError("fake model failure")
+        if scripted is not None:
+            return _FakeResponse(scripted)
+        digest = hashlib.sha256(prompt.encode('utf-8')).hexdigest()[:8]
+        lines = [f"Can you tell me more about the experience behind point {i} ({digest})?" for i in range(1, 7)]
+        return _FakeResponse("\n".join(lines))
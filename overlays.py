@@ -0,0 +1,134 @@
+"""
+Overlay compositing for video frames
+Text is rendered once into cached BGRA layers and pasted onto each frame, and
+translucent banners are blended over their own rows only, instead of copying
+and alpha-blending the whole frame every time.
+cv2 clips every stroke against the image, which changes the pixels of
+strokes that cross the frame edge. Where a frame edge cuts through the text,
+the strip next to it is drawn with cv2.putText, so the result stays
+identical to drawing the text directly.
+"""
+
+import threading
+
+import numpy as np
+
+from lazy_models import lazy_import
+
+cv2 = lazy_import('cv2')
+
+
+class TextLayer:
+    """Lines of text pre-rendered into a BGRA image. Alpha marks the text pixels"""
+
+    def __init__(self, lines, font_scale, thickness, line_height=30, font=None):
+        # lines: list of (text, bgr_color)
+        font = cv2.FONT_HERSHEY_SIMPLEX if font is None else font
+        self.lines, self.font, self.font_scale = lines, font, font_scale
+        self.thickness, self.line_height = thickness, line_height
+        margin = thickness + 2
+        sizes = [cv2.getTextSize(text, font, font_scale, thickness) for text, _ in lines]
+        ascent = max(h for (_, h), _ in sizes)
+        descent = max(baseline for _, baseline in sizes)
+        width = max(w for (w, _), _ in sizes) + 2 * margin
+        height = ascent + line_height * (len(lines) - 1) + descent + 2 * margin
+
+        self.anchor = (margin, margin + ascent)  # Layer pixel that sits on the text origin
+        self.layer = np.zeros((height, width, 4), dtype=np.uint8)
+        for i, (text, color) in enumerate(lines):
+            cv2.putText(self.layer, text, (margin, self.anchor[1] + i * line_height),
+                        font, font_scale, tuple(color) + (255,), thickness)
+        # Builds that anti-alias text leave partial alpha; the colors are then premultiplied by it
+        self.binary = bool(np.isin(self.layer[..., 3], (0, 255)).all())
+        self.mask = self.layer[..., 3:] > 0
+        # No stroke is wider than a line of text, so strokes clipped at a frame edge change nothing further in
+        self.edge = ascent + descent + 2 * margin
+
+    def paste(self, frame, x, y):
+        """Draw the text onto frame with its first baseline at (x, y), clipped to the frame"""
+        x0, y0 = x - self.anchor[0], y - self.anchor[1]
+        height, width = self.layer.shape[:2]
+        fx0, fy0 = max(x0, 0), max(y0, 0)
+        fx1, fy1 = min(x0 + width, frame.shape[1]), min(y0 + height, frame.shape[0])
+        if fx0 >= fx1 or fy0 >= fy1:
+            return
+        # Frame edges that cut the text are redrawn with cv2.putText on a copy twice as deep as the
+        # strip that is kept, so the copy's own inner edge changes nothing that is kept
+        edge, (frame_height, frame_width) = self.edge, frame.shape[:2]
+        edges = []  # (rows, columns, part of the copy that is kept)
+        if x0 < 0:
+            edges.append((slice(fy0, fy1), slice(0, 2 * edge), np.s_[:, :edge]))
+        if x0 + width > frame_width:
+            edges.append((slice(fy0, fy1), slice(max(frame_width - 2 * edge, 0), frame_width), np.s_[:, -edge:]))
+        if y0 < 0:
+            edges.append((slice(0, 2 * edge), slice(0, frame_width), np.s_[:edge]))
+        if y0 + height > frame_height:
+            edges.append((slice(max(frame_height - 2 * edge, 0), frame_height), slice(0, frame_width), np.s_[-edge:]))
+        strips = [frame[rows, cols].copy() for rows, cols, _ in edges]
+        self._blend(frame[fy0:fy1, fx0:fx1], slice(fy0 - y0, fy1 - y0), slice(fx0 - x0, fx1 - x0))
+        for (rows, cols, keep), strip in zip(edges, strips):
+            self._put_text(strip, x - cols.start, y - rows.start)
+            frame[rows, cols][keep] = strip[keep]
+
+    def _put_text(self, image, x, y):
+        for i, (text, color) in enumerate(self.lines):
+            cv2.putText(image, text, (x, y + i * self.line_height), self.font, self.font_scale,
+                        tuple(color), self.thickness)
+
+    def _blend(self, roi, rows, cols):
+        layer = self.layer[rows, cols]
+        if self.binary:
+            np.copyto(roi, layer[..., :3], where=self.mask[rows, cols])
+        else:
+            keep = 255 - layer[..., 3:].astype(np.uint16)
+            roi[:] = layer[..., :3] + (roi * keep + 127) // 255
+
+
+class OverlayCompositor:
+    """Caches text layers and banner fills, and composites them onto frames"""
+
+    def __init__(self, max_layers=64):
+        self.max_layers = max_layers
+        self._lock = threading.Lock()
+        self._layers = {}
+        self._fills = {}
+        self.layers_built = 0
+
+    def _layer(self, lines, font_scale, thickness, line_height):
+        key = (tuple(lines), font_scale, thickness, line_height)
+        with self._lock:
+            layer = self._layers.get(key)
+        if layer is None:
+            layer = TextLayer(lines, font_scale, thickness, line_height)
+            with self._lock:
+                if len(self._layers) >= self.max_layers:
+                    del self._layers[next(iter(self._layers))]  # Drop the oldest layer
+                self._layers[key] = layer
+                self.layers_built += 1
+        return layer
+
+    def text(self, frame, lines, org, font_scale, thickness, line_height=30):
+        """
+        Draw lines of (text, color) with the first baseline at org. Each distinct set of
+        lines is only rendered once. Same output as calling cv2.putText for each line.
+        """
+        if lines:
+            self._layer(lines, font_scale, thickness, line_height).paste(frame, int(org[0]), int(org[1]))
+
+    def banner(self, frame, y1, y2, alpha, color=(0, 0, 0)):
+        """Blend a full-width translucent band over rows y1..y2 (inclusive) only"""
+        roi = frame[max(y1, 0):min(y2 + 1, frame.shape[0])]
+        if roi.size == 0:
+            return
+        key = (roi.shape, tuple(color))
+        with self._lock:
+            fill = self._fills.get(key)
+            if fill is None:
+                fill = np.empty(roi.shape, dtype=frame.dtype)
+                fill[:] = color
+                self._fills[key] = fill
+        roi[:] = cv2.addWeighted(fill, alpha, roi, 1 - alpha, 0)
+
+
+# Shared compositor for the web app and the desktop app
+compositor = OverlayCompositor()
@@ -0,0 +1,128 @@
+"""
+Streaming PDF text extraction for resumes
+Pages are extracted lazily and extraction stops once enough text has been
+collected, instead of concatenating every page into one string. Large
+documents are split into page ranges that are extracted in a process pool
+under a wall-clock budget, and whatever arrived in time is used. Pool
+workers are spawned, not forked: forking the threaded web server can copy a
+lock that another thread holds, and the child then waits on it forever.
+Spawned workers import the main script again, as they do on Windows, so it
+must start the server under `if __name__ == '__main__'`.
+"""
+
+import atexit
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+
+from lazy_models import lazy_import
+
+PyPDF2 = lazy_import('PyPDF2')
+
+MAX_RESUME_CHARS = 8000  # Prompts use the first 1500-2000 characters; keywords get some more context
+MAX_RESUME_PAGES = 50
+# Part of the cache key of extracted resume text - bump it when extraction changes
+EXTRACTOR_VERSION = f"2-{MAX_RESUME_CHARS}c-{MAX_RESUME_PAGES}p"
+
+_pool = None
+_pool_lock = threading.Lock()  # Resume jobs extract on several threads
+
+
+def iter_pdf_pages(pdf_path, start=0, end=None):
+    """Yield the text of pages [start, end) one at a time"""
+    with open(pdf_path, 'rb') as file:
+        reader = PyPDF2.PdfReader(file)
+        end = len(reader.pages) if end is None else min(end, len(reader.pages))
+        for index in range(start, end):
+            yield reader.pages[index].extract_text() or ""
+
+
+def _extract_range(pdf_path, start, end, max_chars):
+    # Runs in a worker process
+    collected = _TextCollector(max_chars)
+    for text in iter_pdf_pages(pdf_path, start, end):
+        if collected.add([text]):
+            break
+    return collected.parts
+
+
+def _process_pool(workers):
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+            # Ranges not started yet are dropped; the ones running finish before the interpreter exits
+            atexit.register(_pool.shutdown, wait=True, cancel_futures=True)
+        return _pool
+
+
+def extract_pdf_text(pdf_path, max_chars=MAX_RESUME_CHARS, max_pages=MAX_RESUME_PAGES,
+                     parallel_from=16, pages_per_job=25, workers=None, budget=5.0):
+    """
+    Text of the first pages of a PDF, stopping after max_chars characters or max_pages pages.
+    The first parallel_from pages are streamed in this process, which is usually enough to
+    reach the cap. The rest of a larger document is extracted page-parallel in a process
+    pool when more than one CPU is available. Pages not ready within `budget` seconds are left out.
+    """
+    deadline = time.time() + budget
+    with open(pdf_path, 'rb') as file:
+        page_count = len(PyPDF2.PdfReader(file).pages)
+    page_count = min(page_count, max_pages) if max_pages else page_count
+    workers = workers or min(4, os.cpu_count() or 1)
+    collected = _TextCollector(max_chars)
+
+    head = page_count if workers < 2 else min(page_count, parallel_from)
+    for text in iter_pdf_pages(pdf_path, 0, head):
+        if collected.add([text]) or time.time() >= deadline:
+            return collected.text()
+    if head == page_count:
+        return collected.text()
+
+    pool = _process_pool(workers)
+    ranges = [(start, min(start + pages_per_job, page_count)) for start in range(head, page_count, pages_per_job)]
+    futures = []
+    try:
+        # Keep `workers` ranges in flight and consume them in page order, so the text
+        # stays in reading order and at most a few ranges past the character cap are extracted
+        for index in range(len(ranges)):
+            while len(futures) < min(index + workers, len(ranges)):
+                start, end = ranges[len(futures)]
+                futures.append(pool.submit(_extract_range, pdf_path, start, end, max_chars))
+            try:
+                chunk = futures[index].result(timeout=max(0.0, deadline - time.time()))
+            except FutureTimeout:
+                print(f"⚠️ PDF extraction budget of {budget:g}s used up - using the first {collected.pages} pages")
+                break
+            if collected.add(chunk):
+                break
+    finally:
+        for future in futures:
+            future.cancel()  # Ranges not started yet are skipped
+    return collected.text()
+
+
+class _TextCollector:
+    """Page texts gathered in order, up to max_chars characters"""
+
+    def __init__(self, max_chars):
+        self.max_chars = max_chars
+        self.parts = []
+        self.total = 0
+
+    @property
+    def pages(self):
+        return len(self.parts)
+
+    def add(self, texts):
+        """Add page texts. Returns True once max_chars has been reached"""
+        for text in texts:
+            self.parts.append(text)
+            self.total += len(text) + 1
+            if self.max_chars and self.total >= self.max_chars:
+                return True
+        return False
+
+    def text(self):
+        return "\n".join(self.parts).strip()[:self.max_chars or None]
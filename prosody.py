@@ -0,0 +1,162 @@
+"""
+Incremental prosody analysis of int16 PCM audio
+test.py's analyze_audio_tone() ran librosa.yin over the whole utterance on
+every call and kept only the mean pitch, and the web app had no audio-based
+scoring. ProsodyTracker is fed microphone chunks as they arrive. New samples
+are cut into overlapping frames with NumPy strides, and each batch of frames
+gets its RMS energy and autocorrelation pitch in one vectorized step. Running
+totals give pitch level and variation, energy, speaking rate (syllable-like
+energy peaks per second) and the share of pauses, which delivery_score()
+turns into 0-20 points.
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+class ProsodyTracker:
+    """Frame-wise pitch, energy, speaking rate and pauses of a stream of int16 samples"""
+
+    def __init__(self, sample_rate, frame_ms=40, hop_ms=20, fmin=75.0, fmax=400.0,
+                 min_rms=200.0, voicing=0.45):
+        self.sample_rate = sample_rate
+        self.frame = int(sample_rate * frame_ms / 1000)
+        self.hop = int(sample_rate * hop_ms / 1000)
+        self.min_lag = max(2, int(sample_rate / fmax))
+        self.max_lag = min(self.frame - 2, int(sample_rate / fmin))
+        self.min_rms = min_rms  # Frames quieter than this are silence
+        self.voicing = voicing  # Autocorrelation peak needed to trust a pitch estimate
+        self._nfft = 1 << (2 * self.frame - 1).bit_length()
+        self._window = np.hanning(self.frame).astype(np.float32)
+        self._pending = np.zeros(0, dtype=np.float32)
+        self.peak_rms = 0.0  # Loudest speech so far, kept across utterances to set the speech threshold
+        self.reset()
+
+    def reset(self):
+        """Start a new utterance (the speech threshold is kept)"""
+        self.frames = 0
+        self.speech_frames = 0
+        self.pause_frames = 0
+        self.pitched_frames = 0
+        self._gap = 0  # Silent frames since the last speech, counted as a pause once speech resumes
+        self._pitch_sum = 0.0
+        self._semitone_sum = 0.0
+        self._semitone_sq = 0.0
+        self._energy_sum = 0.0
+        self.syllables = 0
+        self._in_peak = False
+        self._peak = 0.0
+        self._valley = np.inf
+
+    def feed(self, samples):
+        """Analyze newly arrived int16 samples"""
+        data = np.concatenate((self._pending, np.asarray(samples, dtype=np.float32)))
+        if len(data) < self.frame:
+            self._pending = data
+            return
+        frames = sliding_window_view(data, self.frame)[::self.hop]
+        self._pending = data[len(frames) * self.hop:]
+        self._analyze(frames)
+
+    def _analyze(self, frames):
+        rms = np.sqrt(np.mean(frames * frames, axis=1))
+        self.peak_rms = max(self.peak_rms, float(rms.max()))
+        speech = rms > max(self.min_rms, self.peak_rms * 0.1)
+
+        # Autocorrelation of every frame at once, through the power spectrum
+        centered = (frames - frames.mean(axis=1, keepdims=True)) * self._window
+        spectrum = np.fft.rfft(centered, n=self._nfft, axis=1)
+        autocorr = np.fft.irfft(spectrum.real ** 2 + spectrum.imag ** 2, n=self._nfft, axis=1)
+        lags = autocorr[:, self.min_lag:self.max_lag + 1] / np.maximum(autocorr[:, :1], 1e-9)
+        best = np.argmax(lags, axis=1)
+        strength = lags[np.arange(len(best)), best]
+        # Parabolic interpolation around the peak for sub-sample lag accuracy
+        left = lags[np.arange(len(best)), np.maximum(best - 1, 0)]
+        right = lags[np.arange(len(best)), np.minimum(best + 1, lags.shape[1] - 1)]
+        curve = left - 2 * strength + right
+        offset = np.where(curve < 0, 0.5 * (left - right) / np.where(curve < 0, curve, 1), 0.0)
+        pitch = self.sample_rate / (best + self.min_lag + offset)
+        pitched = speech & (strength > self.voicing)
+
+        self.frames += len(frames)
+        self.speech_frames += int(speech.sum())
+        self.pitched_frames += int(pitched.sum())
+        self._energy_sum += float(rms[speech].sum())
+        semitones = 12 * np.log2(pitch[pitched] / 100.0)
+        self._pitch_sum += float(pitch[pitched].sum())
+        self._semitone_sum += float(semitones.sum())
+        self._semitone_sq += float((semitones * semitones).sum())
+
+        # Pauses are silences between speech frames; leading and trailing silence is not counted
+        spoken = np.flatnonzero(speech)
+        if len(spoken):
+            if self.speech_frames > len(spoken):
+                self.pause_frames += self._gap + int(spoken[0])
+            self.pause_frames += int(spoken[-1] - spoken[0] + 1 - len(spoken))
+            self._gap = len(frames) - 1 - int(spoken[-1])
+        else:
+            self._gap += len(frames)
+
+        # Syllable nuclei: an energy peak that rises well above the last valley and falls away again
+        for value, is_speech in zip(rms.tolist(), speech.tolist()):
+            if self._in_peak:
+                self._peak = max(self._peak, value)
+                if not is_speech or value < 0.6 * self._peak:
+                    self._in_peak = False
+                    self._valley = value
+            elif is_speech and value > 1.5 * self._valley:
+                self.syllables += 1
+                self._in_peak = True
+                self._peak = value
+            else:
+                self._valley = min(self._valley, value)
+
+    def summary(self):
+        """Prosody of the audio since the last reset as a JSON-serializable dict"""
+        seconds_per_frame = self.hop / self.sample_rate
+        speech_s = self.speech_frames * seconds_per_frame
+        pause_s = self.pause_frames * seconds_per_frame
+        summary = {
+            'speech_seconds': round(speech_s, 2),
+            'pause_ratio': round(pause_s / (speech_s + pause_s), 3) if speech_s else None,
+            'speaking_rate': round(self.syllables / (speech_s + pause_s), 2) if speech_s else None,
+            'energy_db': round(20 * np.log10(self._energy_sum / self.speech_frames / 32768.0), 1)
+                         if self.speech_frames else None,
+            'pitch_hz': None,
+            'pitch_variation_st': None
+        }
+        if self.pitched_frames:
+            mean = self._semitone_sum / self.pitched_frames
+            variance = max(0.0, self._semitone_sq / self.pitched_frames - mean * mean)
+            summary['pitch_hz'] = round(self._pitch_sum / self.pitched_frames, 1)
+            summary['pitch_variation_st'] = round(float(np.sqrt(variance)), 2)
+        return summary
+
+    def take(self):
+        """Summary of the current utterance; the next samples start a new one"""
+        summary = self.summary()
+        self.reset()
+        return summary
+
+
+def delivery_score(summary, min_speech_s=0.5):
+    """
+    Vocal delivery (0-20 points) from a ProsodyTracker summary: pitch variation
+    (not monotone), a conversational pace and few long pauses. None if there
+    was too little speech to judge.
+    """
+    if not summary or summary['speech_seconds'] < min_speech_s:
+        return None
+    variation = summary['pitch_variation_st'] or 0.0
+    rate = summary['speaking_rate'] or 0.0
+    pauses = summary['pause_ratio'] or 0.0
+
+    intonation = min(variation / 4.0, 1.0) * 8  # About 4 semitones of movement sounds lively
+    if rate < 3.0:
+        pace = max(0.0, (rate - 1.0) / 2.0) * 6
+    elif rate > 5.5:
+        pace = max(0.0, (8.0 - rate) / 2.5) * 6
+    else:
+        pace = 6.0
+    fluency = min(max((0.6 - pauses) / 0.4, 0.0), 1.0) * 6
+    return round(intonation + pace + fluency, 1)
@@ -0,0 +1,116 @@
+"""
+Video recording for practice sessions
+Frames are handed to a writer thread through a bounded queue and streamed into
+the video file as the recording runs, so memory per session stays bounded and
+the whole recording is kept. If the encoder falls behind and the queue is full,
+frames are dropped (and counted) instead of holding up the camera. join()
+waits until the file is finished, so it is never handed out half written.
+"""
+
+import os
+import threading
+import time
+from queue import Queue, Full
+
+from lazy_models import lazy_import
+
+cv2 = lazy_import('cv2')
+
+RECORDINGS_FOLDER = 'recordings'
+DEFAULT_QUEUE_SIZE = 60  # ~2 seconds at 30 fps waiting to be encoded
+FPS_PROBE_FRAMES = 30  # Frames used to measure the camera frame rate before the file is opened
+MAX_FPS = 60.0
+SAVE_TIMEOUT = 10.0  # Longest wait for the writer to finish the file after the recording stops
+
+
+class VideoRecorder:
+    """Streams frames to a video file on a background thread"""
+
+    def __init__(self, path, max_queue=DEFAULT_QUEUE_SIZE, default_fps=20.0, probe_frames=FPS_PROBE_FRAMES):
+        self.path = path
+        self.default_fps = default_fps
+        self.probe_frames = probe_frames
+        self.fps = None
+        self.frames_received = 0
+        self.frames_written = 0
+        self.frames_dropped = 0
+        self.saved = False
+        self._queue = Queue(maxsize=max_queue)
+        self._closed = False
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._write_loop, name="video-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, frame):
+        """Queue a copy of a frame for writing. Returns False if it was dropped"""
+        with self._lock:
+            if self._closed:
+                return False
+            self.frames_received += 1
+            try:
+                self._queue.put_nowait((frame.copy(), time.time()))
+                return True
+            except Full:
+                self.frames_dropped += 1
+                return False
+
+    def close(self):
+        """Finish the file on the writer thread and return that thread"""
+        with self._lock:
+            if not self._closed:
+                self._closed = True
+                self._queue.put((None, None))  # Blocks only until the writer makes room
+        return self._thread
+
+    def join(self, timeout=None):
+        """Close the recorder and wait until the file is finished. Returns False on timeout"""
+        self.close().join(timeout)
+        return not self._thread.is_alive()
+
+    def _write_loop(self):
+        writer = None
+        probe = []  # (frame, timestamp) held until the frame rate is known
+        done = False
+        try:
+            while True:
+                frame, timestamp = self._queue.get()
+                if frame is None:
+                    done = True
+                    break
+                if writer is None:
+                    probe.append((frame, timestamp))
+                    if len(probe) < self.probe_frames:
+                        continue
+                    writer = self._open(probe)
+                    probe = []
+                    continue
+                writer.write(frame)
+                self.frames_written += 1
+            if writer is None and probe:
+                writer = self._open(probe)
+            if writer is not None:
+                writer.release()
+                self.saved = True
+                print(f"✅ Saved {self.frames_written} frames ({self.fps:.1f} fps, "
+                      f"{self.frames_dropped} dropped) to {self.path}")
+            else:
+                print("⚠️ No video frames recorded")
+        except Exception as e:
+            print(f"⚠️ Error saving recording: {e}")
+            while not done:  # Keep draining so close() never blocks
+                done = self._queue.get()[0] is None
+
+    def _open(self, probe):
+        """Open the video file at the frame rate measured over the probe frames and write them"""
+        span = probe[-1][1] - probe[0][1]
+        fps = (len(probe) - 1) / span if len(probe) > 1 and span > 0 else self.default_fps
+        self.fps = min(max(fps, 1.0), MAX_FPS)  # A burst of queued frames is not the camera rate
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        height, width = probe[0][0].shape[:2]
+        writer = cv2.VideoWriter(self.path, cv2.VideoWriter_fourcc(*'mp4v'), self.fps, (width, height))
+        if not writer.isOpened():
+            raise IOError(f"could not open {self.path} for writing")
+        for frame, _ in probe:
+            writer.write(frame)
+            self.frames_written += 1
+        return writer
@@ -0,0 +1,340 @@
+"""
+Report storage with a background writer and a SQLite index
+/stop_recording and /end_interview used to json.dump() their reports into
+reports/ on the request thread, named by a timestamp with one-second
+resolution, so reports written in the same second overwrote each other, and
+finding a report meant scanning the directory. Reports now get unique ids and
+are handed to a writer thread that writes each one to a temporary file and
+renames it into place. An index in reports/index.sqlite3 records the session
+type, session, candidate, scores and duration of every report for listing and
+lookup, and a per-session progress table that is updated as each report is
+indexed, so score history never has to re-read the report files. Reports
+still being written are served from memory.
+"""
+
+import atexit
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+from queue import Queue
+
+REPORTS_FOLDER = 'reports'
+
+PRACTICE = 'practice'
+INTERVIEW = 'interview'
+
+# Where each kind of report lives and how its files are named (the names existing reports use)
+_LAYOUT = {
+    PRACTICE: ('', 'report'),
+    INTERVIEW: ('interviews', 'interview'),
+}
+
+_COLUMNS = ('id', 'kind', 'session_id', 'candidate', 'created', 'duration', 'score', 'max_score', 'path',
+            'confidence', 'clarity', 'fluency', 'delivery', 'score_percent')
+_METRICS = ('confidence', 'clarity', 'fluency', 'delivery', 'score_percent')
+_SERIES_COLUMNS = ('id', 'kind', 'created', 'score', 'max_score') + _METRICS
+
+# Bumped when columns are added; older indexes are upgraded and their score columns filled from the files
+INDEX_VERSION = 2
+
+# Running totals per session and report kind. Only reports with a score count.
+_PROGRESS_COLUMNS = ('session_id', 'kind', 'reports', 'confidence_sum', 'clarity_sum', 'fluency_sum',
+                     'delivery_sum', 'delivery_reports', 'score_sum', 'best_score',
+                     'first_created', 'first_score', 'latest_created', 'latest_score')
+
+
+class ReportStore:
+    """JSON reports on disk, written in the background and indexed in SQLite"""
+
+    def __init__(self, folder=REPORTS_FOLDER, index_path=None):
+        self.folder = folder
+        os.makedirs(os.path.join(folder, _LAYOUT[INTERVIEW][0]), exist_ok=True)
+        self.index_path = index_path or os.path.join(folder, 'index.sqlite3')
+        self._db = sqlite3.connect(self.index_path, check_same_thread=False)
+        self._db_lock = threading.Lock()
+        with self._db_lock, self._db:
+            self._db.execute("""CREATE TABLE IF NOT EXISTS reports (
+                id TEXT PRIMARY KEY, kind TEXT, session_id TEXT, candidate TEXT,
+                created REAL, duration REAL, score REAL, max_score REAL, path TEXT)""")
+            version = self._db.execute("PRAGMA user_version").fetchone()[0]
+            existing = {r[1] for r in self._db.execute("PRAGMA table_info(reports)")}
+            for column in _METRICS:
+                if column not in existing:
+                    self._db.execute(f"ALTER TABLE reports ADD COLUMN {column} REAL")
+            self._db.execute("""CREATE TABLE IF NOT EXISTS progress (
+                session_id TEXT, kind TEXT, reports INTEGER, confidence_sum REAL, clarity_sum REAL,
+                fluency_sum REAL, delivery_sum REAL, delivery_reports INTEGER, score_sum REAL, best_score REAL,
+                first_created REAL, first_score REAL, latest_created REAL, latest_score REAL,
+                PRIMARY KEY (session_id, kind))""")
+            self._db.execute("CREATE INDEX IF NOT EXISTS reports_by_kind ON reports (kind, created)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS reports_by_session ON reports (session_id, kind, created)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS reports_by_session_time ON reports (session_id, created)")
+        self._pending = {}  # Report id -> (row, report) until its file is on disk
+        self._lock = threading.Lock()
+        self._queue = Queue()
+        self.written = 0
+        self.failed = 0
+        self._thread = threading.Thread(target=self._write_loop, name="report-writer", daemon=True)
+        self._thread.start()
+        if version < INDEX_VERSION:
+            self._queue.put(self._upgrade_index)
+        self._queue.put(self._index_existing)  # Reports written before the index existed
+        atexit.register(self.flush, 5.0)
+
+    def new_id(self, kind):
+        """Unique, time-sortable id such as interview_20251019_130636_1f2e3d4c"""
+        prefix = _LAYOUT[kind][1]
+        return f"{prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+
+    def _path(self, kind, report_id):
+        return os.path.join(self.folder, _LAYOUT[kind][0], f"{report_id}.json")
+
+    def save(self, kind, report, session_id=None):
+        """Queue a report for writing and return its id. get() can read it back right away"""
+        report_id = self.new_id(kind)
+        row = dict(_summarize(kind, report), id=report_id, kind=kind, session_id=session_id,
+                   created=time.time(), path=self._path(kind, report_id))
+        with self._lock:
+            self._pending[report_id] = (row, report)
+        self._queue.put(report_id)
+        return report_id
+
+    def _write_loop(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if callable(item):
+                    item()
+                else:
+                    self._write(item)
+            except Exception as e:
+                print(f"⚠️ Could not save report {getattr(item, '__name__', item)}: {e}")
+                with self._lock:
+                    self.failed += 1
+            finally:
+                self._queue.task_done()
+
+    def _write(self, report_id):
+        with self._lock:
+            row, report = self._pending[report_id]
+        temp_path = f"{row['path']}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        os.replace(temp_path, row['path'])  # Readers never see a half-written report
+        self._index(row)
+        with self._lock:
+            del self._pending[report_id]
+            self.written += 1
+        print(f"💾 Report saved: {row['path']}")
+
+    def _index(self, row):
+        with self._db_lock, self._db:
+            self._db.execute(f"INSERT OR REPLACE INTO reports ({', '.join(_COLUMNS)}) "
+                             f"VALUES ({', '.join('?' * len(_COLUMNS))})", [row[c] for c in _COLUMNS])
+            if row['session_id'] is not None and row['score_percent'] is not None:
+                self._db.execute(_ADD_PROGRESS, _progress_values(row))
+
+    def _upgrade_index(self):
+        """Fill the score columns of reports indexed by an older version, then total them up"""
+        with self._db_lock:
+            rows = [dict(zip(_COLUMNS, r)) for r in self._db.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM reports WHERE score_percent IS NULL")]
+        for row in rows:
+            try:
+                with open(row['path'], 'r', encoding='utf-8') as f:
+                    row.update(_summarize(row['kind'], json.load(f)))
+            except (OSError, ValueError):
+                continue
+            with self._db_lock, self._db:
+                self._db.execute(f"UPDATE reports SET {', '.join(c + ' = ?' for c in _METRICS)} WHERE id = ?",
+                                 [row[c] for c in _METRICS] + [row['id']])
+        with self._db_lock, self._db:
+            self._db.execute("DELETE FROM progress")
+            for row in self._db.execute(f"SELECT {', '.join(_COLUMNS)} FROM reports WHERE session_id IS NOT NULL "
+                                        "AND score_percent IS NOT NULL ORDER BY created").fetchall():
+                self._db.execute(_ADD_PROGRESS, _progress_values(dict(zip(_COLUMNS, row))))
+            self._db.execute(f"PRAGMA user_version = {INDEX_VERSION}")
+
+    def _index_existing(self):
+        for kind, (subfolder, prefix) in _LAYOUT.items():
+            folder = os.path.join(self.folder, subfolder)
+            names = [n for n in os.listdir(folder) if n.startswith(prefix + '_') and n.endswith('.json')]
+            with self._db_lock:
+                known = {r[0] for r in self._db.execute("SELECT id FROM reports WHERE kind = ?", (kind,))}
+            for name in names:
+                report_id = name[:-len('.json')]
+                if report_id in known:
+                    continue
+                path = os.path.join(folder, name)
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        report = json.load(f)
+                except (OSError, ValueError):
+                    continue
+                self._index(dict(_summarize(kind, report), id=report_id, kind=kind, session_id=None,
+                                 created=os.path.getmtime(path), path=path))
+
+    def get(self, report_id):
+        """The report with this id, or None"""
+        with self._lock:
+            if report_id in self._pending:
+                return self._pending[report_id][1]
+        with self._db_lock:
+            found = self._db.execute("SELECT path FROM reports WHERE id = ?", (report_id,)).fetchone()
+        if found is None:
+            return None
+        try:
+            with open(found[0], 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def list(self, kind=None, session_id=None, limit=50):
+        """Index rows, newest first, including reports still being written"""
+        conditions, values = [], []
+        for column, value in (('kind', kind), ('session_id', session_id)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                values.append(value)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        # Pending first: the writer indexes a report before it stops being pending, so none is missed
+        with self._lock:
+            pending = [dict(row) for row, _ in self._pending.values()
+                       if kind in (None, row['kind']) and session_id in (None, row['session_id'])]
+        with self._db_lock:
+            rows = [dict(zip(_COLUMNS, r)) for r in self._db.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM reports {where} ORDER BY created DESC LIMIT ?", values + [limit])]
+        written = {row['id'] for row in rows}
+        rows = [row for row in pending if row['id'] not in written] + rows
+        return sorted(rows, key=lambda row: row['created'], reverse=True)[:limit]
+
+    def latest(self, kind, session_id=None):
+        rows = self.list(kind, session_id, limit=1)
+        return rows[0] if rows else None
+
+    def history(self, session_id, kind=None, limit=100):
+        """
+        Scores of one session's reports over time: the latest limit reports as
+        series (oldest first) and a summary over all of them, including reports
+        still being written. The summary comes from the progress table, so its
+        cost does not grow with the number of reports. Reports indexed from
+        files, without a session, are in no session's history.
+        """
+        with self._lock:
+            pending = [dict(row) for row, _ in self._pending.values()
+                       if row['session_id'] == session_id and kind in (None, row['kind'])
+                       and row['score_percent'] is not None]
+        kinds = (kind,) if kind else tuple(_LAYOUT)
+        with self._db_lock:
+            series = [dict(zip(_SERIES_COLUMNS, r)) for r in self._db.execute(
+                f"SELECT {', '.join(_SERIES_COLUMNS)} FROM reports WHERE session_id = ? "
+                f"AND kind IN ({', '.join('?' * len(kinds))}) AND score_percent IS NOT NULL "
+                "ORDER BY created DESC LIMIT ?", (session_id,) + kinds + (limit,))]
+            totals = [dict(zip(_PROGRESS_COLUMNS, r)) for r in self._db.execute(
+                f"SELECT {', '.join(_PROGRESS_COLUMNS)} FROM progress WHERE session_id = ? "
+                f"AND kind IN ({', '.join('?' * len(kinds))})", (session_id,) + kinds)]
+            # A report can finish writing between the two reads; count it once
+            written = {r[0] for r in self._db.execute(
+                f"SELECT id FROM reports WHERE id IN ({', '.join('?' * len(pending))})", [r['id'] for r in pending])}
+        pending = [row for row in pending if row['id'] not in written]
+        totals += [dict(zip(_PROGRESS_COLUMNS, _progress_values(row))) for row in pending]
+        series = sorted(series + [{c: row[c] for c in _SERIES_COLUMNS} for row in pending],
+                        key=lambda point: point['created'])[-limit:]
+        return {'series': series, 'summary': _progress_summary(totals)}
+
+    def flush(self, timeout=None):
+        """Wait until every queued report is on disk. Returns False on timeout"""
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+            with self._queue.all_tasks_done:
+                if not self._queue.unfinished_tasks:
+                    return True
+                remaining = None if deadline is None else deadline - time.time()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+
+    def stats(self):
+        with self._lock:
+            stats = {'written': self.written, 'failed': self.failed, 'pending': len(self._pending)}
+        with self._db_lock:
+            stats['indexed'] = self._db.execute("SELECT COUNT(*) FROM reports").fetchone()[0]
+        return stats
+
+
+def _summarize(kind, report):
+    """Index columns taken from a report's contents"""
+    if kind == INTERVIEW:
+        # Per-answer analyses, averaged; older interview reports have none
+        analyses = [r['analysis'] for r in report.get('responses', []) if 'analysis' in r]
+        metrics = {m: _mean([a[m] for a in analyses if m in a]) for m in ('confidence', 'clarity', 'fluency', 'delivery')}
+        score = report.get('average_score_percent')
+        return dict(metrics, candidate=report.get('resume_filename'), duration=report.get('duration'),
+                    score=score, max_score=100 if score is not None else None, score_percent=score)
+    summary = report.get('session_summary', {})
+    metrics = report.get('performance_metrics', {})
+    score = summary.get('overall_score')
+    max_score = summary.get('max_score', 80 if score is not None else None)
+    return {'candidate': None, 'duration': summary.get('duration_seconds'), 'score': score, 'max_score': max_score,
+            'confidence': metrics.get('confidence'), 'clarity': metrics.get('clarity'),
+            'fluency': metrics.get('fluency'), 'delivery': metrics.get('delivery'),
+            'score_percent': round(score * 100 / max_score, 1) if score is not None else None}
+
+
+def _mean(values):
+    return round(sum(values) / len(values), 1) if values else None
+
+
+# Adds one scored report to its session's running totals
+_ADD_PROGRESS = f"""INSERT INTO progress ({', '.join(_PROGRESS_COLUMNS)}) VALUES ({', '.join('?' * len(_PROGRESS_COLUMNS))})
+    ON CONFLICT (session_id, kind) DO UPDATE SET
+        reports = reports + 1,
+        confidence_sum = confidence_sum + excluded.confidence_sum,
+        clarity_sum = clarity_sum + excluded.clarity_sum,
+        fluency_sum = fluency_sum + excluded.fluency_sum,
+        delivery_sum = delivery_sum + excluded.delivery_sum,
+        delivery_reports = delivery_reports + excluded.delivery_reports,
+        score_sum = score_sum + excluded.score_sum,
+        best_score = max(best_score, excluded.best_score),
+        first_score = CASE WHEN excluded.first_created < first_created THEN excluded.first_score ELSE first_score END,
+        first_created = min(first_created, excluded.first_created),
+        latest_score = CASE WHEN excluded.latest_created >= latest_created THEN excluded.latest_score ELSE latest_score END,
+        latest_created = max(latest_created, excluded.latest_created)"""
+
+
+def _progress_values(row):
+    """One report as a progress row: a session's totals if it were its only report"""
+    delivery = row['delivery']
+    return (row['session_id'], row['kind'], 1, row['confidence'] or 0.0, row['clarity'] or 0.0,
+            row['fluency'] or 0.0, delivery or 0.0, int(delivery is not None), row['score_percent'],
+            row['score_percent'], row['created'], row['score_percent'], row['created'], row['score_percent'])
+
+
+def _progress_summary(totals):
+    """Averages, best, first and latest score and the change between them, over progress rows"""
+    reports = sum(t['reports'] for t in totals)
+    if not reports:
+        return {'reports': 0}
+    first = min(totals, key=lambda t: t['first_created'])
+    latest = max(totals, key=lambda t: t['latest_created'])
+    delivery_reports = sum(t['delivery_reports'] for t in totals)
+    return {
+        'reports': reports,
+        'average': {
+            'confidence': round(sum(t['confidence_sum'] for t in totals) / reports, 1),
+            'clarity': round(sum(t['clarity_sum'] for t in totals) / reports, 1),
+            'fluency': round(sum(t['fluency_sum'] for t in totals) / reports, 1),
+            'delivery': round(sum(t['delivery_sum'] for t in totals) / delivery_reports, 1) if delivery_reports else None,
+            'score_percent': round(sum(t['score_sum'] for t in totals) / reports, 1)
+        },
+        'best_score_percent': max(t['best_score'] for t in totals),
+        'first_score_percent': first['first_score'],
+        'latest_score_percent': latest['latest_score'],
+        'change_percent': round(latest['latest_score'] - first['first_score'], 1),
+        'first_created': first['first_created'],
+        'latest_created': latest['latest_created']
+    }
@@ -0,0 +1,79 @@
+"""
+Content-addressed cache for uploaded resumes
+Every upload used to be saved again under a new timestamped name and parsed
+from scratch. Uploads are now stored once per SHA-256 of their content, and
+the extracted text and generated questions are kept on disk as JSON keyed by
+that hash (and the extractor or generator version), so retrying an interview
+with the same resume skips parsing and question generation.
+"""
+
+import hashlib
+import json
+import os
+import threading
+
+RESUME_CACHE_FOLDER = os.path.join('uploads', 'cache')
+
+
+def sha256_of_file(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 16), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ResumeCache:
+    """JSON values on disk keyed by (content hash, name)"""
+
+    def __init__(self, folder=RESUME_CACHE_FOLDER):
+        self.folder = folder
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(folder, exist_ok=True)
+
+    def _path(self, digest, name):
+        return os.path.join(self.folder, f"{digest}.{name}.json")
+
+    def get(self, digest, name):
+        """Cached value, or None if there is none (or it is unreadable)"""
+        try:
+            with open(self._path(digest, name), 'r', encoding='utf-8') as f:
+                value = json.load(f)
+        except (OSError, ValueError):
+            value = None
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def put(self, digest, name, value):
+        path = self._path(digest, name)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(value, f, ensure_ascii=False)
+        os.replace(temp_path, path)  # Readers never see a half-written file
+
+    def store_upload(self, file, folder, extension):
+        """
+        Save an uploaded file (werkzeug FileStorage) as <sha256><extension> in folder.
+        Returns (digest, path, is_new); an identical earlier upload is reused.
+        """
+        data = file.read()
+        digest = hashlib.sha256(data).hexdigest()
+        path = os.path.join(folder, f"{digest}{extension}")
+        is_new = not os.path.exists(path)
+        if is_new:
+            os.makedirs(folder, exist_ok=True)
+            temp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        return digest, path, is_new
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses}
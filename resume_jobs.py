@@ -0,0 +1,117 @@
+"""
+Background preparation of uploaded resumes
+Parsing a resume (PyPDF2 / python-docx), generating its interview questions
+(possibly an AI call) and synthesizing their audio used to happen inline in
+/start_interview. /upload_resume now starts a job that does all of it in the
+background; /start_interview picks up the finished result or waits for the
+job that is still running. A job is ready once its prompts are synthesized,
+or after synthesis_timeout with the rest still queued; the snapshot reports
+how many prompts have their audio.
+"""
+
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+QUEUED = 'queued'
+PARSING = 'parsing'
+GENERATING = 'generating'
+SYNTHESIZING = 'synthesizing'
+READY = 'ready'
+FAILED = 'failed'
+
+
+class ResumeJob:
+    """Progress and result of preparing one uploaded resume"""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, path):
+        self.id = next(self._ids)
+        self.path = path
+        self.status = QUEUED
+        self.error = None
+        self.resume_text = ""
+        self.questions = []
+        self.prompts = []  # Synthesis requests of the prompt audio
+        self.created = time.time()
+        self.finished = None
+        self.done = threading.Event()
+
+    def wait(self, timeout=None):
+        """Wait for the job to finish. Returns True if it is ready"""
+        self.done.wait(timeout)
+        return self.status == READY
+
+    def snapshot(self):
+        """Job progress as a JSON-serializable dict"""
+        elapsed = (self.finished or time.time()) - self.created
+        return {
+            'job_id': self.id,
+            'status': self.status,
+            'error': self.error,
+            'resume_chars': len(self.resume_text),
+            'questions': len(self.questions),
+            'prompts_queued': len(self.prompts),
+            'prompts_synthesized': sum(request.done.is_set() and request.ok for request in self.prompts),
+            'elapsed_seconds': round(elapsed, 2)
+        }
+
+
+class ResumeJobRunner:
+    """Runs ResumeJobs on a small pool and keeps the most recent ones for lookup"""
+
+    def __init__(self, parse, generate, prefetch=None, max_workers=2, max_jobs=200, synthesis_timeout=10.0):
+        self.parse = parse  # parse(path) -> resume text
+        self.generate = generate  # generate(resume_text) -> list of questions
+        self.prefetch = prefetch  # prefetch(questions) -> queued synthesis requests, with done events
+        self.max_jobs = max_jobs
+        self.synthesis_timeout = synthesis_timeout  # Longest wait for the prompt audio before READY
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="resume")
+        self._lock = threading.Lock()
+        self._jobs = {}
+
+    def submit(self, path):
+        """Start preparing the resume at path and return its job"""
+        job = ResumeJob(path)
+        with self._lock:
+            self._jobs[job.id] = job
+            if len(self._jobs) > self.max_jobs:
+                finished = [j for j in self._jobs.values() if j.done.is_set()]
+                for old in finished[:len(self._jobs) - self.max_jobs]:
+                    del self._jobs[old.id]
+        self._executor.submit(self._run, job)
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _run(self, job):
+        try:
+            job.status = PARSING
+            job.resume_text = self.parse(job.path)
+            print(f"✅ Extracted {len(job.resume_text)} characters from resume")
+
+            job.status = GENERATING
+            job.questions = self.generate(job.resume_text)
+            print(f"📋 Generated {len(job.questions)} questions")
+
+            if self.prefetch is not None:
+                job.status = SYNTHESIZING
+                job.prompts = list(self.prefetch(job.questions) or [])
+                deadline = time.monotonic() + self.synthesis_timeout
+                for request in job.prompts:
+                    if not request.done.wait(max(0.0, deadline - time.monotonic())):
+                        # The rest stays queued and is played from the cache once it is done
+                        print(f"⚠️ Prompt audio not ready after {self.synthesis_timeout:.0f}s - continuing")
+                        break
+            job.status = READY
+        except Exception as e:
+            print(f"⚠️ Resume preparation failed: {e}")
+            job.error = str(e)
+            job.status = FAILED
+        finally:
+            job.finished = time.time()
+            job.done.set()
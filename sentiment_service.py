@@ -0,0 +1,214 @@
+"""
+Micro-batched sentiment inference shared by all sessions
+test.py ran the HuggingFace pipeline once per utterance, so every phrase was
+its own forward pass. SentimentService collects the texts submitted by every
+session for a few milliseconds and runs them through the model as one padded
+batch; each caller gets its result back through a Future. Backends are
+pluggable: a transformer on ONNX Runtime, with int8 dynamic quantization or
+plain PyTorch, TextBlob polarity, and a deterministic fake for benchmarks.
+"""
+
+import threading
+import time
+from concurrent.futures import Future
+from queue import Queue, Empty
+
+from lazy_models import is_loaded, lazy_import
+
+textblob_sentiments = lazy_import('textblob.en.sentiments')
+
+SENTIMENT_MODEL = "distilbert-base-uncased-finetuned-sst-2-english"
+
+
+class SentimentBackend:
+    """Scores a batch of texts as [{'label': 'POSITIVE' or 'NEGATIVE', 'score': probability}]"""
+
+    name = "base"
+
+    def predict(self, texts):
+        raise NotImplementedError
+
+
+class TransformerBackend(SentimentBackend):
+    """Sequence-classification transformer on CPU: onnx (ONNX Runtime), quantized (int8) or torch"""
+
+    def __init__(self, model_name=SENTIMENT_MODEL, runtime="onnx", max_length=128, threads=2):
+        import torch
+        from transformers import AutoTokenizer
+        torch.set_num_threads(threads)
+        self._torch = torch
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        if runtime == "onnx":
+            from optimum.onnxruntime import ORTModelForSequenceClassification
+            self.model = ORTModelForSequenceClassification.from_pretrained(model_name, export=True)
+        else:
+            from transformers import AutoModelForSequenceClassification
+            self.model = AutoModelForSequenceClassification.from_pretrained(model_name).eval()
+            if runtime == "quantized":
+                self.model = torch.quantization.quantize_dynamic(self.model, {torch.nn.Linear}, dtype=torch.qint8)
+        self.name = f"transformer-{runtime}"
+        self.max_length = max_length
+        self.labels = self.model.config.id2label
+
+    def predict(self, texts):
+        # Padded to the longest text in the batch, not to max_length
+        inputs = self.tokenizer(texts, padding=True, truncation=True, max_length=self.max_length,
+                                return_tensors="pt")
+        with self._torch.no_grad():
+            probabilities = self.model(**inputs).logits.softmax(dim=-1)
+        scores, indices = probabilities.max(dim=-1)
+        return [{'label': self.labels[int(i)].upper(), 'score': float(s)} for s, i in zip(scores, indices)]
+
+
+class TextBlobBackend(SentimentBackend):
+    """TextBlob polarity as a positive probability, (polarity + 1) / 2"""
+
+    name = "textblob"
+
+    def __init__(self):
+        self.analyzer = textblob_sentiments.PatternAnalyzer()
+
+    def predict(self, texts):
+        results = []
+        for text in texts:
+            positive = (self.analyzer.analyze(text).polarity + 1) / 2
+            label = 'POSITIVE' if positive >= 0.5 else 'NEGATIVE'
+            results.append({'label': label, 'score': positive if label == 'POSITIVE' else 1 - positive})
+        return results
+
+
+class FakeBackend(SentimentBackend):
+    """
+    Deterministic stand-in for benchmarks: words from a small lexicon decide the
+    label, and each call sleeps like a forward pass (a fixed cost per batch plus a
+    cost per padded text).
+    """
+
+    name = "fake"
+    POSITIVE_WORDS = {"good", "great", "love", "loved", "enjoy", "success", "excited", "proud", "happy"}
+    NEGATIVE_WORDS = {"bad", "hate", "hated", "terrible", "difficult", "failed", "angry", "boring"}
+
+    def __init__(self, batch_cost=0.008, item_cost=0.001):
+        self.batch_cost = batch_cost
+        self.item_cost = item_cost
+        self.batches = []
+
+    def predict(self, texts):
+        self.batches.append(len(texts))
+        time.sleep(self.batch_cost + self.item_cost * len(texts))
+        results = []
+        for text in texts:
+            words = set(text.lower().split())
+            balance = len(words & self.POSITIVE_WORDS) - len(words & self.NEGATIVE_WORDS)
+            results.append({'label': 'NEGATIVE' if balance < 0 else 'POSITIVE', 'score': 0.9 if balance else 0.6})
+        return results
+
+
+BACKENDS = {
+    "transformer": lambda **options: TransformerBackend(runtime="onnx", **options),
+    "transformer-quantized": lambda **options: TransformerBackend(runtime="quantized", **options),
+    "transformer-torch": lambda **options: TransformerBackend(runtime="torch", **options),
+    "textblob": TextBlobBackend,
+    "fake": FakeBackend,
+}
+
+
+def create_sentiment_backend(name, **options):
+    """Create a backend by name, falling back to TextBlob if a model cannot load"""
+    try:
+        backend = BACKENDS[name](**options)
+        print(f"✅ Sentiment backend: {backend.name}")
+        return backend
+    except Exception as e:
+        print(f"⚠️ Could not load '{name}' sentiment backend ({e}) - using TextBlob")
+        return TextBlobBackend()
+
+
+def positive_probability(result):
+    """Probability that the text is positive, from a backend result"""
+    return result['score'] if result['label'] == 'POSITIVE' else 1 - result['score']
+
+
+class _Request:
+    def __init__(self, text):
+        self.text = text
+        self.future = Future()
+        self.submitted = time.perf_counter()
+
+
+class SentimentService:
+    """
+    One inference thread shared by all sessions. A batch is run as soon as
+    max_batch texts are waiting or max_wait seconds after the first one arrived.
+    """
+
+    def __init__(self, backend, max_batch=32, max_wait=0.005):
+        self.backend = backend
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._requests = Queue()
+        self._lock = threading.Lock()
+        self._latencies = []
+        self.batches = 0
+        self.completed = 0
+        self.failed = 0
+        self._thread = threading.Thread(target=self._batch_loop, name="sentiment", daemon=True)
+        self._thread.start()
+
+    def submit(self, text):
+        """Queue a text and return a Future of its {'label', 'score'} result"""
+        request = _Request(text)
+        self._requests.put(request)
+        return request.future
+
+    def predict(self, texts, timeout=None):
+        """Results for a list of texts, batched together with everyone else's"""
+        futures = [self.submit(text) for text in texts]
+        return [future.result(timeout=timeout) for future in futures]
+
+    def _next_batch(self):
+        batch = [self._requests.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            try:
+                batch.append(self._requests.get(timeout=remaining) if remaining > 0 else self._requests.get_nowait())
+            except Empty:
+                break
+        return batch
+
+    def _batch_loop(self):
+        while True:
+            batch = self._next_batch()
+            try:
+                results = self.backend.predict([request.text for request in batch])
+            except Exception as e:
+                print(f"⚠️ Sentiment inference failed: {e}")
+                with self._lock:
+                    self.failed += len(batch)
+                for request in batch:
+                    request.future.set_exception(e)
+                continue
+            done = time.perf_counter()
+            with self._lock:
+                self.batches += 1
+                self.completed += len(batch)
+                self._latencies.extend(done - request.submitted for request in batch)
+                del self._latencies[:-500]  # Keep recent samples only
+            for request, result in zip(batch, results):
+                request.future.set_result(result)
+
+    def stats(self):
+        with self._lock:
+            latencies = sorted(self._latencies)
+            stats = {
+                'backend': self.backend.name if is_loaded(self.backend) else "not loaded",
+                'batches': self.batches,
+                'completed': self.completed,
+                'failed': self.failed,
+                'avg_batch_size': round(self.completed / self.batches, 1) if self.batches else 0
+            }
+        if latencies:
+            stats['latency_p50_ms'] = round(latencies[len(latencies) // 2] * 1000, 1)
+            stats['latency_max_ms'] = round(latencies[-1] * 1000, 1)
+        return stats
@@ -0,0 +1,347 @@
+"""
+Per-session state for the web application
+Each browser session gets its own practice and interview state so that many
+candidates can use one server process at the same time. State changes are
+signalled through a ChangeNotifier so event streams can push them immediately.
+"""
+
+import threading
+import time
+from queue import Queue, Empty
+
+from audio_device import AudioDeviceArbiter
+from recording import VideoRecorder
+
+
+class ChangeNotifier:
+    """Version counter plus condition variable that event streams wait on"""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self.version = 0
+
+    def notify(self):
+        with self._cond:
+            self.version += 1
+            self._cond.notify_all()
+
+    def wait(self, last_version, timeout=None):
+        """Block until the version differs from last_version (or timeout) and return it"""
+        with self._cond:
+            self._cond.wait_for(lambda: self.version != last_version, timeout)
+            return self.version
+
+
+class PracticeSession:
+    """State for one English practice (scrolling text) session"""
+
+    def __init__(self, changes=None):
+        self.lock = threading.RLock()
+        self.changes = changes or ChangeNotifier()
+        self.version = 0  # Bumped whenever the feedback shown to the browser changes
+        self.is_recording = False
+        self.recording_start_time = None
+        self.all_transcripts = []
+        self.all_scores = []
+        self.recorder = None  # VideoRecorder of the current recording
+        self.last_frame_version = 0  # Camera frame last recorded, so two tabs don't record it twice
+        self.current_feedback = {}
+        self.scroll_text = ""
+        self.scroll_speed = 3
+        self.scroll_x = 0
+        self.scroll_version = 0  # Camera frame the scroll position was last advanced for
+        self.speech_thread = None
+
+    def start(self, scroll_text, video_path=None):
+        """Reset state for a new recording, saving the video to video_path. Returns False if already recording"""
+        with self.lock:
+            if self.is_recording:
+                return False
+            self.is_recording = True
+            self.recording_start_time = time.time()
+            self.all_transcripts = []
+            self.all_scores = []
+            self.recorder = VideoRecorder(video_path) if video_path else None
+            self.current_feedback = {}  # Clear old feedback
+            self.scroll_text = scroll_text
+            self.scroll_x = 0
+            self._changed()
+            return True
+
+    def _changed(self):
+        self.version += 1
+        self.changes.notify()
+
+    def stop(self):
+        """
+        Stop recording and return (transcripts, scores, duration, recorder), or None if not recording.
+        The recorder (None if no video was recorded) is closed and finishes its file in the background;
+        recorder.join() waits for it.
+        """
+        with self.lock:
+            if not self.is_recording:
+                return None
+            self.is_recording = False
+            duration = time.time() - self.recording_start_time
+            recorder, self.recorder = self.recorder, None
+            if recorder is not None:
+                recorder.close()
+            self._changed()
+            return list(self.all_transcripts), list(self.all_scores), duration, recorder
+
+    def record_frame(self, version, frame):
+        """Record a camera frame unless another client of this session already did"""
+        with self.lock:
+            if not self.is_recording or self.recorder is None or version <= self.last_frame_version:
+                return False
+            self.last_frame_version = version
+            return self.recorder.write(frame)
+
+    def overlay_state(self, version, frame_width):
+        """
+        Everything drawn on top of camera frame `version` for this session, as a hashable tuple.
+        The scroll position advances once per camera frame, shared by every tab of the session.
+        Idle sessions all return the same state, so they can share encoded frames.
+        """
+        with self.lock:
+            scroll_text = self.scroll_text if self.is_recording else ""
+            if scroll_text and version > self.scroll_version:
+                self.scroll_x -= self.scroll_speed
+                if self.scroll_x < -len(scroll_text) * 15:
+                    self.scroll_x = frame_width
+            self.scroll_version = max(self.scroll_version, version)
+
+            feedback = None
+            if self.current_feedback:
+                analysis = self.current_feedback['analysis']
+                feedback = (analysis['confidence'], analysis['clarity'], analysis['fluency'],
+                            analysis.get('delivery'), analysis['score'], analysis.get('max_score', 80))
+            return (self.is_recording, scroll_text,
+                    int(self.scroll_x) if scroll_text else 0, feedback)
+
+    def add_result(self, text, analysis):
+        """Store one recognized utterance and its analysis"""
+        with self.lock:
+            self.current_feedback = {
+                "text": text,
+                "analysis": analysis,
+                "timestamp": time.time()
+            }
+            self.all_transcripts.append(text)
+            self.all_scores.append(analysis)
+            self._changed()
+
+    def feedback_snapshot(self):
+        """Return (is_recording, copy of current feedback)"""
+        with self.lock:
+            return self.is_recording, dict(self.current_feedback)
+
+
+def _notifying(name):
+    """Property stored in `name` whose setter calls _set, so changes reach event streams"""
+    return property(lambda self: getattr(self, name),
+                    lambda self, value: self._set(name, value))
+
+
+class InterviewSession:
+    """State for one AI interview session"""
+
+    def __init__(self, changes=None):
+        self.lock = threading.RLock()
+        self.changes = changes or ChangeNotifier()
+        self.version = 0  # Bumped whenever the state shown to the browser changes
+        self._active = False
+        self._ai_speaking = False
+        self._user_listening = False
+        self._current_question_index = 0
+        self.questions = []
+        self.responses = []
+        self.messages = []
+        self.conversation_history = []  # Store entire conversation for context
+        self.start_time = None
+        self.thread = None
+        self.partial_transcript = ""  # What the candidate has said so far in the current answer
+        self.audio_device = AudioDeviceArbiter()  # Keeps this interview's TTS and microphone apart
+        self.last_prompt_end = None  # When the AI last finished speaking
+        self.handoffs = []  # Seconds from the end of each prompt to the microphone opening
+        self.message_queue = Queue()
+        self.resume_text = ""
+        self.resume_filename = ""
+        self.improvement_report = ""
+
+    def _changed(self):
+        self.version += 1
+        self.changes.notify()
+
+    def _set(self, name, value):
+        # Update a state flag and wake event streams if it actually changed
+        with self.lock:
+            if getattr(self, name) != value:
+                setattr(self, name, value)
+                self._changed()
+
+    active = _notifying('_active')
+    ai_speaking = _notifying('_ai_speaking')
+    user_listening = _notifying('_user_listening')
+    current_question_index = _notifying('_current_question_index')
+
+    def start(self, questions, resume_text=""):
+        """Reset state for a new interview. Returns False if one is already active"""
+        with self.lock:
+            if self.active:
+                return False
+            self.active = True
+            self.start_time = time.time()
+            self.questions = list(questions)
+            self.current_question_index = 0
+            self.responses = []
+            self.messages = []
+            self.conversation_history = []  # Clear conversation history for new interview
+            self.resume_text = resume_text
+            self.improvement_report = ""
+            self.last_prompt_end = None
+            self.handoffs = []
+            self.message_queue = Queue()
+            self._changed()
+            return True
+
+    def post_message(self, msg_type, content, history=True):
+        """Record a message in the transcript and queue it for the browser"""
+        message = {
+            'type': msg_type,
+            'content': content,
+            'timestamp': time.time()
+        }
+        with self.lock:
+            self.messages.append(message)
+            self.partial_transcript = ""  # Any new message supersedes the live transcript
+            if history:
+                self.conversation_history.append(dict(message))
+            self.message_queue.put({'type': msg_type, 'content': content})
+            self._changed()
+
+    def set_partial(self, text):
+        """Update the live transcript of the answer being spoken"""
+        with self.lock:
+            if text != self.partial_transcript:
+                self.partial_transcript = text
+                self._changed()
+
+    def prompt_ended(self):
+        """Note that the AI has finished speaking"""
+        with self.lock:
+            self.last_prompt_end = time.time()
+
+    def add_handoff(self, seconds):
+        """Record how long after the last prompt the microphone started listening"""
+        with self.lock:
+            self.handoffs.append(seconds)
+
+    def add_response(self, question, answer, prosody=None):
+        """Store an answer (and the prosody of its audio) and advance to the next question"""
+        with self.lock:
+            self.responses.append({
+                'question': question,
+                'question_number': self.current_question_index + 1,
+                'answer': answer,
+                'prosody': prosody,
+                'timestamp': time.time()
+            })
+            self.current_question_index += 1
+
+    def drain_messages(self):
+        """Get all queued messages that the browser has not seen yet"""
+        new_messages = []
+        while True:
+            try:
+                new_messages.append(self.message_queue.get_nowait())
+            except Empty:
+                break
+        return new_messages
+
+    def state_snapshot(self):
+        """Return the interview state as a JSON-serializable dict"""
+        with self.lock:
+            current_q = None
+            if self.current_question_index < len(self.questions):
+                current_q = {
+                    'number': self.current_question_index + 1,
+                    'text': self.questions[self.current_question_index]
+                }
+            return {
+                'ai_speaking': self.ai_speaking,
+                'listening': self.user_listening,
+                'partial_transcript': self.partial_transcript,
+                'current_question': current_q,
+                'questions_answered': len(self.responses),
+                'interview_complete': self.current_question_index >= len(self.questions)
+            }
+
+    def report_data(self):
+        """Return the interview transcript for saving to disk"""
+        with self.lock:
+            duration = time.time() - self.start_time if self.start_time else 0
+            handoffs = self.handoffs
+            return {
+                'duration': duration,
+                'listen_handoff_avg_ms': round(sum(handoffs) / len(handoffs) * 1000, 1) if handoffs else None,
+                'listen_handoff_max_ms': round(max(handoffs) * 1000, 1) if handoffs else None,
+                'questions': list(self.questions),
+                'responses': list(self.responses),
+                'messages': list(self.messages),
+                'resume_filename': self.resume_filename or 'Unknown'
+            }
+
+
+class UserSession:
+    """Practice and interview state that belongs to one browser session"""
+
+    def __init__(self, session_id):
+        self.session_id = session_id
+        self.changes = ChangeNotifier()  # Shared, so one event stream can watch both
+        self.practice = PracticeSession(self.changes)
+        self.interview = InterviewSession(self.changes)
+        self.last_seen = time.time()
+
+    def is_busy(self):
+        """True while a recording or interview is still running"""
+        return self.practice.is_recording or self.interview.active
+
+
+class SessionRegistry:
+    """Thread-safe registry of UserSession objects keyed by session id"""
+
+    def __init__(self, idle_timeout=3600):
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._sessions = {}
+
+    def get(self, session_id):
+        """Get the session for this id, creating it on first use"""
+        with self._lock:
+            user_session = self._sessions.get(session_id)
+            if user_session is None:
+                user_session = UserSession(session_id)
+                self._sessions[session_id] = user_session
+            user_session.last_seen = time.time()
+            return user_session
+
+    def practice(self, session_id):
+        return self.get(session_id).practice
+
+    def interview(self, session_id):
+        return self.get(session_id).interview
+
+    def prune(self):
+        """Drop idle sessions that have no recording or interview running"""
+        cutoff = time.time() - self.idle_timeout
+        with self._lock:
+            stale = [sid for sid, s in self._sessions.items()
+                     if s.last_seen < cutoff and not s.is_busy()]
+            for sid in stale:
+                del self._sessions[sid]
+        return len(stale)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._sessions)
@@ -0,0 +1,130 @@
+"""
+Skill taxonomy and keyword matching for resumes and answers
+The resume and answer topics, their keywords and their question banks live in
+data/skills.json. All terms of a topic set are compiled once into a single
+regular expression, so a text is scanned once instead of once per keyword.
+The alternation is factored into a trie, so each word start follows a single
+branch however many terms there are. Terms only match whole words ('ai' no
+longer matches inside 'maintain'), with word boundaries that also suit 'c++'
+and 'c#'.
+"""
+
+import json
+import os
+import re
+
+SKILLS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'skills.json')
+
+WORD_PATTERN = re.compile(r"\w[\w+#]*")  # Keeps 'c++' and 'c#' as one word
+WORD_END = r"(?![\w+#])"
+PREFIX_END = r"[\w+#]*"
+# Checked after a term's first character, so the regex engine can skip ahead to possible first characters
+WORD_START = r"(?<![\w+#].)"
+
+# Trie keys besides characters, none of which can occur inside a word
+_SEPARATOR, _EXACT, _PREFIX = " ", "$", "*"
+
+
+def _parse_term(term):
+    """(words, last word is a prefix) of a taxonomy term such as 'machine learning' or 'lead*'"""
+    term = term.lower().strip()
+    return tuple(WORD_PATTERN.findall(term)), term.endswith('*')
+
+
+def _compile_terms(terms):
+    """
+    One regular expression matching any of the (words, is_prefix) terms in lowercase text. Each
+    term ends in an empty group named t<index>, so match.lastgroup tells which term matched.
+    """
+    root = {}
+    for index, (words, is_prefix) in enumerate(terms):
+        node = root
+        for position, word in enumerate(words):
+            if position:
+                node = node.setdefault(_SEPARATOR, {})
+            for char in word:
+                node = node.setdefault(char, {})
+        node.setdefault(_PREFIX if is_prefix else _EXACT, index)
+    return re.compile(_trie_pattern(root, first=True))
+
+
+def _trie_pattern(node, first=False):
+    branches = []
+    for key, child in node.items():
+        if key == _EXACT:
+            branches.append(f"(?P<t{child}>){WORD_END}")
+        elif key == _PREFIX:
+            branches.append(f"(?P<t{child}>){PREFIX_END}")
+        else:
+            # Words of a phrase may be separated by any run of spaces or punctuation
+            head = r"\W+" if key == _SEPARATOR else re.escape(key)
+            branches.append(head + (WORD_START if first else "") + _trie_pattern(child))
+    return branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+
+
+def _may_overlap(first, second):
+    """Whether both terms could match starting at the same word, where the regex only reports one"""
+    (words, is_prefix), (other_words, other_prefix) = first, second
+
+    def starts(term_words, prefix, word):
+        return word.startswith(term_words[0]) if prefix and len(term_words) == 1 else word == term_words[0]
+
+    # A phrase also hides terms that start at any of its later words
+    return any(starts(other_words, other_prefix, word) for word in words) or \
+        any(starts(words, is_prefix, word) for word in other_words)
+
+
+class SkillIndex:
+    """Topic keywords compiled into one regular expression. Terms ending in * match as word prefixes"""
+
+    def __init__(self, topics):
+        # topics: {topic name: [terms]} in the order results should be reported
+        self.topics = list(topics)
+        self._order = {topic: i for i, topic in enumerate(self.topics)}
+        term_topics = {}  # (words, is_prefix) -> topics with that term
+        for topic, terms in topics.items():
+            for words, is_prefix in map(_parse_term, terms):
+                if words and topic not in term_topics.setdefault((words, is_prefix), []):
+                    term_topics[(words, is_prefix)].append(topic)
+        terms = list(term_topics)
+        self._topics = {f"t{i}": term_topics[term] for i, term in enumerate(terms)}  # Group name -> topics
+        self._pattern = _compile_terms(terms) if terms else None
+        # A word matching two different terms is reported for one of them only. When that one is found,
+        # the terms it may hide are searched for on their own
+        self._hidden = {}
+        for i, term in enumerate(terms):
+            for j, other in enumerate(terms):
+                if i != j and term_topics[term] != term_topics[other] and _may_overlap(term, other):
+                    self._hidden.setdefault(f"t{i}", []).append(f"t{j}")
+        self._term_patterns = {name: _compile_terms([terms[int(name[1:])]])
+                               for name in {name for names in self._hidden.values() for name in names}}
+
+    def match(self, text):
+        """Topics mentioned in text, in taxonomy order"""
+        if self._pattern is None:
+            return []
+        text = text.lower()
+        matched = {m.lastgroup for m in self._pattern.finditer(text)}
+        found = {topic for name in matched for topic in self._topics[name]}
+        for name in [hidden for name in matched for hidden in self._hidden.get(name, ())]:
+            if not found.issuperset(self._topics[name]) and self._term_patterns[name].search(text):
+                found.update(self._topics[name])
+        return sorted(found, key=self._order.__getitem__)
+
+
+class SkillTaxonomy:
+    """Resume and answer topics with their question banks, loaded from a JSON file"""
+
+    def __init__(self, path=SKILLS_FILE):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        self.version = data['version']
+        self.resume_opening = data['resume_opening']
+        self.resume_topics = data['resume_topics']
+        self.resume_closing = data['resume_closing']
+        self.answer_topics = data['answer_topics']
+        self.generic_follow_ups = data['generic_follow_ups']
+        self.resume = SkillIndex({name: topic['terms'] for name, topic in self.resume_topics.items()})
+        self.answers = SkillIndex({name: topic['terms'] for name, topic in self.answer_topics.items()})
+        print(f"✅ Skill taxonomy v{self.version}: {len(self.resume_topics)} resume topics, "
+              f"{len(self.answer_topics)} answer topics")
@@ -0,0 +1,202 @@
+"""
+Soft-skill scoring for transcribed answers
+analyze_text_softskills() used to build a TextBlob per utterance and run
+blob.correct(), which looks up edit-distance candidates for every word again on
+every call. SoftSkillScorer keeps one spelling model and sentiment analyzer for
+the whole app, caches per-word corrections in an LRU, and scores a batch of
+utterances at once with numpy.
+Text is read once by TextFeatures, which gives the tokens, words, sentence
+lengths and filler words used by every score (and by the practice report).
+When the utterance's audio prosody is known, a delivery score is added.
+Confidence comes from TextBlob polarity, or from a transformer model through
+the shared, micro-batched SentimentService when one is given.
+"""
+
+import re
+import threading
+from functools import lru_cache
+
+import numpy as np
+
+from lazy_models import lazy, lazy_import
+from prosody import delivery_score
+from sentiment_service import positive_probability
+
+textblob_en = lazy_import('textblob.en')
+sentiments = lazy_import('textblob.en.sentiments')
+
+FILLER_WORDS = ["um", "umm", "uh", "uhh", "er", "erm", "ah", "hmm", "like", "you know", "i mean",
+                "basically", "literally", "kind of", "sort of", "you see"]
+
+# Same tokens as TextBlob.correct(): word, punctuation or whitespace
+TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]|\s", re.UNICODE | re.MULTILINE | re.DOTALL)
+SENTENCE_END = {".", "!", "?"}
+APOSTROPHES = {"'", "\u2019"}
+
+
+class FillerLexicon:
+    """Filler words and phrases, matched as whole words"""
+
+    def __init__(self, fillers=FILLER_WORDS):
+        self._phrases = {}  # First word -> phrases as word tuples, longest first
+        for filler in fillers:
+            words = tuple(filler.lower().split())
+            if words:
+                self._phrases.setdefault(words[0], []).append(words)
+        for phrases in self._phrases.values():
+            phrases.sort(key=len, reverse=True)
+
+    def find(self, words):
+        """Fillers in a list of lowercase words, in order"""
+        hits = []
+        index = 0
+        while index < len(words):
+            for phrase in self._phrases.get(words[index], ()):
+                if tuple(words[index:index + len(phrase)]) == phrase:
+                    hits.append(" ".join(phrase))
+                    index += len(phrase)
+                    break
+            else:
+                index += 1
+        return hits
+
+
+class TextFeatures:
+    """Tokens, words, sentence lengths and filler words of one utterance, from a single pass"""
+
+    def __init__(self, text, lexicon):
+        self.text = text
+        self.tokens = TOKEN_PATTERN.findall(text)
+        self.words = []
+        self.sentence_lengths = []
+        sentence = 0
+        for index, token in enumerate(self.tokens):
+            if token[0].isalnum() or token[0] == "_":
+                previous = self.tokens[index - 2:index]
+                if sentence and len(previous) == 2 and previous[1] in APOSTROPHES and previous[0][0].isalnum():
+                    self.words[-1] += "'" + token.lower()  # don't, I'm
+                else:
+                    self.words.append(token.lower())
+                    sentence += 1
+            elif token in SENTENCE_END and sentence:
+                following = self.tokens[index + 1:index + 2]
+                if not following or not (following[0][0].isalnum() or following[0][0] == "_"):  # Not 1.5 or node.js
+                    self.sentence_lengths.append(sentence)
+                    sentence = 0
+        if sentence:
+            self.sentence_lengths.append(sentence)
+        self.fillers = lexicon.find(self.words)
+
+    @property
+    def word_count(self):
+        return len(self.words)
+
+    @property
+    def sentence_count(self):
+        return len(self.sentence_lengths)
+
+    @property
+    def avg_sentence_length(self):
+        return self.word_count / max(1, self.sentence_count)
+
+
+class SoftSkillScorer:
+    """Confidence, clarity and fluency scores with a shared, cached spelling model"""
+
+    def __init__(self, fillers=FILLER_WORDS, cache_size=20000, sentiment=None, sentiment_timeout=5.0):
+        self.lexicon = FillerLexicon(fillers)
+        self.sentiment = sentiment  # Optional SentimentService used instead of TextBlob polarity
+        self.sentiment_timeout = sentiment_timeout
+        self.analyzer = lazy('sentiment analyzer', lambda: sentiments.PatternAnalyzer())
+        self._correct_word = lru_cache(maxsize=cache_size)(self._suggest)
+        self._lock = threading.Lock()
+        self.scored = 0
+
+    @staticmethod
+    def _suggest(word):
+        return textblob_en.spelling.suggest(word)[0][0]
+
+    def _positive(self, features):
+        # Probability that each text is positive; texts without words are neutral
+        positive = np.full(len(features), 0.5)
+        worded = [i for i, f in enumerate(features) if f.words]
+        if self.sentiment is not None and worded:
+            try:
+                results = self.sentiment.predict([features[i].text for i in worded], timeout=self.sentiment_timeout)
+                positive[worded] = [positive_probability(r) for r in results]
+                return positive
+            except Exception as e:
+                print(f"⚠️ Sentiment model unavailable ({e}) - using TextBlob polarity")
+        for i in worded:
+            positive[i] = (self.analyzer.analyze(features[i].text).polarity + 1) / 2
+        return positive
+
+    def features(self, text):
+        return TextFeatures(text, self.lexicon)
+
+    def correct(self, text):
+        """Spelling-corrected text, like str(TextBlob(text).correct())"""
+        tokens = text.tokens if isinstance(text, TextFeatures) else TOKEN_PATTERN.findall(text)
+        return "".join(self._correct_word(token) for token in tokens)
+
+    def score(self, text, prosody=None):
+        return self.score_batch([text], [prosody])[0]
+
+    def score_batch(self, texts, prosody=None):
+        """
+        Feedback dicts (confidence, clarity, fluency, score, words, fillers) for a list of
+        utterances. words and fillers are counts that reports can reuse. prosody is an
+        optional list of ProsodyTracker summaries; where one is given (with enough speech)
+        the 0-20 point delivery score is added and max_score becomes 100 instead of 80.
+        """
+        if not texts:
+            return []
+        features = [self.features(text) for text in texts]
+
+        # Confidence (0-30 points) from how positive the answer sounds
+        confidence = self._positive(features) * 30
+
+        # Clarity (grammar)
+        clarity = np.empty(len(texts))
+        for i, f in enumerate(features):
+            try:
+                errors = len(self.correct(f).split()) - len(f.text.split())
+                clarity[i] = max(0, 30 - abs(errors) * 5)
+            except Exception as e:
+                print(f"⚠️ Error computing clarity score: {e}")
+                clarity[i] = 25
+
+        # Fluency
+        fillers = np.array([len(f.fillers) for f in features])
+        avg_sentence_length = np.array([f.avg_sentence_length for f in features])
+        fluency = np.clip(avg_sentence_length * 3 - fillers * 5, 0, 20)
+
+        # Delivery (0-20 points) from the audio
+        delivery = [delivery_score(p) for p in prosody] if prosody else [None] * len(texts)
+
+        with self._lock:
+            self.scored += len(texts)
+        results = []
+        for f, conf, clar, flu, deliv in zip(features, confidence.tolist(), clarity.tolist(), fluency.tolist(),
+                                             delivery):
+            feedback = {"confidence": round(conf, 1), "clarity": round(clar, 1), "fluency": round(flu, 1)}
+            feedback["score"] = round(feedback["confidence"] + feedback["clarity"] + feedback["fluency"], 1)
+            feedback["max_score"] = 80
+            if deliv is not None:
+                feedback["delivery"] = deliv
+                feedback["score"] = round(feedback["score"] + deliv, 1)
+                feedback["max_score"] = 100
+            feedback["words"] = f.word_count
+            feedback["fillers"] = len(f.fillers)
+            results.append(feedback)
+        return results
+
+    def stats(self):
+        info = self._correct_word.cache_info()
+        with self._lock:
+            return {
+                'scored': self.scored,
+                'correction_cache_hits': info.hits,
+                'correction_cache_misses': info.misses,
+                'cached_corrections': info.currsize
+            }
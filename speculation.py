@@ -0,0 +1,76 @@
+"""
+Speculative preparation of the interviewer's next turn
+While the candidate is still answering, partial transcripts are used to draft
+the interviewer's reply on a background executor and to synthesize its audio,
+so the reply can be spoken as soon as the candidate stops talking instead of
+only then being generated. Only partials that cover the whole answer so far
+are used: all of a streaming backend's (Vosk), and a windowed backend's
+until the answer outgrows its window. They come from the transcription
+service's partial source, so drafting also works when Google produces the
+final text.
+"""
+
+import threading
+
+
+class SpeculativeReply:
+    """
+    Drafts a reply to one answer from its partial transcripts.
+    A new draft is started whenever the partial text has grown by min_new_words
+    and no draft is in flight. When the answer is final, the newest draft is used
+    if its partial covered at least `coverage` of the final words; otherwise the
+    reply is composed from the final answer.
+    """
+
+    def __init__(self, executor, compose, prefetch=None, min_new_words=4, coverage=0.6):
+        self.executor = executor
+        self.compose = compose  # compose(answer_text) -> reply text
+        self.prefetch = prefetch  # prefetch([reply]) - synthesize the reply's audio ahead of time
+        self.min_new_words = min_new_words
+        self.coverage = coverage
+        self._lock = threading.Lock()
+        self._inflight = None
+        self._drafted_words = 0
+        self._draft = None  # (word count of the partial it was made from, reply)
+        self.drafts = 0
+
+    def update(self, partial_text):
+        """Offer the latest partial transcript. Never blocks"""
+        words = len(partial_text.split())
+        with self._lock:
+            if words < self._drafted_words + self.min_new_words:
+                return
+            if self._inflight is not None and not self._inflight.done():
+                return
+            self._drafted_words = words
+            self._inflight = self.executor.submit(self._make_draft, partial_text, words)
+
+    def _make_draft(self, partial_text, words):
+        reply = self.compose(partial_text)
+        with self._lock:
+            if self._draft is None or words >= self._draft[0]:
+                self._draft = (words, reply)
+            self.drafts += 1
+        if self.prefetch is not None:
+            self.prefetch([reply])
+        return reply
+
+    def reply(self, answer, wait=0.3):
+        """
+        Reply to the final answer. Waits up to `wait` seconds for a draft that is
+        still being made. Returns (reply, speculated) where speculated tells if a draft was used.
+        """
+        with self._lock:
+            inflight = self._inflight
+        if inflight is not None:
+            try:
+                inflight.result(timeout=wait)
+            except Exception:
+                pass  # Still running or failed - fall back below
+
+        needed = len(answer.split()) * self.coverage
+        with self._lock:
+            draft = self._draft
+        if draft is not None and draft[0] >= needed:
+            return draft[1], True
+        return self.compose(answer), False
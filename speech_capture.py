@@ -0,0 +1,310 @@
+"""
+Continuous microphone capture with voice-activity segmentation
+A capture thread reads the microphone without pausing, writes the samples into
+a ring buffer and runs a lightweight energy / zero-crossing voice-activity
+detector over them. Each complete utterance is put on a queue as AudioData, so
+recognition and analysis of earlier speech never stop the capture. The same
+samples feed a ProsodyTracker, and each utterance carries its prosody summary
+as AudioData.prosody.
+"""
+
+import threading
+import time
+from contextlib import nullcontext
+from queue import Queue, Empty, Full
+
+import numpy as np
+
+from lazy_models import lazy_import
+from prosody import ProsodyTracker
+
+sr = lazy_import('speech_recognition')
+
+
+class AudioRingBuffer:
+    """Fixed-size ring of int16 samples addressed by absolute sample position"""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._samples = np.zeros(capacity, dtype=np.int16)
+        self.total_written = 0
+
+    def write(self, samples):
+        samples = samples[-self.capacity:]
+        start = self.total_written % self.capacity
+        first = min(len(samples), self.capacity - start)
+        self._samples[start:start + first] = samples[:first]
+        self._samples[:len(samples) - first] = samples[first:]
+        self.total_written += len(samples)
+
+    def read(self, start, end):
+        """Copy samples [start, end) in absolute positions. Positions older than capacity are lost"""
+        start = max(start, self.total_written - self.capacity, 0)
+        end = min(end, self.total_written)
+        if end <= start:
+            return np.zeros(0, dtype=np.int16)
+        idx = np.arange(start, end) % self.capacity
+        return self._samples[idx]
+
+
+class VoiceActivityDetector:
+    """Frame-level speech detector from RMS energy and zero-crossing rate with an adaptive noise floor"""
+
+    def __init__(self, calibration_frames=16, energy_ratio=3.0, min_energy=150.0, unvoiced_zcr=0.3):
+        self.calibration_frames = calibration_frames
+        self.energy_ratio = energy_ratio  # Speech must be this much louder than the noise floor
+        self.min_energy = min_energy
+        self.unvoiced_zcr = unvoiced_zcr  # Quieter frames count as speech if they are this "hissy" (s, f, sh)
+        self.noise_floor = None
+        self._calibration = []
+
+    def is_speech(self, frame):
+        samples = frame.astype(np.float32)
+        rms = float(np.sqrt(np.mean(samples * samples)))
+        zcr = float(np.count_nonzero(np.diff(np.signbit(samples)))) / max(len(samples) - 1, 1)
+
+        # Learn the ambient noise level from the first frames, like adjust_for_ambient_noise
+        if self.noise_floor is None:
+            self._calibration.append(rms)
+            if len(self._calibration) >= self.calibration_frames:
+                self.noise_floor = float(np.median(self._calibration))
+            return False
+
+        threshold = max(self.noise_floor * self.energy_ratio, self.min_energy)
+        speech = rms > threshold or (rms > threshold * 0.5 and zcr > self.unvoiced_zcr)
+        if not speech:
+            self.noise_floor = 0.95 * self.noise_floor + 0.05 * rms
+        return speech
+
+
+class SpeechSegmenter:
+    """Turns a stream of int16 samples into complete utterances using voice activity"""
+
+    def __init__(self, sample_rate, frame_ms=30, start_ms=90, hangover_ms=600, preroll_ms=300,
+                 min_speech_ms=250, max_utterance_s=15.0, buffer_s=None, vad=None):
+        self.sample_rate = sample_rate
+        self.frame_size = int(sample_rate * frame_ms / 1000)
+        self.start_frames = max(1, start_ms // frame_ms)
+        self.hangover_frames = max(1, hangover_ms // frame_ms)
+        self.preroll = int(sample_rate * preroll_ms / 1000)
+        self.min_speech = int(sample_rate * min_speech_ms / 1000)
+        self.max_utterance = int(sample_rate * max_utterance_s)
+        self.vad = vad or VoiceActivityDetector()
+        self.buffer = AudioRingBuffer(int(sample_rate * (buffer_s or max(30.0, max_utterance_s + 5))))
+        self._pending = np.zeros(0, dtype=np.int16)
+        self._speech_run = 0
+        self._silence_run = 0
+        self._start = None  # Absolute sample where the current utterance began
+        self._last_speech = 0
+
+    @property
+    def in_speech(self):
+        return self._start is not None
+
+    def feed(self, samples):
+        """Add samples and return a list of completed utterances (int16 arrays)"""
+        self.buffer.write(samples)
+        data = np.concatenate([self._pending, samples]) if len(self._pending) else samples
+        position = self.buffer.total_written - len(data)
+        utterances = []
+
+        n_frames = len(data) // self.frame_size
+        for i in range(n_frames):
+            frame = data[i * self.frame_size:(i + 1) * self.frame_size]
+            frame_end = position + (i + 1) * self.frame_size
+            if self.vad.is_speech(frame):
+                self._speech_run += 1
+                self._silence_run = 0
+                self._last_speech = frame_end
+                if self._start is None and self._speech_run >= self.start_frames:
+                    self._start = frame_end - self._speech_run * self.frame_size
+            else:
+                self._speech_run = 0
+                self._silence_run += 1
+
+            if self._start is not None:
+                if self._silence_run >= self.hangover_frames:
+                    utterances.extend(self._emit(self._last_speech))
+                elif frame_end - self._start >= self.max_utterance:
+                    # Very long answer - hand over what we have and keep going
+                    utterances.extend(self._emit(frame_end))
+                    self._start = frame_end
+
+        self._pending = data[n_frames * self.frame_size:].copy()
+        return utterances
+
+    @property
+    def utterance_start(self):
+        """Absolute sample position where the utterance in progress begins (with preroll), or None"""
+        return None if self._start is None else max(self._start - self.preroll, 0)
+
+    def current_span(self, max_seconds=None):
+        """(start, end) absolute positions of the utterance in progress (optionally only its latest max_seconds)"""
+        if self._start is None:
+            return None
+        start = max(self.utterance_start, self.buffer.total_written - self.buffer.capacity)
+        if max_seconds:
+            start = max(start, self.buffer.total_written - int(self.sample_rate * max_seconds))
+        return start, self.buffer.total_written
+
+    def current_audio(self, max_seconds=None):
+        """Samples of the utterance in progress (optionally only the latest max_seconds), or None"""
+        span = self.current_span(max_seconds)
+        return None if span is None else self.buffer.read(*span)
+
+    def flush(self):
+        """End the current utterance, if any, and return it"""
+        if self._start is None:
+            return []
+        return self._emit(self._last_speech)
+
+    def _emit(self, end):
+        start, self._start = self._start, None
+        if end - start < self.min_speech:
+            return []
+        return [self.buffer.read(start - self.preroll, end + self.preroll // 2)]
+
+
+class StreamingSpeechCapture:
+    """
+    Microphone capture thread that queues complete utterances as sr.AudioData.
+    If on_partial is given, it is called every partial_interval seconds with the
+    utterance in progress (its latest partial_window_s seconds, or all of it if
+    partial_window_s is None) while someone is speaking. That audio has .start and
+    .utterance_start (absolute sample positions), so a streaming recognizer can
+    take only the samples it has not seen yet.
+    If device (an AudioDeviceArbiter) is given, the microphone is only opened while holding it.
+    With track_prosody, every utterance gets a .prosody summary (pitch, energy, pace, pauses).
+    """
+
+    def __init__(self, max_queued=20, on_partial=None, partial_interval=0.4, partial_window_s=10.0,
+                 device=None, track_prosody=True, **segmenter_options):
+        self.segmenter_options = segmenter_options
+        self.utterances = Queue(maxsize=max_queued)
+        self.segmenter = None
+        self.on_partial = on_partial
+        self.partial_interval = partial_interval
+        self.partial_window_s = partial_window_s
+        self.device = device
+        self.track_prosody = track_prosody
+        self.prosody = None
+        self.ready = threading.Event()  # Microphone is open and listening
+        self.ready_at = None  # When the microphone opened
+        self.speech_started = threading.Event()
+        self.error = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._sample_rate = None
+        self._sample_width = None
+        self._last_partial = 0.0
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._capture_loop, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+
+    def _audio(self, samples):
+        return sr.AudioData(samples.tobytes(), self._sample_rate, self._sample_width)
+
+    def _report_partial(self):
+        now = time.time()
+        if now - self._last_partial < self.partial_interval:
+            return
+        span = self.segmenter.current_span(self.partial_window_s)
+        if span is not None and span[1] > span[0]:
+            self._last_partial = now
+            audio = self._audio(self.segmenter.buffer.read(*span))
+            audio.start = span[0]
+            audio.utterance_start = self.segmenter.utterance_start
+            self.on_partial(audio)
+
+    def _put(self, samples):
+        audio = self._audio(samples)
+        audio.prosody = self.prosody.take() if self.prosody is not None else None
+        self.speech_started.set()
+        try:
+            self.utterances.put_nowait(audio)
+        except Full:
+            print("⚠️ Recognition is falling behind - dropping an utterance")
+
+    def _capture_loop(self):
+        try:
+            with self.device.listening() if self.device else nullcontext(), sr.Microphone() as source:
+                self._sample_rate = source.SAMPLE_RATE
+                self._sample_width = source.SAMPLE_WIDTH
+                self.segmenter = SpeechSegmenter(source.SAMPLE_RATE, **self.segmenter_options)
+                if self.track_prosody:
+                    self.prosody = ProsodyTracker(source.SAMPLE_RATE)
+                self.ready_at = time.time()
+                self.ready.set()
+                print("🎤 Continuous speech capture started")
+                while not self._stop.is_set():
+                    samples = np.frombuffer(source.stream.read(source.CHUNK), dtype=np.int16)
+                    if self.prosody is not None:
+                        self.prosody.feed(samples)
+                    for utterance in self.segmenter.feed(samples):
+                        self._put(utterance)
+                    if self.segmenter.in_speech:
+                        self.speech_started.set()
+                        if self.on_partial is not None:
+                            self._report_partial()
+                for utterance in self.segmenter.flush():
+                    self._put(utterance)
+        except Exception as e:
+            print(f"⚠️ Speech capture error: {e}")
+            self.error = e
+        finally:
+            self.ready.set()
+            self.speech_started.set()  # Wake anyone waiting so they can see the error or stop
+            print("🔇 Continuous speech capture stopped")
+
+    def wait_for_speech(self, timeout, should_stop=None):
+        """
+        Wait until speech starts. Returns False on timeout or if should_stop() becomes true.
+        Raises the capture error if the microphone failed.
+        """
+        deadline = time.time() + timeout
+        while not self.speech_started.wait(0.2):
+            if time.time() >= deadline or (should_stop is not None and should_stop()):
+                return False
+        if self.error is not None:
+            raise self.error
+        return self.segmenter is not None and not self._stop.is_set()
+
+    def listen(self, timeout, should_stop=None):
+        """
+        Like Recognizer.listen(): wait up to timeout seconds for speech to start and
+        return the first complete utterance as sr.AudioData. Raises sr.WaitTimeoutError
+        if nobody speaks. Returns None if should_stop() becomes true first.
+        """
+        if not self.wait_for_speech(timeout, should_stop):
+            if should_stop is not None and should_stop():
+                return None
+            raise sr.WaitTimeoutError("listening timed out while waiting for phrase to start")
+        while True:
+            audio = self.get_utterance(timeout=0.2)
+            if audio is not None:
+                return audio
+            if self.error is not None:
+                raise self.error
+            if (should_stop is not None and should_stop()) or not self._thread.is_alive():
+                return None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def get_utterance(self, timeout=0.5):
+        """Next complete utterance as sr.AudioData, or None if none arrived within timeout"""
+        try:
+            return self.utterances.get(timeout=timeout)
+        except Empty:
+            return None
@@ -1,14 +1,21 @@
 import cv2
 import numpy as np
 import speech_recognition as sr
-from textblob import TextBlob
-from transformers import pipeline
-import threading, time, json, librosa
+import threading, time, json
 import random
+from overlays import compositor
+from soft_skills import FillerLexicon, TextFeatures
+from prosody import ProsodyTracker, delivery_score
+from lazy_models import models, lazy, lazy_import
+from sentiment_service import SentimentService, create_sentiment_backend
 
-# Initialize models
-sentiment_model = pipeline("sentiment-analysis")
+textblob = lazy_import('textblob')
+
+# Models load on first use; warm-up starts loading them while the window opens.
+# PyTorch, like the original pipeline("sentiment-analysis") - the ONNX runtime is not a requirement
+sentiment_service = SentimentService(lazy('sentiment model', lambda: create_sentiment_backend('transformer-torch')))
 recognizer = sr.Recognizer()
+filler_lexicon = FillerLexicon()
 
 speech_text = ""
 analysis_result = {}
@@ -34,12 +41,11 @@ SAMPLE_TEXTS = [
 
 # --- Audio analysis ---
 def analyze_audio_tone(audio_data, sample_rate=16000):
-    y = np.frombuffer(audio_data, dtype=np.int16).astype(np.float32)
-    if np.max(np.abs(y)) > 0:
-        y /= np.max(np.abs(y))
-    pitch = librosa.yin(y, fmin=50, fmax=300, sr=sample_rate)
-    avg_pitch = np.nanmean(pitch)
-    energy_score = min(max((avg_pitch - 100) / 100 * 20, 0), 20)  # 0-20 points
+    tracker = ProsodyTracker(sample_rate)
+    tracker.feed(np.frombuffer(audio_data, dtype=np.int16))
+    prosody = tracker.summary()
+    energy_score = delivery_score(prosody) or 0  # 0-20 points
+    avg_pitch = prosody['pitch_hz'] or 0
     return energy_score, "Energetic" if avg_pitch > 150 else "Calm"
 
 # --- Text-based soft skill analysis ---
@@ -47,20 +53,19 @@ def analyze_text_softskills(text):
     feedback = {}
 
     # Sentiment as confidence (0-30 points)
-    sentiment = sentiment_model(text)[0]
+    sentiment = sentiment_service.predict([text])[0]
     confidence_score = sentiment["score"] * 30 if sentiment["label"] == "POSITIVE" else sentiment["score"] * 15
     feedback["confidence"] = round(confidence_score, 1)
 
     # Clarity (grammar)
-    blob = TextBlob(text)
+    blob = textblob.TextBlob(text)
     errors = len(blob.correct().words) - len(blob.words)
     clarity_score = max(0, 30 - errors * 5)  # 0-30 points
     feedback["clarity"] = round(clarity_score, 1)
 
     # Fluency
-    avg_sentence_length = sum(len(s.split()) for s in text.split(".")) / max(1, len(text.split(".")))
-    filler_words = sum(text.lower().count(w) for w in ["um", "uh", "like", "you know"])
-    fluency_score = min(max(avg_sentence_length * 3 - filler_words * 5, 0), 20)  # 0-20 points
+    features = TextFeatures(text, filler_lexicon)
+    fluency_score = min(max(features.avg_sentence_length * 3 - len(features.fillers) * 5, 0), 20)  # 0-20 points
     feedback["fluency"] = round(fluency_score, 1)
 
     # Overall score out of 100
@@ -160,11 +165,8 @@ def start_video_display():
 
         # Draw scrolling text if running
         if is_running and scroll_text:
-            # Create semi-transparent overlay for text background
-            overlay = extended_frame.copy()
-            cv2.rectangle(overlay, (0, frame_height - 100), (frame_width, frame_height - 20), 
-                         (0, 0, 0), -1)
-            cv2.addWeighted(overlay, 0.7, extended_frame, 0.3, 0, extended_frame)
+            # Semi-transparent background for the text
+            compositor.banner(extended_frame, frame_height - 100, frame_height - 20, 0.7)
             
             # Draw scrolling text
             font_scale = 1.2
@@ -179,19 +181,19 @@ def start_video_display():
                 scroll_x = frame_width
             
             text_y = frame_height - 50
-            cv2.putText(extended_frame, scroll_text, (int(scroll_x), text_y),
-                       cv2.FONT_HERSHEY_SIMPLEX, font_scale, (0, 255, 255), thickness)
+            compositor.text(extended_frame, [(scroll_text, (0, 255, 255))], (int(scroll_x), text_y),
+                            font_scale, thickness)
 
         # Display analysis results on video
-        y = 40
+        result_lines = []
         for key, val in analysis_result.items():
-            text = f"{key.capitalize()}: {val}"
             color = (0, 255, 0) if val > 15 else (0, 255, 255) if val > 10 else (0, 0, 255)
-            cv2.putText(extended_frame, text, (20, y), cv2.FONT_HERSHEY_SIMPLEX, 0.7, color, 2)
-            y += 30
+            result_lines.append((f"{key.capitalize()}: {val}", color))
+        compositor.text(extended_frame, result_lines, (20, 40), 0.7, 2, line_height=30)
+        y = 40 + 30 * len(result_lines)
 
         elapsed = int(time.time() - start_time)
-        cv2.putText(extended_frame, f"⏱ Time: {elapsed}s", (20, y + 10), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (200, 200, 200), 2)
+        compositor.text(extended_frame, [(f"⏱ Time: {elapsed}s", (200, 200, 200))], (20, y + 10), 0.7, 2)
 
         # Draw Speed Input Field (above buttons)
         speed_label_x = 20
@@ -320,5 +322,6 @@ def start_video_display():
     print("👋 Program terminated")
 
 # --- Run threads ---
+models.warm_up(['sentiment model', 'textblob'])
 threading.Thread(target=listen_speech, daemon=True).start()
 start_video_display()
\ No newline at end of file
@@ -0,0 +1,70 @@
+"""Handing the audio device between prompt playback and the microphone"""
+
+import threading
+import time
+
+import pytest
+
+from audio_device import CAPTURE, PLAYBACK, AudioDeviceArbiter, HandoffStats
+from sessions import SessionRegistry
+
+
+def test_microphone_waits_for_the_prompt_to_finish():
+    arbiter = AudioDeviceArbiter(settle=0.05)
+    events = []
+
+    def listen():
+        with arbiter.listening(timeout=5):
+            events.append(('listening', time.time()))
+
+    with arbiter.speaking():
+        assert not arbiter.playback_done.is_set()
+        listener = threading.Thread(target=listen)
+        listener.start()
+        time.sleep(0.1)
+        assert events == []
+        released = time.time()
+    listener.join(5)
+    (what, opened), = events
+    assert what == 'listening'
+    # Opened once the device has settled, not after a fixed sleep
+    assert 0.04 <= opened - released < 1.0
+    assert arbiter.playback_done.is_set() and arbiter.capture_done.is_set()
+
+
+def test_busy_device_times_out():
+    arbiter = AudioDeviceArbiter(settle=0)
+    assert arbiter.acquire(CAPTURE)
+    assert not arbiter.acquire(PLAYBACK, timeout=0.05)
+    with pytest.raises(TimeoutError):
+        with arbiter.speaking(timeout=0.05):
+            pass
+    assert arbiter.owner == CAPTURE
+
+
+def test_release_by_another_owner_is_ignored():
+    arbiter = AudioDeviceArbiter(settle=0)
+    assert arbiter.acquire(PLAYBACK)
+    arbiter.release(CAPTURE)
+    assert arbiter.owner == PLAYBACK
+    arbiter.release(PLAYBACK)
+    assert arbiter.owner is None and arbiter.acquire(CAPTURE, timeout=0)
+
+
+def test_each_interview_has_its_own_device():
+    registry = SessionRegistry()
+    first, second = registry.interview('a'), registry.interview('b')
+    assert first.audio_device is not second.audio_device
+    # One candidate's open microphone does not hold up another's prompt
+    with first.audio_device.listening():
+        with second.audio_device.speaking(timeout=0.5):
+            pass
+
+
+def test_handoff_stats():
+    stats = HandoffStats()
+    assert stats.stats() == {'handoffs': 0}
+    for seconds in (0.3, 0.1, 0.2):
+        stats.record(seconds)
+    assert stats.stats() == {'handoffs': 3, 'handoff_avg_ms': 200.0, 'handoff_p50_ms': 200.0,
+                             'handoff_max_ms': 300.0}
@@ -0,0 +1,187 @@
+"""One camera capture shared by every video feed client"""
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+import camera_stream
+from camera_stream import ADAPTIVE_LEVELS, CameraStream, EncodedFrameCache, StreamClient, StreamRegistry
+
+
+class FakeCamera:
+    """cv2.VideoCapture stand-in producing numbered frames, after an optional start-up delay"""
+
+    opened = []
+
+    def __init__(self, device, interval=0.005, startup=0.0):
+        self.interval = interval
+        self.startup = startup
+        self.reads = 0
+        self.released = False
+        FakeCamera.opened.append(self)
+
+    def read(self):
+        time.sleep(self.startup if self.reads == 0 else self.interval)
+        self.reads += 1
+        return True, np.full((4, 4, 3), self.reads % 256, dtype=np.uint8)
+
+    def release(self):
+        self.released = True
+
+
+@pytest.fixture
+def camera(monkeypatch):
+    FakeCamera.opened = []
+    options = {}
+    fake_cv2 = SimpleNamespace(VideoCapture=lambda device: FakeCamera(device, **options), flip=lambda frame, code: frame)
+    monkeypatch.setattr(camera_stream, 'cv2', fake_cv2)
+    yield options
+    # Let idle capture threads stop while they still see the fake camera
+    deadline = time.time() + 5
+    while not all(camera.released for camera in FakeCamera.opened) and time.time() < deadline:
+        time.sleep(0.01)
+
+
+def read_versions(stream, count, versions):
+    for version, _ in stream.frames():
+        versions.append(version)
+        if len(versions) == count:
+            break
+
+
+def test_readers_share_one_capture(camera):
+    stream = CameraStream(idle_timeout=0.05)
+    seen = [[] for _ in range(4)]
+    threads = [threading.Thread(target=read_versions, args=(stream, 10, versions)) for versions in seen]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(5)
+    assert len(FakeCamera.opened) == 1  # One camera for every reader
+    for versions in seen:
+        assert len(versions) == 10 and versions == sorted(set(versions))
+    # Readers skip to the newest frame instead of splitting the frames between them
+    assert stream.frames_captured >= max(versions[-1] for versions in seen)
+
+
+def test_camera_is_released_when_idle(camera):
+    stream = CameraStream(idle_timeout=0.05)
+    read_versions(stream, 3, [])
+    assert stream.client_count == 0
+    deadline = time.time() + 5
+    while stream.running and time.time() < deadline:
+        time.sleep(0.01)
+    assert not stream.running and FakeCamera.opened[0].released
+
+
+def test_slow_camera_is_waited_for(camera):
+    camera['startup'] = 2.5  # Longer than one wait_for_frame() timeout
+    stream = CameraStream(idle_timeout=0.05)
+    versions = []
+    read_versions(stream, 2, versions)
+    assert len(versions) == 2  # The feed did not end while the camera was opening
+
+
+@pytest.fixture
+def encoder(monkeypatch):
+    """cv2.imencode stand-in that counts encodes and is slow enough for clients to overlap"""
+    calls = []
+
+    def imencode(ext, image, params):
+        calls.append(params[1])
+        time.sleep(0.05)
+        return True, np.frombuffer(image.tobytes(), dtype=np.uint8)
+
+    monkeypatch.setattr(camera_stream, 'cv2', SimpleNamespace(imencode=imencode, IMWRITE_JPEG_QUALITY=1))
+    return calls
+
+
+def test_frame_is_encoded_once_for_many_clients(encoder):
+    cache = EncodedFrameCache()
+    frame = np.full((4, 4, 3), 7, dtype=np.uint8)
+    renders, results = [], []
+    barrier = threading.Barrier(8)
+
+    def client():
+        barrier.wait()
+        results.append(cache.get(1, 'overlay', 80, None, lambda: renders.append(1) or frame))
+
+    threads = [threading.Thread(target=client) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(5)
+    assert len(renders) == 1 and cache.encodes == 1 and cache.hits == 7
+    assert len(results) == 8 and all(data == frame.tobytes() for data in results)
+
+
+def test_different_pictures_are_encoded_separately(encoder):
+    cache = EncodedFrameCache(keep_versions=2)
+    frame = np.zeros((4, 4, 3), dtype=np.uint8)
+    cache.get(1, 'a', 80, None, lambda: frame)
+    cache.get(1, 'b', 80, None, lambda: frame)  # Another session's overlay
+    cache.get(1, 'a', 50, None, lambda: frame)  # A lower quality level
+    assert cache.encodes == 3 and encoder == [80, 80, 50]
+    cache.get(4, 'a', 80, None, lambda: frame)
+    cache.get(1, 'a', 80, None, lambda: frame)  # Evicted by newer versions, so encoded again
+    assert cache.encodes == 5 and cache.hits == 0
+
+
+def test_slow_client_steps_down_and_recovers():
+    client = StreamClient('a', quality=80, adaptive=True, target_latency=0.1, adapt_interval=0)
+    client.send_time_avg = 0.5
+    client._adapt()
+    client._adapt()
+    assert client.level == 2
+    client.send_time_avg = 0.01
+    client._adapt()
+    assert client.level == 1
+    # Never past the last level, never below full quality
+    client.level, client.send_time_avg = len(ADAPTIVE_LEVELS) - 1, 0.5
+    client._adapt()
+    assert client.level == len(ADAPTIVE_LEVELS) - 1
+    client.level, client.send_time_avg = 0, 0.01
+    client._adapt()
+    assert client.level == 0
+
+
+def test_encode_settings_follow_the_level():
+    client = StreamClient('a', quality=65)
+    assert client.encode_settings(640) == (65, None)
+    client.level = 1
+    assert client.encode_settings(640) == (65, None)  # The client's own quality is lower
+    client.level = 3
+    assert client.encode_settings(640) == (50, 320)
+    client.level = 2
+    assert client.encode_settings(100) == (60, 64)  # Rounded down to a multiple of 16
+    # A requested width at or above the frame's means no resize
+    assert StreamClient('a', quality=80, width=1280).encode_settings(640) == (80, None)
+    assert StreamClient('a', quality=80, width=320).encode_settings(640) == (80, 320)
+
+
+def test_skipped_and_paced_frames_are_dropped():
+    client = StreamClient('a', quality=80)
+    assert client.should_send(1)
+    client.before_yield(100)
+    assert client.should_send(4)  # Versions 2 and 3 never reached this client
+    assert client.frames_dropped == 2
+    client.level = len(ADAPTIVE_LEVELS) - 1  # 5 fps
+    client.before_yield(100)
+    assert not client.should_send(5)
+    assert client.frames_dropped == 3
+    client._last_sent -= 1.0
+    assert client.should_send(6)
+
+
+def test_registry_stats_by_session():
+    registry = StreamRegistry()
+    first = registry.add(StreamClient('a', quality=80))
+    registry.add(StreamClient('b', quality=80))
+    assert len(registry.stats()) == 2
+    assert [stats['id'] for stats in registry.stats('a')] == [first.id]
+    registry.remove(first)
+    assert registry.stats('a') == []
@@ -0,0 +1,45 @@
+"""Heavy libraries and models loaded on first use"""
+
+import threading
+
+from lazy_models import ModelRegistry, LazyProxy, is_loaded
+
+
+def test_resource_is_built_once_for_concurrent_callers():
+    registry = ModelRegistry()
+    builds = []
+    resource = registry.register('counter', lambda: builds.append(1) or len(builds))
+    threads = [threading.Thread(target=resource.get) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert builds == [1] and resource.get() == 1
+    assert registry.stats()['counter']['loaded']
+
+
+def test_proxy_loads_on_first_use_only():
+    registry = ModelRegistry()
+    proxy = LazyProxy(registry.register('text', lambda: "hello"))
+    assert not is_loaded(proxy) and "not loaded" in repr(proxy)
+    assert registry.stats()['text'] == {'loaded': False, 'load_seconds': None}
+    assert proxy.upper() == "HELLO"
+    assert is_loaded(proxy) and is_loaded("plain value")
+
+
+def test_failed_load_is_tried_again():
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise OSError("model missing")
+        return 42
+
+    resource = ModelRegistry().register('flaky', flaky)
+    try:
+        resource.get()
+    except OSError:
+        pass
+    assert not resource.loaded
+    assert resource.get() == 42 and len(attempts) == 2
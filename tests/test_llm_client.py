@@ -0,0 +1,59 @@
+"""LLMClient timeouts, in-flight sharing and caching with the offline FakeModel"""
+
+import threading
+import time
+
+import pytest
+
+from llm_client import FakeModel, LLMClient, LLMUnavailable
+
+
+def client(**model_options):
+    return LLMClient(FakeModel(**model_options), rate=100, burst=10)
+
+
+def test_responses_are_cached():
+    llm = client(responses=["hello"])
+    assert llm.generate("prompt") == "hello"
+    assert llm.generate("prompt") == "hello"
+    assert llm.model.calls == 1 and llm.stats()['cache_hits'] == 1
+
+
+def test_no_model_is_unavailable():
+    with pytest.raises(LLMUnavailable):
+        LLMClient(None).generate("prompt")
+
+
+def test_slow_call_times_out():
+    with pytest.raises(LLMUnavailable):
+        client(delay=1.0).generate("prompt", timeout=0.2)
+
+
+def test_identical_prompts_share_one_call():
+    llm = client(delay=0.3)
+    results = []
+    first = threading.Thread(target=lambda: results.append(llm.generate("prompt", timeout=2.0)))
+    first.start()
+    time.sleep(0.05)
+    results.append(llm.generate("prompt", timeout=1.0))
+    first.join()
+    assert results[0] == results[1] and llm.model.calls == 1
+
+
+def test_longer_caller_outlives_a_shorter_call_in_flight():
+    llm = client(delay=0.6)
+    outcome = []
+
+    def short():
+        try:
+            llm.generate("prompt", timeout=0.2)
+            outcome.append("answered")
+        except LLMUnavailable:
+            outcome.append("unavailable")
+
+    first = threading.Thread(target=short)
+    first.start()
+    time.sleep(0.05)
+    assert llm.generate("prompt", timeout=3.0)
+    first.join()
+    assert outcome == ["unavailable"]
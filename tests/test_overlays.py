@@ -0,0 +1,59 @@
+"""Overlays drawn on the practice video"""
+
+import pytest
+
+np = pytest.importorskip('numpy')
+cv2 = pytest.importorskip('cv2')
+
+from overlays import OverlayCompositor
+from sessions import PracticeSession
+
+TEXT = "Effective communication is the cornerstone of professional success"
+
+
+def practice_overlay(analysis):
+    practice = PracticeSession()
+    practice.start("scroll text")
+    practice.add_result("some answer", analysis)
+    return practice.overlay_state(1, 640)
+
+
+def overlay_lines(monkeypatch, overlay):
+    """Text lines render_frame draws for an overlay state"""
+    import web_app
+    drawn = []
+    monkeypatch.setattr(web_app.compositor, 'text',
+                        lambda frame, lines, *args, **kwargs: drawn.extend(text for text, _ in lines))
+    web_app.render_frame(np.zeros((480, 640, 3), dtype=np.uint8), overlay)
+    return drawn
+
+
+def test_overlay_shows_delivery_and_max_score(monkeypatch):
+    overlay = practice_overlay({'confidence': 25.0, 'clarity': 30.0, 'fluency': 19.0,
+                                'delivery': 18.0, 'score': 92.0, 'max_score': 100})
+    lines = overlay_lines(monkeypatch, overlay)
+    assert "Delivery: 18.0/20" in lines
+    assert "Total: 92.0/100" in lines
+
+
+def test_overlay_without_delivery_is_out_of_80(monkeypatch):
+    overlay = practice_overlay({'confidence': 25.0, 'clarity': 30.0, 'fluency': 19.0,
+                                'score': 74.0, 'max_score': 80})
+    lines = overlay_lines(monkeypatch, overlay)
+    assert not any(line.startswith("Delivery") for line in lines)
+    assert "Total: 74.0/80" in lines
+
+
+@pytest.mark.parametrize('font_scale, thickness', [(0.6, 1), (0.8, 2), (1.5, 3)])
+def test_cached_text_is_identical_to_put_text(font_scale, thickness):
+    base = np.random.default_rng(0).integers(0, 255, (120, 640, 3), dtype=np.uint8)
+    compositor = OverlayCompositor()
+    lines = [(TEXT, (0, 255, 255)), ("Total: 60.6/80", (0, 255, 0))]
+    # Inside the frame, and cut by the left, right, top and bottom edges
+    for x, y in [(10, 40), (-700, 40), (-95, 40), (300, 40), (10, 5), (10, 110), (-300, -10)]:
+        expected, frame = base.copy(), base.copy()
+        for i, (text, color) in enumerate(lines):
+            cv2.putText(expected, text, (x, y + 30 * i), cv2.FONT_HERSHEY_SIMPLEX, font_scale, color, thickness)
+        compositor.text(frame, lines, (x, y), font_scale, thickness)
+        assert np.array_equal(frame, expected), (x, y)
+    assert compositor.layers_built == 1
@@ -0,0 +1,37 @@
+"""Resume PDF extraction with character and page caps"""
+
+import pytest
+
+import pdf_extract
+from pdf_extract import _TextCollector
+
+
+def test_collector_stops_at_the_character_cap():
+    collected = _TextCollector(max_chars=10)
+    assert not collected.add(["abcd"])
+    assert collected.add(["efghij", "never added"])
+    assert collected.pages == 2  # Each page counts its newline
+    assert collected.text() == "abcd\nefghi"
+
+
+def test_collector_without_a_cap_keeps_everything():
+    collected = _TextCollector(max_chars=None)
+    assert not collected.add(["  first", "second  "])
+    assert collected.text() == "first\nsecond"
+
+
+def test_pool_workers_are_spawned_not_forked():
+    pool = pdf_extract._process_pool(2)
+    assert pdf_extract._process_pool(4) is pool
+    assert pool._mp_context.get_start_method() == 'spawn'
+
+
+def test_extraction_stops_at_the_caps(tmp_path):
+    pytest.importorskip('PyPDF2')
+    from benchmarks import write_synthetic_pdf
+    path = str(tmp_path / 'resume.pdf')
+    write_synthetic_pdf(path, 30)
+    text = pdf_extract.extract_pdf_text(path, max_chars=2000)
+    assert len(text) == 2000 and text.startswith("Page 1 line 0")
+    pages = pdf_extract.extract_pdf_text(path, max_chars=None, max_pages=3, workers=1)
+    assert "Page 3 line" in pages and "Page 4 line" not in pages
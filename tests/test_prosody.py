@@ -0,0 +1,55 @@
+"""Incremental pitch, energy and pace analysis, and the delivery score"""
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from prosody import ProsodyTracker, delivery_score
+
+SAMPLE_RATE = 16000
+
+
+def voiced(seconds=3.0, pitch=140.0, swing=30.0):
+    """A pitched tone with syllable-like loudness changes and short pauses"""
+    t = np.arange(int(SAMPLE_RATE * seconds)) / SAMPLE_RATE
+    frequency = pitch + swing * np.sin(2 * np.pi * 0.5 * t)
+    envelope = np.clip(np.sin(2 * np.pi * 2.0 * t), 0, None)
+    return (8000 * envelope * np.sin(2 * np.pi * np.cumsum(frequency) / SAMPLE_RATE)).astype(np.int16)
+
+
+def summary(samples, chunk=None):
+    tracker = ProsodyTracker(SAMPLE_RATE)
+    for start in range(0, len(samples), chunk or len(samples)):
+        tracker.feed(samples[start:start + (chunk or len(samples))])
+    return tracker.take()
+
+
+def test_pitch_is_estimated():
+    result = summary(voiced(pitch=150.0, swing=0.0))
+    assert result['pitch_hz'] == pytest.approx(150.0, rel=0.05)
+    assert result['pitch_variation_st'] < 0.5
+
+
+def test_chunked_feeding_matches_one_pass():
+    samples = voiced()
+    whole = summary(samples)
+    # Pauses that start in one chunk and end in the next are counted in full
+    for chunk in (256, 1024, 4096):
+        assert summary(samples, chunk) == whole
+
+
+def test_silence_has_no_delivery_score():
+    assert delivery_score(summary(np.zeros(SAMPLE_RATE * 2, dtype=np.int16))) is None
+
+
+def test_delivery_is_added_out_of_100():
+    pytest.importorskip('textblob')
+    from soft_skills import SoftSkillScorer
+    prosody = summary(voiced())
+    delivery = delivery_score(prosody)
+    assert delivery is not None and 0 <= delivery <= 20
+    text = "I led a small team that rebuilt our billing service in Python. We cut costs by a third."
+    plain, scored = SoftSkillScorer().score_batch([text, text], [None, prosody])
+    assert 'delivery' not in plain and plain['max_score'] == 80
+    assert scored['delivery'] == delivery and scored['max_score'] == 100
+    assert scored['score'] == round(plain['score'] + delivery, 1)
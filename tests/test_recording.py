@@ -0,0 +1,69 @@
+"""Practice videos streamed to disk on a writer thread"""
+
+import os
+
+import pytest
+
+np = pytest.importorskip('numpy')
+cv2 = pytest.importorskip('cv2')
+
+from recording import RECORDINGS_FOLDER, VideoRecorder
+
+
+def frames(count):
+    for i in range(count):
+        frame = np.zeros((120, 160, 3), dtype=np.uint8)
+        frame[:, :, 1] = i * 5 % 256
+        yield frame
+
+
+def test_join_returns_once_the_file_is_complete(tmp_path):
+    path = str(tmp_path / 'recording.mp4')
+    recorder = VideoRecorder(path, probe_frames=5)
+    for frame in frames(40):
+        assert recorder.write(frame)
+    assert recorder.join(timeout=10)
+    assert recorder.saved and recorder.frames_written == 40
+    video = cv2.VideoCapture(path)
+    try:
+        assert int(video.get(cv2.CAP_PROP_FRAME_COUNT)) == 40
+    finally:
+        video.release()
+    assert not recorder.write(next(frames(1)))  # Closed
+
+
+def test_join_without_frames_saves_nothing(tmp_path):
+    recorder = VideoRecorder(str(tmp_path / 'empty.mp4'))
+    assert recorder.join(timeout=5)
+    assert not recorder.saved and not (tmp_path / 'empty.mp4').exists()
+
+
+def test_full_queue_drops_frames_instead_of_blocking(tmp_path):
+    recorder = VideoRecorder(str(tmp_path / 'slow.mp4'), max_queue=2, probe_frames=1000)
+    results = [recorder.write(frame) for frame in frames(200)]
+    assert recorder.frames_received == 200
+    assert recorder.frames_dropped == results.count(False)
+    assert recorder.join(timeout=10)
+
+
+def test_stop_recording_names_the_video_once_it_is_complete(monkeypatch):
+    import benchmarks
+    import web_app
+    monkeypatch.setattr(web_app, 'listen_speech', benchmarks.simulated_listen_speech)
+    client = web_app.app.test_client()
+    assert client.post('/start_recording').get_json()['status'] == "started"
+    with client.session_transaction() as session:
+        practice = web_app.sessions.practice(session['sid'])
+    for version, frame in enumerate(frames(40), 1):
+        practice.record_frame(version, frame)
+
+    stopped = client.post('/stop_recording').get_json()
+    assert stopped['status'] == "stopped" and stopped['video_filename']
+    video = cv2.VideoCapture(os.path.join(RECORDINGS_FOLDER, stopped['video_filename']))
+    try:
+        assert int(video.get(cv2.CAP_PROP_FRAME_COUNT)) == 40  # Every frame is in the file already
+    finally:
+        video.release()
+    download = client.get(f"/download_recording/{stopped['video_filename']}")
+    assert download.status_code == 200 and len(download.data) > 0
+    download.close()
@@ -0,0 +1,135 @@
+"""Report files, their SQLite index and per-session score history"""
+
+import json
+import os
+import threading
+
+import pytest
+
+import report_store
+from report_store import INTERVIEW, PRACTICE, ReportStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ReportStore(str(tmp_path / 'reports'))
+
+
+def practice_report(score, confidence=20.0, delivery=None):
+    metrics = {'confidence': confidence, 'clarity': 25.0, 'fluency': 15.0}
+    if delivery is not None:
+        metrics['delivery'] = delivery
+    return {'session_summary': {'overall_score': score, 'max_score': 100 if delivery is not None else 80},
+            'performance_metrics': metrics}
+
+
+def test_reports_saved_in_the_same_second_get_unique_ids(store):
+    ids = [store.save(PRACTICE, practice_report(40.0 + i)) for i in range(20)]
+    assert len(set(ids)) == 20 and all(i.startswith('report_') for i in ids)
+    assert store.flush(5)
+    files = os.listdir(store.folder)
+    assert sorted(f"{i}.json" for i in ids) == sorted(f for f in files if f.endswith('.json'))
+    assert [store.get(i)['session_summary']['overall_score'] for i in ids] == [40.0 + i for i in range(20)]
+
+
+def test_reports_are_written_atomically(store, monkeypatch):
+    replaced = []
+    real_replace = os.replace
+
+    def replace(source, destination):
+        replaced.append((source, os.path.exists(destination)))
+        real_replace(source, destination)
+
+    monkeypatch.setattr(report_store.os, 'replace', replace)
+    report_id = store.save(INTERVIEW, {'average_score_percent': 70.0, 'responses': []})
+    assert store.flush(5)
+    path = os.path.join(store.folder, 'interviews', f"{report_id}.json")
+    # Written to a temporary file, then renamed over the final name in one step
+    assert replaced == [(f"{path}.tmp", False)]
+    with open(path, encoding='utf-8') as f:
+        assert json.load(f)['average_score_percent'] == 70.0
+    assert not [name for name in os.listdir(os.path.dirname(path)) if name.endswith('.tmp')]
+
+
+def test_pending_reports_are_served_from_memory(store):
+    release = threading.Event()
+    store._queue.put(lambda: release.wait(5))  # Hold the writer
+    report_id = store.save(PRACTICE, practice_report(60.0), session_id='a')
+    assert store.get(report_id) == practice_report(60.0)
+    assert [row['id'] for row in store.list(PRACTICE, 'a')] == [report_id]
+    assert store.stats()['pending'] == 1
+    assert not os.path.exists(os.path.join(store.folder, f"{report_id}.json"))
+    release.set()
+    assert store.flush(5)
+    assert store.get(report_id) == practice_report(60.0)
+    assert store.stats()['written'] == 1 and store.stats()['pending'] == 0
+
+
+def test_list_filters_and_orders_newest_first(store):
+    older = store.save(PRACTICE, practice_report(40.0), session_id='a')
+    interview = store.save(INTERVIEW, {'average_score_percent': 70.0, 'resume_filename': "cv.pdf"}, session_id='a')
+    newer = store.save(PRACTICE, practice_report(60.0), session_id='b')
+    assert store.flush(5)
+    assert [row['id'] for row in store.list()] == [newer, interview, older]
+    assert [row['id'] for row in store.list(PRACTICE)] == [newer, older]
+    assert [row['id'] for row in store.list(session_id='a')] == [interview, older]
+    assert store.list(limit=1)[0]['id'] == newer
+    row = store.latest(INTERVIEW)
+    assert row['candidate'] == "cv.pdf" and row['score_percent'] == 70.0
+    assert store.get('report_missing') is None
+
+
+def test_files_written_before_the_index_are_indexed(tmp_path):
+    folder = tmp_path / 'reports'
+    folder.mkdir()
+    (folder / 'report_20240101_120000.json').write_text(json.dumps(practice_report(40.0)), encoding='utf-8')
+    (folder / 'report_broken.json').write_text('{', encoding='utf-8')
+    store = ReportStore(str(folder))
+    assert store.flush(5)
+    assert [row['id'] for row in store.list()] == ['report_20240101_120000']
+    assert store.get('report_20240101_120000') == practice_report(40.0)
+
+
+def test_history_sums_every_report_of_the_session(store):
+    store.save(PRACTICE, practice_report(40.0, confidence=10.0), session_id='a')
+    store.save(PRACTICE, practice_report(60.0, confidence=30.0, delivery=15.0), session_id='a')
+    assert store.flush(5)
+    store.save(INTERVIEW, {'average_score_percent': 90.0, 'responses': []}, session_id='a')  # Still pending
+    store.save(PRACTICE, practice_report(80.0), session_id='b')
+
+    history = store.history('a')
+    summary = history['summary']
+    assert summary['reports'] == 3
+    assert [point['score_percent'] for point in history['series']] == [50.0, 60.0, 90.0]
+    assert summary['average']['score_percent'] == round((50.0 + 60.0 + 90.0) / 3, 1)
+    assert summary['average']['confidence'] == round((10.0 + 30.0) / 3, 1)  # The interview has no answers
+    assert summary['average']['delivery'] == 15.0  # Averaged over reports that have it
+    assert summary['best_score_percent'] == 90.0
+    assert summary['first_score_percent'] == 50.0 and summary['latest_score_percent'] == 90.0
+    assert summary['change_percent'] == 40.0
+
+    assert store.flush(5)
+    assert store.history('a') == history  # Counted once, written or not
+    assert store.history('a', kind=PRACTICE)['summary']['reports'] == 2
+    assert store.history('b')['summary']['average']['score_percent'] == 100.0
+
+
+def test_history_of_an_unknown_session_is_empty(store):
+    assert store.history('nobody') == {'series': [], 'summary': {'reports': 0}}
+
+
+def test_history_survives_a_restart(tmp_path):
+    folder = str(tmp_path / 'reports')
+    first = ReportStore(folder)
+    first.save(PRACTICE, practice_report(40.0), session_id='a')
+    assert first.flush(5)
+    assert ReportStore(folder).history('a')['summary']['reports'] == 1
+
+
+def test_session_cookie_is_permanent():
+    import web_app
+    client = web_app.app.test_client()
+    response = client.get('/history')
+    assert response.status_code == 200
+    cookie = response.headers['Set-Cookie']
+    assert 'Expires=' in cookie
@@ -0,0 +1,48 @@
+"""Content-addressed storage of uploaded resumes and their derived data"""
+
+import hashlib
+import io
+import os
+
+from werkzeug.datastructures import FileStorage
+
+from resume_cache import ResumeCache, sha256_of_file
+
+
+def upload(data, filename="resume.pdf"):
+    return FileStorage(stream=io.BytesIO(data), filename=filename)
+
+
+def test_values_round_trip(tmp_path):
+    cache = ResumeCache(str(tmp_path / 'cache'))
+    assert cache.get('abc', 'text') is None
+    cache.put('abc', 'text', {'text': "Python, SQL – naïve résumé"})
+    assert cache.get('abc', 'text') == {'text': "Python, SQL – naïve résumé"}
+    assert cache.get('abc', 'questions') is None  # Keyed by name as well as content
+    assert cache.stats() == {'hits': 1, 'misses': 2}
+    # Written through a temporary file that is renamed into place
+    assert not [name for name in os.listdir(tmp_path / 'cache') if name.endswith('.tmp')]
+
+
+def test_unreadable_value_is_a_miss(tmp_path):
+    cache = ResumeCache(str(tmp_path))
+    (tmp_path / 'abc.text.json').write_text('{"text": ', encoding='utf-8')
+    assert cache.get('abc', 'text') is None
+    # Survives a new cache over the same folder, e.g. after a restart
+    cache.put('abc', 'text', ["fixed"])
+    assert ResumeCache(str(tmp_path)).get('abc', 'text') == ["fixed"]
+
+
+def test_identical_uploads_are_stored_once(tmp_path):
+    cache = ResumeCache(str(tmp_path / 'cache'))
+    folder = str(tmp_path / 'uploads')
+    digest, path, is_new = cache.store_upload(upload(b"%PDF resume"), folder, '.pdf')
+    assert is_new and digest == hashlib.sha256(b"%PDF resume").hexdigest()
+    assert path == os.path.join(folder, f"{digest}.pdf")
+    assert sha256_of_file(path) == digest
+
+    again = cache.store_upload(upload(b"%PDF resume", "renamed.pdf"), folder, '.pdf')
+    assert again == (digest, path, False)
+    other, other_path, is_new = cache.store_upload(upload(b"%PDF other"), folder, '.pdf')
+    assert is_new and other != digest
+    assert sorted(os.listdir(folder)) == sorted([os.path.basename(path), os.path.basename(other_path)])
@@ -0,0 +1,52 @@
+"""Background preparation of uploaded resumes"""
+
+import threading
+
+from resume_jobs import FAILED, READY, SYNTHESIZING, ResumeJobRunner
+
+
+class Request:
+    """Stand-in for a queued TTS synthesis request"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.ok = False
+
+    def finish(self):
+        self.ok = True
+        self.done.set()
+
+
+def runner(requests, **options):
+    return ResumeJobRunner(lambda path: f"resume at {path}", lambda text: ["Q1?", "Q2?"],
+                           prefetch=lambda questions: requests, **options)
+
+
+def test_job_is_ready_only_after_its_prompts_are_synthesized():
+    requests = [Request(), Request()]
+    job = runner(requests).submit('resume.pdf')
+    assert not job.wait(0.1)
+    assert job.status == SYNTHESIZING
+    requests[0].finish()
+    assert job.snapshot()['prompts_synthesized'] == 1
+    requests[1].finish()
+    assert job.wait(5)
+    assert job.questions == ["Q1?", "Q2?"] and job.resume_text == "resume at resume.pdf"
+    snapshot = job.snapshot()
+    assert snapshot['status'] == READY
+    assert snapshot['prompts_queued'] == 2 and snapshot['prompts_synthesized'] == 2
+
+
+def test_slow_synthesis_does_not_hold_the_job_back():
+    job = runner([Request()], synthesis_timeout=0.05).submit('resume.pdf')
+    assert job.wait(5)
+    assert job.snapshot()['prompts_synthesized'] == 0
+
+
+def test_failed_parse_fails_the_job():
+    def parse(path):
+        raise ValueError("not a resume")
+
+    job = ResumeJobRunner(parse, lambda text: []).submit('resume.pdf')
+    assert not job.wait(5)
+    assert job.status == FAILED and job.error == "not a resume"
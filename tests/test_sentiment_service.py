@@ -0,0 +1,99 @@
+"""Micro-batched sentiment inference shared by all sessions"""
+
+import threading
+
+import pytest
+
+from lazy_models import lazy
+from sentiment_service import FakeBackend, SentimentService, create_sentiment_backend, positive_probability
+
+
+class GatedBackend(FakeBackend):
+    """Holds the first batch until released, so later texts queue up behind it"""
+
+    def __init__(self):
+        super().__init__(batch_cost=0, item_cost=0)
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def predict(self, texts):
+        self.started.set()
+        assert self.release.wait(5)
+        return super().predict(texts)
+
+
+def test_waiting_texts_share_one_batch():
+    backend = GatedBackend()
+    service = SentimentService(backend, max_batch=32)
+    first = service.submit("first")
+    assert backend.started.wait(5)
+    texts = [f"text {i} was {'great' if i % 2 else 'terrible'}" for i in range(10)]
+    futures = [service.submit(text) for text in texts]
+    backend.release.set()
+    results = [future.result(timeout=5) for future in futures]
+    assert first.result(timeout=5)['label'] == 'POSITIVE'
+    assert backend.batches == [1, 10]
+    # Each caller gets the result for its own text
+    assert [r['label'] for r in results] == ['NEGATIVE' if i % 2 == 0 else 'POSITIVE' for i in range(10)]
+    assert service.stats()['avg_batch_size'] == 5.5
+
+
+def test_batches_are_capped():
+    backend = GatedBackend()
+    service = SentimentService(backend, max_batch=4)
+    service.submit("first")
+    assert backend.started.wait(5)
+    futures = [service.submit("good") for _ in range(10)]
+    backend.release.set()
+    for future in futures:
+        future.result(timeout=5)
+    assert backend.batches == [1, 4, 4, 2]
+
+
+def test_concurrent_callers_get_their_own_results():
+    service = SentimentService(FakeBackend(batch_cost=0.01, item_cost=0))
+    results = {}
+
+    def ask(i):
+        results[i] = service.predict([f"i loved {i}", f"i hated {i}"], timeout=5)
+
+    threads = [threading.Thread(target=ask, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(5)
+    assert all([r['label'] for r in results[i]] == ['POSITIVE', 'NEGATIVE'] for i in range(8))
+    stats = service.stats()
+    assert stats['completed'] == 16 and stats['batches'] < 16
+
+
+def test_failed_batch_fails_every_caller():
+    class Broken(FakeBackend):
+        def predict(self, texts):
+            raise RuntimeError("model crashed")
+
+    service = SentimentService(Broken())
+    with pytest.raises(RuntimeError):
+        service.predict(["a", "b"], timeout=5)
+    # The inference thread keeps serving
+    with pytest.raises(RuntimeError):
+        service.predict(["c"], timeout=5)
+    assert service.stats()['failed'] == 3
+
+
+def test_stats_do_not_load_lazy_backends():
+    loads = []
+    service = SentimentService(lazy('test sentiment backend', lambda: loads.append(1) or FakeBackend(0, 0)))
+    assert service.stats()['backend'] == "not loaded" and loads == []
+    service.predict(["good"], timeout=5)
+    assert service.stats()['backend'] == "fake"
+
+
+def test_positive_probability():
+    assert positive_probability({'label': 'POSITIVE', 'score': 0.9}) == 0.9
+    assert positive_probability({'label': 'NEGATIVE', 'score': 0.9}) == pytest.approx(0.1)
+
+
+def test_unknown_backend_falls_back_to_textblob():
+    pytest.importorskip('textblob')
+    assert create_sentiment_backend("no-such-backend").name == "textblob"
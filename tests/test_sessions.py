@@ -0,0 +1,57 @@
+"""Per-session state: many simulated candidates on one app"""
+
+import threading
+import time
+
+import pytest
+
+import benchmarks
+from sessions import SessionRegistry
+
+
+@pytest.fixture
+def web_app(monkeypatch):
+    """The app with simulated microphone and interview threads"""
+    import web_app
+    monkeypatch.setattr(web_app, 'listen_speech', benchmarks.simulated_listen_speech)
+    monkeypatch.setattr(web_app, 'interview_conversation_thread', benchmarks.simulated_interview_thread)
+    monkeypatch.setitem(web_app.app.config, 'TESTING', True)
+    return web_app
+
+
+def test_parallel_candidates_are_isolated(web_app):
+    # Same load test as `python benchmarks.py sessions`, asserting that nothing leaks between sessions
+    candidates = 6
+    results = [None] * candidates
+    threads = [threading.Thread(target=benchmarks.run_simulated_candidate, args=(web_app.app, i, results, 10))
+               for i in range(candidates)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=60)
+    for index, result in enumerate(results):
+        assert result is not None, f"candidate {index} did not finish"
+        errors, latencies = result
+        assert errors == [], f"candidate {index}: {errors}"
+        assert latencies
+
+
+def test_registry_keeps_one_state_per_session():
+    registry = SessionRegistry()
+    first, second = registry.practice('a'), registry.practice('b')
+    assert registry.practice('a') is first and first is not second
+
+    first.start("first text")
+    first.add_result("hello", {'confidence': 20.0, 'clarity': 30.0, 'fluency': 10.0, 'score': 60.0})
+    assert second.feedback_snapshot() == (False, {})
+    assert first.stop()[0] == ["hello"]
+    assert second.stop() is None
+
+
+def test_idle_sessions_are_pruned():
+    registry = SessionRegistry(idle_timeout=0)
+    registry.interview('busy').active = True
+    registry.practice('idle')
+    time.sleep(0.01)
+    assert registry.prune() == 1
+    assert len(registry) == 1
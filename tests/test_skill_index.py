@@ -0,0 +1,43 @@
+"""Topic keywords matched as whole words, prefixes and phrases"""
+
+from skill_index import SkillIndex, SkillTaxonomy
+
+
+def test_terms_do_not_match_inside_words():
+    index = SkillIndex({'ai': ['ai'], 'data': ['data']})
+    assert index.match("I maintain the main pipeline") == []
+    assert index.match("AI and big-data work") == ['ai', 'data']
+
+
+def test_languages_with_symbols_are_whole_words():
+    index = SkillIndex({'c++': ['c++'], 'c#': ['c#'], 'c': ['c'], 'java': ['java']})
+    assert index.match("C++, C# and C.") == ['c++', 'c#', 'c']
+    assert index.match("javascript, abc++ and c#x") == []
+    assert index.match("(java)") == ['java']
+
+
+def test_prefixes_and_phrases():
+    index = SkillIndex({'team': ['lead*', 'work together'], 'ai': ['machine learning', 'neural network*']})
+    assert index.match("Leadership matters") == ['team']
+    assert index.match("We work, together") == ['team']  # Phrase words may be split by punctuation
+    assert index.match("Machine  learning with neural networks") == ['ai']
+    assert index.match("machine shop, learning curve") == []
+
+
+def test_a_term_hidden_by_another_topic_is_still_found():
+    index = SkillIndex({'skills': ['learn*', 'leader'], 'ai': ['machine learning'], 'team': ['lead*']})
+    assert index.match("machine learning") == ['skills', 'ai']
+    assert index.match("a leader") == ['skills', 'team']
+    assert index.match("leading") == ['team']
+
+
+def test_results_follow_taxonomy_order_and_shared_terms():
+    index = SkillIndex({'b': ['develop*'], 'a': ['develop*', 'python']})
+    assert index.match("python developer") == ['b', 'a']
+    assert SkillIndex({}).match("anything") == []
+
+
+def test_taxonomy_file_loads():
+    taxonomy = SkillTaxonomy()
+    assert taxonomy.resume.match("Built ML systems in Python and C++") == ['programming', 'project']
+    assert 'ai' not in taxonomy.answers.match("I maintain the main pipeline")
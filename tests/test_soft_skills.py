@@ -0,0 +1,70 @@
+"""Golden soft-skill scores, so changes to the scoring engine show up as test failures"""
+
+import pytest
+
+np = pytest.importorskip('numpy')
+textblob = pytest.importorskip('textblob')
+
+from soft_skills import SoftSkillScorer
+
+# text -> (confidence, clarity, fluency, score, words, fillers)
+GOLDEN = {
+    "I led a small team that rebuilt our billing service in Python. We cut costs by a third.":
+        (13.1, 30.0, 20.0, 63.1, 18, 0),
+    "Um, I think, like, I was basically the one who, uh, fixed the bug.":
+        (16.5, 30.0, 20.0, 66.5, 14, 4),
+    "This was a terrible and frustrating project with awful deadlines.":
+        (3.0, 30.0, 20.0, 53.0, 10, 0),
+    "": (15.0, 30.0, 0.0, 45.0, 0, 0),
+}
+
+
+@pytest.fixture(scope="module")
+def scorer():
+    return SoftSkillScorer()
+
+
+def test_golden_scores(scorer):
+    results = scorer.score_batch(list(GOLDEN))
+    for (text, expected), result in zip(GOLDEN.items(), results):
+        actual = tuple(result[k] for k in ('confidence', 'clarity', 'fluency', 'score', 'words', 'fillers'))
+        assert actual == expected, text
+        assert result['max_score'] == 80 and 'delivery' not in result
+
+
+def test_single_score_matches_batch(scorer):
+    for text, result in zip(GOLDEN, scorer.score_batch(list(GOLDEN))):
+        assert scorer.score(text) == result
+
+
+def test_confidence_and_clarity_match_textblob(scorer):
+    # The formulas the app used before the scoring engine
+    for text in GOLDEN:
+        blob = textblob.TextBlob(text)
+        result = scorer.score(text)
+        assert result['confidence'] == round((blob.sentiment.polarity + 1) / 2 * 30, 1)
+        errors = len(str(blob.correct()).split()) - len(str(blob).split())
+        assert result['clarity'] == max(0, 30 - abs(errors) * 5)
+
+
+def test_corrections_match_textblob_and_are_cached(scorer):
+    assert scorer.correct("I have experiance with databses") == str(textblob.TextBlob(
+        "I have experiance with databses").correct())
+    assert scorer.stats()['cached_corrections'] > 0
+
+
+def test_fillers_are_whole_words_and_phrases(scorer):
+    features = scorer.features("I like, you know, likely basically ummm kind of liked it")
+    assert features.fillers == ["like", "you know", "basically", "kind of"]
+
+
+def test_sentences_and_contractions_are_counted_once(scorer):
+    features = scorer.features("I don't know. We moved to node.js in 1.5 years! It worked")
+    assert features.words[:3] == ["i", "don't", "know"]
+    assert features.sentence_lengths == [3, 9, 2]  # node.js and 1.5 do not end the sentence
+    assert features.avg_sentence_length == pytest.approx(14 / 3)
+
+
+def test_fluency_penalizes_each_filler(scorer):
+    # 10 words in one sentence: 30 points, minus 5 for each of 3 fillers, capped at 20
+    assert scorer.score("so um I think uh we basically did the work")['fluency'] == 15.0
@@ -0,0 +1,61 @@
+"""Drafting the interviewer's reply from partial transcripts"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from speculation import SpeculativeReply
+
+ANSWER = "i led a small team that rebuilt our billing service in python and cut costs"
+
+
+@pytest.fixture
+def executor():
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        yield pool
+
+
+def replier(executor, **options):
+    composed = []
+
+    def compose(text):
+        composed.append(text)
+        return f"reply to {len(text.split())} words"
+
+    prefetched = []
+    return SpeculativeReply(executor, compose, prefetch=prefetched.extend, **options), composed, prefetched
+
+
+def test_draft_is_used_when_the_partial_covered_the_answer(executor):
+    reply, composed, prefetched = replier(executor)
+    partial = ANSWER.rsplit(" ", 2)[0]  # The last words were not recognized yet
+    reply.update(partial)
+    text, speculated = reply.reply(ANSWER, wait=1.0)
+    assert speculated
+    assert composed == [partial]  # Not composed again for the final answer
+    assert prefetched == [text]  # Its audio was synthesized ahead of time
+
+
+def test_final_answer_is_composed_when_the_draft_is_too_old(executor):
+    reply, composed, _ = replier(executor)
+    reply.update("i led a small team")
+    text, speculated = reply.reply(ANSWER, wait=1.0)
+    assert not speculated
+    assert text == f"reply to {len(ANSWER.split())} words"
+    assert composed[-1] == ANSWER
+
+
+def test_no_partials_means_no_draft(executor):
+    reply, composed, _ = replier(executor)
+    text, speculated = reply.reply(ANSWER)
+    assert not speculated and composed == [ANSWER] and reply.drafts == 0
+
+
+def test_drafts_start_only_after_enough_new_words(executor):
+    reply, composed, _ = replier(executor, min_new_words=4)
+    reply.update("i led")
+    reply.update("i led a")
+    assert reply.drafts == 0 and composed == []
+    reply.update("i led a small")
+    reply.reply("i led a small", wait=1.0)
+    assert reply.drafts == 1
@@ -0,0 +1,97 @@
+"""Voice-activity segmentation of the continuous microphone stream"""
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from speech_capture import AudioRingBuffer, SpeechSegmenter, VoiceActivityDetector
+
+SAMPLE_RATE = 16000
+FRAME = 480  # 30 ms
+
+
+class LoudnessVad:
+    """Scripted detector: any non-zero sample is speech"""
+
+    def is_speech(self, frame):
+        return bool(frame.any())
+
+
+def script(*parts):
+    """Frames of silence (0) or speech (1000), e.g. script((40, 0), (40, 1000))"""
+    return np.concatenate([np.full(frames * FRAME, value, dtype=np.int16) for frames, value in parts])
+
+
+def segment(samples, chunk=None, **options):
+    segmenter = SpeechSegmenter(SAMPLE_RATE, vad=LoudnessVad(), **options)
+    utterances = []
+    for start in range(0, len(samples), chunk or len(samples)):
+        utterances += segmenter.feed(samples[start:start + (chunk or len(samples))])
+    return segmenter, utterances
+
+
+def test_utterance_spans_the_speech_with_preroll():
+    _, utterances = segment(script((40, 0), (40, 1000), (30, 0)))
+    utterance, = utterances
+    # 300 ms before the speech, 150 ms after it
+    assert len(utterance) == 4800 + 40 * FRAME + 2400
+    assert np.count_nonzero(utterance) == 40 * FRAME
+    assert not utterance[:4800].any() and utterance[4800:4800 + 40 * FRAME].all()
+
+
+def test_boundaries_do_not_depend_on_chunk_size():
+    samples = script((40, 0), (40, 1000), (30, 0), (20, 1000), (30, 0))
+    _, whole = segment(samples)
+    assert len(whole) == 2
+    for chunk in (100, 480, 1000, 7777):
+        _, chunked = segment(samples, chunk)
+        assert len(chunked) == len(whole)
+        assert all(np.array_equal(a, b) for a, b in zip(chunked, whole))
+
+
+def test_short_pause_does_not_end_the_utterance():
+    # 300 ms of silence is shorter than the 600 ms hangover
+    _, utterances = segment(script((40, 0), (20, 1000), (10, 0), (20, 1000), (30, 0)))
+    assert len(utterances) == 1 and np.count_nonzero(utterances[0]) == 40 * FRAME
+
+
+def test_blips_are_not_utterances():
+    # Two frames are not enough to start, five start but are shorter than min_speech
+    segmenter, utterances = segment(script((40, 0), (2, 1000), (30, 0), (5, 1000), (30, 0)))
+    assert utterances == [] and not segmenter.in_speech
+
+
+def test_span_of_utterance_in_progress():
+    segmenter, utterances = segment(script((40, 0), (30, 1000)))
+    assert utterances == [] and segmenter.in_speech
+    assert segmenter.utterance_start == 40 * FRAME - 4800
+    assert segmenter.current_span() == (40 * FRAME - 4800, 70 * FRAME)
+    assert segmenter.current_span(max_seconds=0.3) == (70 * FRAME - 4800, 70 * FRAME)
+    assert len(segmenter.current_audio()) == 30 * FRAME + 4800
+    utterance, = segmenter.flush()
+    assert np.count_nonzero(utterance) == 30 * FRAME
+    assert segmenter.utterance_start is None and segmenter.current_span() is None
+
+
+def test_long_answers_are_handed_over_in_pieces():
+    _, utterances = segment(script((40, 0), (200, 1000), (30, 0)), max_utterance_s=2.0)
+    assert len(utterances) == 3
+    assert sum(np.count_nonzero(u[4800:len(u) - 2400]) for u in utterances) == 200 * FRAME
+
+
+def test_ring_buffer_keeps_the_latest_samples():
+    buffer = AudioRingBuffer(10)
+    buffer.write(np.arange(8, dtype=np.int16))
+    buffer.write(np.arange(8, 14, dtype=np.int16))
+    assert buffer.total_written == 14
+    assert buffer.read(0, 14).tolist() == list(range(4, 14))
+    assert buffer.read(12, 20).tolist() == [12, 13]
+
+
+def test_detector_learns_the_noise_floor():
+    rng = np.random.default_rng(0)
+    vad = VoiceActivityDetector()
+    noise = [rng.normal(0, 50, FRAME).astype(np.int16) for _ in range(20)]
+    assert not any(vad.is_speech(frame) for frame in noise)
+    t = np.arange(FRAME) / SAMPLE_RATE
+    assert vad.is_speech((3000 * np.sin(2 * np.pi * 200 * t)).astype(np.int16))
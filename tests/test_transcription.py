@@ -0,0 +1,203 @@
+"""Speech recognition through the shared pool, with deterministic fake backends"""
+
+import threading
+import time
+
+import pytest
+
+pytest.importorskip('numpy')
+sr = pytest.importorskip('speech_recognition')
+
+from lazy_models import lazy
+from transcription import FakeBackend, RecognitionBackend, TranscriptionService, create_backend
+
+SAMPLE_RATE = 16000
+
+
+def audio(seconds, seed=0):
+    """Deterministic 16-bit mono audio"""
+    data = bytes((i * 7 + seed) % 256 for i in range(int(SAMPLE_RATE * seconds) * 2))
+    return sr.AudioData(data, SAMPLE_RATE, 2)
+
+
+def test_scripted_transcripts_in_order():
+    service = TranscriptionService(FakeBackend(["first answer", "second answer"]), max_workers=2)
+    assert service.transcribe(audio(0.5), timeout=5) == "first answer"
+    assert service.transcribe(audio(0.5), timeout=5) == "second answer"
+    stats = service.stats()
+    assert stats['backend'] == "fake" and stats['completed'] == 2 and stats['failed'] == 0
+    assert 'latency_p50_ms' in stats
+
+
+def test_fake_transcription_is_deterministic():
+    service = TranscriptionService(FakeBackend(), max_workers=4)
+    futures = [service.submit(audio(0.5, seed)) for seed in range(8)]
+    texts = [f.result(timeout=5) for f in futures]
+    assert texts == [service.transcribe(audio(0.5, seed), timeout=5) for seed in range(8)]
+    assert all(len(text.split()) == 8 for text in texts)
+
+
+def test_empty_scripted_transcript_is_not_understood():
+    service = TranscriptionService(FakeBackend([""]))
+    with pytest.raises(sr.UnknownValueError):
+        service.transcribe(audio(0.5), timeout=5)
+    assert service.stats()['failed'] == 1
+
+
+def test_unknown_backend_falls_back_to_google():
+    assert create_backend("no-such-backend").name == "google"
+
+
+def test_stats_do_not_load_lazy_backends():
+    loads = []
+    backend = lazy('test speech backend', lambda: loads.append(1) or FakeBackend())
+    service = TranscriptionService(backend)
+    assert service.stats()['backend'] == "not loaded"
+    assert loads == []
+    assert service.transcribe(audio(0.5), timeout=5)
+    assert service.stats()['backend'] == "fake"
+
+
+class NoPartialsBackend(RecognitionBackend):
+    """Like Google: final text only"""
+
+    name = "no-partials"
+    partial_interval = None
+
+    def transcribe(self, audio):
+        return "final text"
+
+
+def capture_updates(stream, seconds, step=0.25, window=10.0, pause=0.01):
+    """Offer audio the way StreamingSpeechCapture does: the latest window, with absolute positions"""
+    data = audio(seconds).frame_data
+    for end in range(int(step * SAMPLE_RATE), int(seconds * SAMPLE_RATE) + 1, int(step * SAMPLE_RATE)):
+        start = max(0, end - int(window * SAMPLE_RATE))
+        chunk = sr.AudioData(data[start * 2:end * 2], SAMPLE_RATE, 2)
+        chunk.start, chunk.utterance_start = start, 0
+        stream.update(chunk)
+        time.sleep(pause)
+
+
+def test_partials_come_from_partial_backend_when_main_has_none():
+    service = TranscriptionService(NoPartialsBackend(), partial_backend=FakeBackend())
+    received = threading.Event()
+    partials = []
+    stream = service.stream(on_partial=lambda text: (partials.append(text), received.set()))
+    stream.update(audio(1.0))
+    assert received.wait(5)
+    assert stream.finish(audio(1.0)) == "final text"
+    assert partials and partials[0]
+
+
+def test_no_partials_without_a_partial_source():
+    service = TranscriptionService(NoPartialsBackend())
+    stream = service.stream(on_partial=lambda text: pytest.fail("unexpected partial"))
+    stream.update(audio(1.0))
+    assert stream.finish(audio(1.0)) == "final text"
+    assert service.stats()['partials'] == 0
+
+
+def test_no_partial_is_delivered_after_finish():
+    started, release = threading.Event(), threading.Event()
+
+    class SlowPartials(FakeBackend):
+        def partial(self, audio):
+            started.set()
+            release.wait(5)
+            return super().partial(audio)
+
+    service = TranscriptionService(SlowPartials(["final text"]))
+    partials = []
+    stream = service.stream(on_partial=partials.append)
+    stream.update(audio(1.0))
+    assert started.wait(5)
+    assert stream.finish(audio(1.0)) == "final text"
+    release.set()
+    service._partial_executor.shutdown(wait=True)
+    assert partials == []
+
+
+def test_streaming_decoder_is_fed_each_sample_once():
+    backend = FakeBackend(streaming=True)
+    backend.partial_interval = 0.0
+    service = TranscriptionService(NoPartialsBackend(), partial_backend=backend)
+    partials = []
+    stream = service.stream(on_partial=partials.append)
+    capture_updates(stream, 30.0)
+    service._partial_executor.shutdown(wait=True)
+
+    decoder, = backend.decoders
+    # 30 s offered as overlapping 10 s windows, yet every sample reaches the one decoder exactly once
+    assert sum(decoder.chunks) == 30 * SAMPLE_RATE * 2
+    assert max(decoder.chunks) < 10 * SAMPLE_RATE * 2
+    assert stream.complete
+    assert len(partials[-1].split()) > 2 * 10  # Covers more than the last window
+
+
+def test_windowed_partials_are_bounded():
+    seen = []
+
+    class Recording(FakeBackend):
+        partial_interval = 0.0
+        partial_window_s = 2.0
+
+        def partial(self, audio):
+            seen.append(len(audio.frame_data))
+            return super().partial(audio)
+
+    service = TranscriptionService(NoPartialsBackend(), partial_backend=Recording())
+    stream = service.stream(on_partial=lambda text: None)
+    capture_updates(stream, 6.0)
+    service._partial_executor.shutdown(wait=True)
+    assert seen and max(seen) <= 2 * SAMPLE_RATE * 2
+    assert not stream.complete
+
+
+def test_concurrent_transcripts_all_get_partials():
+    class SlowPartials(FakeBackend):
+        partial_interval = 0.0
+
+        def partial(self, audio):
+            time.sleep(0.05)
+            return super().partial(audio)
+
+    service = TranscriptionService(NoPartialsBackend(), partial_backend=SlowPartials(), partial_workers=2)
+    received = [[] for _ in range(4)]
+    streams = [service.stream(on_partial=texts.append) for texts in received]
+    threads = [threading.Thread(target=capture_updates, args=(stream, 1.0, 0.1)) for stream in streams]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    service._partial_executor.shutdown(wait=True)
+    assert all(received)
+
+
+def test_vosk_decoder_resamples_and_keeps_closed_segments():
+    from transcription import _VoskDecoder
+
+    class Recognizer:
+        """Scripted KaldiRecognizer: closes a segment on the second chunk"""
+
+        def __init__(self):
+            self.received = []
+
+        def AcceptWaveform(self, raw):
+            self.received.append(len(raw))
+            return len(self.received) == 2
+
+        def Result(self):
+            return '{"text": "hello there"}'
+
+        def PartialResult(self):
+            return '{"partial": "general" }' if len(self.received) > 2 else '{"partial": ""}'
+
+    recognizer = Recognizer()
+    decoder = _VoskDecoder(recognizer, 48000, 2)
+    one_second = bytes(48000 * 2)
+    assert decoder.accept(one_second) == ""
+    assert decoder.accept(one_second) == "hello there"
+    assert decoder.accept(one_second) == "hello there general"
+    # 48 kHz chunks reach Vosk at 16 kHz, without losing samples between chunks
+    assert abs(sum(recognizer.received) - 3 * 16000 * 2) <= 4
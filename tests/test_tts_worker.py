@@ -0,0 +1,127 @@
+"""Prompt synthesis, caching and playback, with a fake pyttsx3 engine"""
+
+import threading
+import time
+import wave
+from types import SimpleNamespace
+
+import pytest
+
+import tts_worker
+from tts_worker import TTSWorker
+
+
+class FakeEngine:
+    """Writes one short WAV file per save_to_file() and records what was said live"""
+
+    def __init__(self, voices):
+        self.properties = {'voices': voices, 'voice': 'default'}
+        self.pending = []
+        self.saved = []
+        self.said = []
+
+    def getProperty(self, name):
+        return self.properties[name]
+
+    def setProperty(self, name, value):
+        self.properties[name] = value
+
+    def save_to_file(self, text, path):
+        self.pending.append((text, path))
+
+    def say(self, text):
+        self.said.append(text)
+
+    def runAndWait(self):
+        for text, path in self.pending:
+            with wave.open(path, 'wb') as wav:
+                wav.setnchannels(1)
+                wav.setsampwidth(2)
+                wav.setframerate(16000)
+                wav.writeframes(bytes(3200))
+            self.saved.append(text)
+        self.pending.clear()
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    voices = [SimpleNamespace(id='david-id', name='Microsoft David'),
+              SimpleNamespace(id='zira-id', name='Microsoft Zira')]
+    engine = FakeEngine(voices)
+    monkeypatch.setattr(tts_worker, 'pyttsx3', SimpleNamespace(init=lambda: engine))
+    return engine
+
+
+@pytest.fixture
+def worker(engine, tmp_path):
+    return TTSWorker(cache_dir=str(tmp_path / 'cache'))
+
+
+def test_preferred_voice_is_picked(worker, engine):
+    worker._ensure_running()
+    deadline = time.monotonic() + 5
+    while worker.voice is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert worker.voice == 'zira-id'
+
+
+def test_cache_key_does_not_change_when_the_engine_starts(worker, engine, monkeypatch):
+    monkeypatch.setattr(worker, '_play_wav', lambda path, device=None: None)
+    path = worker.cache_path("Tell me about yourself.")
+    assert worker.speak("Tell me about yourself.", timeout=5)
+    assert worker.voice == 'zira-id'
+    assert worker.cache_path("Tell me about yourself.") == path
+    assert worker._cached("Tell me about yourself.") == path
+    assert worker.speak("Tell me about yourself.", timeout=5)
+    assert engine.saved == ["Tell me about yourself."]
+    assert worker.stats()['cache_hits'] == 1 and worker.stats()['cache_misses'] == 1
+
+
+def test_cached_prompts_play_at_the_same_time(worker, engine, monkeypatch):
+    playing, overlapped = [], threading.Event()
+    lock = threading.Lock()
+
+    def play_wav(path, device=None):
+        with lock:
+            playing.append(path)
+            if len(playing) > 1:
+                overlapped.set()
+        overlapped.wait(2)
+        with lock:
+            playing.remove(path)
+
+    prompts = ["First question?", "Second question?"]
+    monkeypatch.setattr(worker, '_play_wav', lambda path, device=None: None)
+    assert all(worker.speak(text, timeout=5) for text in prompts)
+    monkeypatch.setattr(worker, '_play_wav', play_wav)
+    results = []
+    threads = [threading.Thread(target=lambda text=text: results.append(worker.speak(text, timeout=5)))
+               for text in prompts]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert overlapped.is_set()  # One interview's prompt did not wait for the other's to finish
+    assert results == [True, True]
+    assert worker.stats()['cache_hits'] == 2 and engine.saved == prompts
+
+
+def test_speaks_live_without_an_audio_output(worker, engine, monkeypatch):
+    def no_output(path, device=None):
+        raise OSError("no audio output")
+
+    monkeypatch.setattr(worker, '_play_wav', no_output)
+    assert worker.speak("Hello there.", timeout=5)
+    assert engine.saved == ["Hello there."] and engine.said == ["Hello there."]
+    assert worker.stats()['cache_misses'] == 1
+
+
+def test_prefetch_returns_requests_to_wait_on(worker, engine):
+    requests = worker.prefetch(["First question?", "Second question?", "First question?"])
+    assert len(requests) == 2  # Duplicates are synthesized once
+    for request in requests:
+        assert request.done.wait(5) and request.ok
+        assert worker._cached(request.text) == request.path
+    assert worker.prefetch(["First question?"]) == []  # Already in the cache
+    assert worker.prefetch_draft(["Draft reply."])[0].done.wait(5)
+    assert worker._cached("Draft reply.").startswith(worker.draft_dir)
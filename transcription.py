@@ -0,0 +1,407 @@
+"""
+Speech-to-text backends and a shared transcription worker pool
+Recognition used to be a blocking recognize_google() call on the session's
+own thread. Backends are now pluggable (Google, offline Vosk or
+faster-whisper, and a deterministic fake for tests) and every session submits
+its utterances to one bounded thread pool, so several sessions transcribe in
+parallel and the latency of each utterance is measured. Partial hypotheses
+run on separate workers and never delay final transcriptions.
+
+Partial hypotheses come from local backends only: vosk, whisper and fake
+produce them, Google does not (each one would be another API request). When
+the main backend has none, a separate local partial_backend produces them
+while the main backend still produces the final text. Vosk streams: one
+recognizer per utterance is fed only the audio that arrived since the last
+partial. Whisper decodes its latest partial_window_s seconds for each partial.
+"""
+
+import audioop  # Also what speech_recognition converts sample rates with
+import hashlib
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from lazy_models import is_loaded, lazy_import
+
+sr = lazy_import('speech_recognition')
+
+
+class RecognitionBackend:
+    """Turns sr.AudioData into text. Raises sr.UnknownValueError / sr.RequestError like speech_recognition"""
+
+    name = "base"
+    partial_interval = 0.4  # Minimum seconds between partial hypotheses of one utterance; None disables them
+    partial_window_s = 8.0  # Latest seconds of speech decoded for a partial, unless the backend streams
+    streaming = False  # partial_decoder() decodes an utterance incrementally
+
+    def transcribe(self, audio):
+        raise NotImplementedError
+
+    def partial(self, audio):
+        """Best-effort hypothesis for speech that is still going on"""
+        return self.transcribe(audio)
+
+    def partial_decoder(self, sample_rate, sample_width):
+        """For streaming backends: a decoder whose accept(raw audio) returns the text so far"""
+        raise NotImplementedError
+
+
+class GoogleBackend(RecognitionBackend):
+    """Google Web Speech API through speech_recognition (needs network)"""
+
+    name = "google"
+    partial_interval = None  # Each partial would be another full API request
+
+    def transcribe(self, audio):
+        return sr.Recognizer().recognize_google(audio)
+
+
+class VoskBackend(RecognitionBackend):
+    """Offline Kaldi recognition with a local Vosk model directory"""
+
+    name = "vosk"
+    sample_rate = 16000
+    streaming = True
+
+    def __init__(self, model_path="models/vosk-model-small-en-us-0.15"):
+        import vosk
+        vosk.SetLogLevel(-1)
+        self._vosk = vosk
+        self.model = vosk.Model(model_path)
+
+    def transcribe(self, audio):
+        recognizer = self._vosk.KaldiRecognizer(self.model, self.sample_rate)
+        recognizer.AcceptWaveform(audio.get_raw_data(convert_rate=self.sample_rate, convert_width=2))
+        text = json.loads(recognizer.FinalResult()).get("text", "").strip()
+        if not text:
+            raise sr.UnknownValueError()
+        return text
+
+    def partial_decoder(self, sample_rate, sample_width):
+        return _VoskDecoder(self._vosk.KaldiRecognizer(self.model, self.sample_rate), sample_rate, sample_width)
+
+
+class _VoskDecoder:
+    """One KaldiRecognizer fed an utterance chunk by chunk"""
+
+    def __init__(self, recognizer, sample_rate, sample_width):
+        self.recognizer = recognizer
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self.finished = []  # Segments Vosk has already closed at a pause
+        self._rate_state = None  # Keeps the rate conversion continuous across chunks
+
+    def accept(self, raw):
+        if self.sample_width != 2:
+            raw = audioop.lin2lin(raw, self.sample_width, 2)
+        if self.sample_rate != VoskBackend.sample_rate:
+            raw, self._rate_state = audioop.ratecv(raw, 2, 1, self.sample_rate, VoskBackend.sample_rate,
+                                                   self._rate_state)
+        if self.recognizer.AcceptWaveform(raw):
+            text = json.loads(self.recognizer.Result()).get("text", "")
+            if text:
+                self.finished.append(text)
+            partial = ""
+        else:
+            partial = json.loads(self.recognizer.PartialResult()).get("partial", "")
+        return " ".join(self.finished + [partial] if partial else self.finished)
+
+
+class FasterWhisperBackend(RecognitionBackend):
+    """Offline Whisper on CPU through faster-whisper (int8 quantized)"""
+
+    name = "whisper"
+    sample_rate = 16000
+
+    def __init__(self, model_size="base.en", compute_type="int8", cpu_threads=2):
+        from faster_whisper import WhisperModel
+        self.model = WhisperModel(model_size, device="cpu", compute_type=compute_type,
+                                  cpu_threads=cpu_threads)
+
+    def transcribe(self, audio):
+        raw = audio.get_raw_data(convert_rate=self.sample_rate, convert_width=2)
+        samples = np.frombuffer(raw, dtype=np.int16).astype(np.float32) / 32768.0
+        segments, _ = self.model.transcribe(samples, language="en", beam_size=1, vad_filter=True)
+        text = " ".join(segment.text.strip() for segment in segments).strip()
+        if not text:
+            raise sr.UnknownValueError()
+        return text
+
+
+class FakeBackend(RecognitionBackend):
+    """
+    Deterministic backend for tests and load tests. Returns the scripted
+    transcripts in order, or a phrase derived from a hash of the audio.
+    With streaming, partials come from a decoder that records every chunk it is fed.
+    """
+
+    name = "fake"
+    WORDS = ["i", "worked", "on", "a", "team", "project", "to", "build", "python",
+             "services", "and", "we", "improved", "performance", "for", "our", "users"]
+
+    def __init__(self, transcripts=None, delay=0.0, streaming=False):
+        self.transcripts = list(transcripts or [])
+        self.delay = delay
+        self.streaming = streaming
+        self.decoders = []
+        self._lock = threading.Lock()
+
+    def transcribe(self, audio):
+        if self.delay:
+            time.sleep(self.delay)
+        with self._lock:
+            if self.transcripts:
+                text = self.transcripts.pop(0)
+                if not text:
+                    raise sr.UnknownValueError()
+                return text
+        return self._phrase(audio, 8)
+
+    def partial(self, audio):
+        # One word per half second so far, without consuming the scripted transcripts
+        seconds = len(audio.frame_data) / (audio.sample_rate * audio.sample_width)
+        return self._phrase(audio, max(1, min(8, int(seconds * 2))))
+
+    def _phrase(self, audio, words):
+        digest = hashlib.sha256(audio.get_raw_data()).digest()
+        return " ".join(self.WORDS[b % len(self.WORDS)] for b in digest[:words])
+
+    def partial_decoder(self, sample_rate, sample_width):
+        decoder = _FakeDecoder(sample_rate * sample_width)
+        with self._lock:
+            self.decoders.append(decoder)
+        return decoder
+
+
+class _FakeDecoder:
+    """Streaming stand-in: one word per half second of audio fed so far"""
+
+    def __init__(self, bytes_per_second):
+        self.bytes_per_second = bytes_per_second
+        self.chunks = []  # Size of every chunk fed, in bytes
+
+    def accept(self, raw):
+        self.chunks.append(len(raw))
+        words = int(sum(self.chunks) / self.bytes_per_second * 2)
+        return " ".join(FakeBackend.WORDS[i % len(FakeBackend.WORDS)] for i in range(words))
+
+
+BACKENDS = {
+    "google": GoogleBackend,
+    "vosk": VoskBackend,
+    "whisper": FasterWhisperBackend,
+    "fake": FakeBackend,
+}
+
+
+def backend_name(backend):
+    """Name of a backend for statistics, without loading a lazy one"""
+    if not is_loaded(backend):
+        return "not loaded"
+    return getattr(backend, 'name', None)  # None if there is none, or it failed to load
+
+
+def create_backend(name, fallback=True, **options):
+    """
+    Create a backend by name. If an offline one cannot load, fall back to Google,
+    or return None when fallback is False.
+    """
+    try:
+        backend = BACKENDS[name](**options)
+        print(f"✅ Speech recognition backend: {backend.name}")
+        return backend
+    except Exception as e:
+        if not fallback:
+            print(f"⚠️ Could not load '{name}' speech backend ({e})")
+            return None
+        print(f"⚠️ Could not load '{name}' speech backend ({e}) - using Google")
+        return GoogleBackend()
+
+
+class TranscriptionService:
+    """Bounded worker pool shared by all sessions, with per-utterance latency stats"""
+
+    def __init__(self, backend, max_workers=4, max_pending=32, partial_workers=2, partial_backend=None):
+        self.backend = backend
+        self.partial_backend = partial_backend  # Used for partials when backend produces none
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="stt")
+        self._slots = threading.BoundedSemaphore(max_pending)
+        # Partials get their own workers, so finals are never behind them. Each transcript has at
+        # most one partial job at a time, so every session keeps getting partials under load
+        self._partial_executor = ThreadPoolExecutor(max_workers=partial_workers, thread_name_prefix="stt-partial")
+        self._lock = threading.Lock()
+        self._latencies = []
+        self.completed = 0
+        self.failed = 0
+        self.partials = 0
+        self.partials_skipped = 0
+
+    @property
+    def partial_source(self):
+        """Backend that produces partial hypotheses, or None if no backend can"""
+        if self.backend.partial_interval is not None:
+            return self.backend
+        # partial_backend may be None, or a lazy stand-in for a backend that failed to load
+        if getattr(self.partial_backend, 'partial_interval', None) is not None:
+            return self.partial_backend
+        return None
+
+    def _run(self, audio, submitted):
+        try:
+            text = self.backend.transcribe(audio)
+            latency = time.time() - submitted
+            with self._lock:
+                self.completed += 1
+                self._latencies.append(latency)
+                del self._latencies[:-500]  # Keep recent samples only
+            print(f"⏱️ Recognized in {latency * 1000:.0f} ms ({self.backend.name})")
+            return text
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            raise
+        finally:
+            self._slots.release()
+
+    def submit(self, audio):
+        """Queue an utterance for recognition. Blocks while max_pending jobs are waiting"""
+        self._slots.acquire()
+        return self._executor.submit(self._run, audio, time.time())
+
+    def submit_partial(self, job, *args):
+        """Run a partial hypothesis job on the partial workers"""
+        with self._lock:
+            self.partials += 1
+        return self._partial_executor.submit(job, *args)
+
+    def partial_skipped(self):
+        with self._lock:
+            self.partials_skipped += 1
+
+    def transcribe(self, audio, timeout=None):
+        """Recognize an utterance on the pool and wait for the text"""
+        return self.submit(audio).result(timeout)
+
+    def stream(self, on_partial):
+        """Start a StreamingTranscript that reports partial text through on_partial(text)"""
+        return StreamingTranscript(self, on_partial)
+
+    def stats(self):
+        with self._lock:
+            latencies = sorted(self._latencies)
+            stats = {'backend': backend_name(self.backend), 'partial_backend': backend_name(self.partial_backend),
+                     'completed': self.completed, 'failed': self.failed,
+                     'partials': self.partials, 'partials_skipped': self.partials_skipped}
+        if not latencies:
+            return stats
+        return {
+            **stats,
+            'latency_avg_ms': round(sum(latencies) / len(latencies) * 1000, 1),
+            'latency_p50_ms': round(latencies[len(latencies) // 2] * 1000, 1),
+            'latency_p95_ms': round(latencies[int(len(latencies) * 0.95)] * 1000, 1)
+        }
+
+
+class StreamingTranscript:
+    """
+    Partial hypotheses for one utterance while it is still being spoken.
+    A streaming backend gets one decoder for the utterance and is fed only the
+    samples it has not seen yet, so a partial costs the same however long the
+    answer is. Other backends decode the latest backend.partial_window_s seconds.
+    At most one partial job is in flight and jobs start at most every
+    backend.partial_interval seconds. Audio offered meanwhile is queued for a
+    streaming decoder and otherwise skipped, and partials that finish after the
+    final text are dropped. Partials come from service.partial_source; without
+    one there are none.
+    """
+
+    def __init__(self, service, on_partial):
+        self.service = service
+        self.on_partial = on_partial
+        self.partials = 0
+        self.complete = False  # Whether the latest partial covers everything said so far
+        self._lock = threading.Lock()
+        self.backend = service.partial_source
+        self.interval = self.backend.partial_interval if self.backend is not None else None
+        self._inflight = None
+        self._last_submit = 0.0
+        self._done = False
+        self._decoder = None
+        self._utterance = None  # utterance_start of the audio the decoder is fed
+        self._fed_until = 0  # Absolute sample position the decoder has been given audio up to
+        self._chunks = []  # Raw audio waiting for the decoder
+
+    def update(self, audio):
+        """
+        Offer the utterance so far (sr.AudioData) for a partial hypothesis. Audio from
+        StreamingSpeechCapture has absolute .start and .utterance_start sample positions;
+        without them it is taken to be the whole utterance from its start.
+        """
+        if self.interval is None:
+            return
+        with self._lock:
+            if self._done:
+                return
+            if self.backend.streaming:
+                self._queue(audio)
+            if (self._inflight is not None and not self._inflight.done()) or \
+                    time.time() - self._last_submit < self.interval:
+                self.service.partial_skipped()
+                return
+            if self.backend.streaming:
+                future = self.service.submit_partial(self._decode_queued)
+            else:
+                future = self.service.submit_partial(self._decode_window, *self._window(audio))
+            self._inflight = future
+            self._last_submit = time.time()
+        future.add_done_callback(self._deliver)
+
+    def _queue(self, audio):
+        # Caller holds self._lock
+        start = getattr(audio, 'start', 0)
+        utterance = getattr(audio, 'utterance_start', 0)
+        end = start + len(audio.frame_data) // audio.sample_width
+        if self._decoder is None or utterance != self._utterance:
+            self._decoder = self.backend.partial_decoder(audio.sample_rate, audio.sample_width)
+            self._utterance, self._fed_until, self._chunks = utterance, start, []
+        if end > self._fed_until:
+            self._chunks.append(audio.frame_data[max(self._fed_until - start, 0) * audio.sample_width:])
+            self._fed_until = end
+
+    def _decode_queued(self):
+        with self._lock:
+            decoder, raw, self._chunks = self._decoder, b"".join(self._chunks), []
+        return decoder.accept(raw), True
+
+    def _window(self, audio):
+        """The latest partial_window_s seconds of audio, and whether that is the whole utterance"""
+        keep = int(self.backend.partial_window_s * audio.sample_rate) * audio.sample_width
+        whole = getattr(audio, 'start', 0) <= getattr(audio, 'utterance_start', 0)
+        if len(audio.frame_data) <= keep:
+            return audio, whole
+        return sr.AudioData(audio.frame_data[-keep:], audio.sample_rate, audio.sample_width), False
+
+    def _decode_window(self, audio, whole):
+        return self.backend.partial(audio), whole
+
+    def _deliver(self, future):
+        if future.exception() is not None:
+            return  # Nothing recognizable yet
+        text, complete = future.result()
+        # Delivered under the lock, so no partial can arrive once finish() has returned
+        with self._lock:
+            if self._done or not text:
+                return
+            self.partials += 1
+            self.complete = complete
+            self.on_partial(text)
+
+    def finish(self, audio):
+        """Stop partials (waiting for one being delivered) and recognize the complete utterance"""
+        with self._lock:
+            self._done = True
+            self._decoder, self._chunks = None, []
+        return self.service.transcribe(audio)
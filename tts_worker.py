@@ -0,0 +1,304 @@
+"""
+Text-to-speech worker for the AI interviewer
+pyttsx3 used to be initialised, scanned for a voice and torn down for every
+prompt. One long-lived worker thread now owns the engine and resolves the
+voice once. Synthesized prompts are kept as WAV files on disk, keyed by text,
+voice preference and rate, so repeated prompts play straight from the cache.
+Prompts can be synthesized in the background ahead of time with prefetch().
+The cache is bounded in size and evicts the least recently played prompts.
+Speculative drafts, which are mostly never played, go to a small temporary
+folder instead.
+pyttsx3 hands out one engine per driver for the whole process, so synthesis
+is serialized on the worker thread. Playback is not: cached WAV files play on
+the thread that called speak(), so interviews speak at the same time.
+"""
+
+import atexit
+import hashlib
+import itertools
+import os
+import shutil
+import tempfile
+import threading
+import time
+import wave
+from collections import OrderedDict
+from contextlib import nullcontext
+from queue import PriorityQueue
+
+from lazy_models import lazy_import
+
+pyttsx3 = lazy_import('pyttsx3')
+
+TTS_CACHE_FOLDER = 'tts_cache'
+SPEAK_TIMEOUT = 120.0  # Longest wait for a prompt to be played
+MAX_CACHE_BYTES = 200 * 1024 * 1024
+MAX_DRAFTS = 32  # Speculative drafts kept in the temporary folder
+VOICES = ('zira', 'hazel', 'david')  # Preferred voices (Microsoft, more natural), best first
+
+# Request priorities - playback always goes before background synthesis
+PLAY = 0
+PREFETCH = 1
+
+
+class _SpeechRequest:
+    def __init__(self, text, live=False, draft=False, device=None):
+        self.text = text
+        self.live = live  # Speak through the engine instead of synthesizing a WAV file
+        self.draft = draft
+        self.device = device  # AudioDeviceArbiter to hold while speaking live
+        self.done = threading.Event()
+        self.ok = False
+        self.path = None  # Synthesized WAV file
+        self.cancelled = False  # The caller stopped waiting; skip it if it has not started
+
+
+class TTSWorker:
+    """Single thread that owns the pyttsx3 engine, with a disk cache of synthesized prompts"""
+
+    def __init__(self, cache_dir=TTS_CACHE_FOLDER, rate=170, volume=1.0, device=None,
+                 max_cache_bytes=MAX_CACHE_BYTES, max_drafts=MAX_DRAFTS, voices=VOICES):
+        self.cache_dir = cache_dir
+        self.max_cache_bytes = max_cache_bytes
+        self.max_drafts = max_drafts
+        self.rate = rate
+        self.volume = volume
+        self.device = device  # AudioDeviceArbiter held while playing, unless speak() is given one
+        self.voices = tuple(voices)  # Parts of voice names to look for, best first
+        self.voice = None  # Voice id the engine picked, once it is running
+        self._queue = PriorityQueue()
+        self._order = itertools.count()  # Keeps requests of the same priority in order
+        self._lock = threading.Lock()
+        self._thread = None
+        self._engine = None
+        self._pyaudio = None
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.evictions = 0
+        os.makedirs(cache_dir, exist_ok=True)
+        # Cached WAV path -> size, least recently used first (file times survive restarts)
+        entries = []
+        for name in os.listdir(cache_dir):
+            path = os.path.join(cache_dir, name)
+            if name.endswith('.part'):
+                # Left over from an interrupted synthesis. Recent ones may still be written by
+                # another process with the same cache, such as the app when a spawned worker imports it
+                if time.time() - os.path.getmtime(path) > SPEAK_TIMEOUT:
+                    os.remove(path)
+            elif name.endswith('.wav'):
+                entries.append((os.path.getmtime(path), path, os.path.getsize(path)))
+        self._cache = OrderedDict((path, size) for _, path, size in sorted(entries))
+        self._cache_bytes = sum(self._cache.values())
+        self.draft_dir = tempfile.mkdtemp(prefix='tts_drafts_')
+        self._drafts = OrderedDict()  # Draft WAV paths, oldest first
+        atexit.register(shutil.rmtree, self.draft_dir, True)
+
+    def _ensure_running(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._worker_loop, daemon=True)
+                self._thread.start()
+
+    def _submit(self, text, priority, draft=False, device=None, live=False):
+        self._ensure_running()
+        request = _SpeechRequest(text, live, draft, device)
+        self._queue.put((priority, next(self._order), request))
+        return request
+
+    @staticmethod
+    def _wait(request, deadline, timeout):
+        """The request once it is done, or None if the deadline passed first"""
+        if request.done.wait(max(0.0, deadline - time.monotonic())):
+            return request
+        request.cancelled = True
+        print(f"⚠️ Gave up waiting for speech after {timeout:.0f}s")
+        return None
+
+    def speak(self, text, timeout=SPEAK_TIMEOUT, device=None):
+        """
+        Play text through the speakers and wait until playback ends. Returns True on success.
+        device is the AudioDeviceArbiter of the caller's interview (default: the worker's own).
+        The audio plays on the calling thread; only synthesis waits for the worker.
+        """
+        device = device or self.device
+        deadline = time.monotonic() + timeout
+        path = self._cached(text)
+        with self._lock:
+            if path:
+                self.cache_hits += 1
+            else:
+                self.cache_misses += 1
+        if path is None:
+            request = self._wait(self._submit(text, PLAY), deadline, timeout)
+            if request is None:
+                return False
+            path = request.path
+        if path is not None:
+            self._touch(path)
+            try:
+                self._play_wav(path, device)
+                return True
+            except TimeoutError as e:
+                print(f"⚠️ TTS error: {e}")  # The audio device is busy; speaking live would wait for it again
+                return False
+            except Exception as e:
+                print(f"⚠️ Cached playback failed ({e}) - speaking directly")
+
+        # Drivers that can't write files, or no audio output library - the engine speaks live
+        request = self._wait(self._submit(text, PLAY, device=device, live=True), deadline, timeout)
+        return request is not None and request.ok
+
+    def prefetch(self, texts):
+        """
+        Synthesize prompts into the cache in the background so they play immediately later.
+        Returns the queued requests; each one's done event is set once it is synthesized.
+        """
+        return [self._submit(text, PREFETCH) for text in dict.fromkeys(texts)
+                if text and self._cached(text) is None]
+
+    def prefetch_draft(self, texts):
+        """Like prefetch() for speculative text that may never be played: kept in the temporary folder"""
+        return [self._submit(text, PREFETCH, draft=True) for text in dict.fromkeys(texts)
+                if text and self._cached(text) is None]
+
+    def _key(self, text):
+        # The voice preference is known before the engine has started, unlike the voice it picks
+        voices = ','.join(self.voices)
+        return hashlib.sha1(f"{voices}|{self.rate}|{text}".encode('utf-8')).hexdigest() + '.wav'
+
+    def cache_path(self, text):
+        return os.path.join(self.cache_dir, self._key(text))
+
+    def draft_path(self, text):
+        return os.path.join(self.draft_dir, self._key(text))
+
+    def _cached(self, text):
+        """Path of the synthesized text in the cache or the drafts, or None"""
+        for path in (self.cache_path(text), self.draft_path(text)):
+            if os.path.exists(path):
+                return path
+        return None
+
+    def _remember(self, path, draft):
+        """Record a new WAV file and evict the least recently used ones over the limits"""
+        with self._lock:
+            if draft:
+                self._drafts[path] = None
+                while len(self._drafts) > self.max_drafts:
+                    self._remove(self._drafts.popitem(last=False)[0])
+                return
+            size = os.path.getsize(path)
+            self._cache_bytes += size - self._cache.pop(path, 0)
+            self._cache[path] = size
+            while self._cache_bytes > self.max_cache_bytes and len(self._cache) > 1:
+                old_path, old_size = self._cache.popitem(last=False)
+                self._cache_bytes -= old_size
+                self.evictions += 1
+                self._remove(old_path)
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _touch(self, path):
+        """Mark a cached WAV as just used"""
+        with self._lock:
+            if path in self._cache:
+                self._cache.move_to_end(path)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def _init_engine(self):
+        """Create the engine and pick the most natural voice - done once per worker"""
+        engine = pyttsx3.init()
+        voices = engine.getProperty('voices')
+        selected_voice = None
+        for preferred in self.voices:
+            selected_voice = next((voice.id for voice in voices if preferred in voice.name.lower()), None)
+            if selected_voice:
+                break
+        if selected_voice is None and len(voices) > 1:
+            selected_voice = voices[1].id
+        if selected_voice:
+            engine.setProperty('voice', selected_voice)
+        engine.setProperty('rate', self.rate)
+        engine.setProperty('volume', self.volume)
+        self.voice = engine.getProperty('voice')
+        print(f"✅ TTS worker ready with voice: {self.voice}")
+        return engine
+
+    def _worker_loop(self):
+        try:
+            self._engine = self._init_engine()
+        except Exception as e:
+            print(f"⚠️ TTS engine initialization failed: {e}")
+        while True:
+            _, _, request = self._queue.get()
+            try:
+                if self._engine is None or request.cancelled:
+                    continue
+                if request.live:
+                    request.ok = self._say(request.text, request.device)
+                else:
+                    request.path = self._synthesize(request.text, request.draft)
+                    request.ok = request.path is not None
+            except Exception as e:
+                print(f"⚠️ TTS error: {e}")
+            finally:
+                request.done.set()
+
+    def _synthesize(self, text, draft=False):
+        """Render text to a cached (or draft) WAV file and return its path, or None if the driver can't"""
+        path = self._cached(text)
+        if path is not None:
+            return path
+        path = self.draft_path(text) if draft else self.cache_path(text)
+        temp_path = path + '.part'
+        self._engine.save_to_file(text, temp_path)
+        self._engine.runAndWait()
+        if not os.path.exists(temp_path) or os.path.getsize(temp_path) <= 44:  # Header only
+            return None
+        os.replace(temp_path, path)
+        self._remember(path, draft)
+        return path
+
+    def _say(self, text, device=None):
+        with device.speaking() if device else nullcontext():
+            self._engine.say(text)
+            self._engine.runAndWait()
+        return True
+
+    def _play_wav(self, path, device=None):
+        import pyaudio
+        with self._lock:
+            if self._pyaudio is None:
+                self._pyaudio = pyaudio.PyAudio()
+        with wave.open(path, 'rb') as wav, device.speaking() if device else nullcontext():
+            stream = self._pyaudio.open(format=self._pyaudio.get_format_from_width(wav.getsampwidth()),
+                                        channels=wav.getnchannels(), rate=wav.getframerate(), output=True)
+            try:
+                data = wav.readframes(1024)
+                while data:
+                    stream.write(data)
+                    data = wav.readframes(1024)
+            finally:
+                stream.stop_stream()
+                stream.close()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'voice': self.voice,
+                'cache_hits': self.cache_hits,
+                'cache_misses': self.cache_misses,
+                'cached_prompts': len(self._cache),
+                'cache_mb': round(self._cache_bytes / 1024 / 1024, 1),
+                'evictions': self.evictions,
+                'drafts': len(self._drafts),
+                'queued': self._queue.qsize()
+            }
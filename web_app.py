@@ -4,43 +4,64 @@ Flask backend with real-time video processing and speech analysis
 """
 
 from flask import Flask, render_template, Response, jsonify, request, send_file, session
-import cv2
 import numpy as np
-import speech_recognition as sr
-from textblob import TextBlob
 import threading
 import time
 import json
 import base64
-from datetime import datetime
+from datetime import datetime, timedelta
 import os
 from io import BytesIO
 import wave
 from werkzeug.utils import secure_filename
-import pyttsx3
-from queue import Queue
-import google.generativeai as genai
 import random
-import PyPDF2
-from docx import Document
+import uuid
+import hashlib
+from sessions import SessionRegistry
+from recording import RECORDINGS_FOLDER, SAVE_TIMEOUT
+from camera_stream import CameraStream, EncodedFrameCache, StreamClient, StreamRegistry
+from overlays import compositor
+from speech_capture import StreamingSpeechCapture
+from audio_device import HandoffStats
+from tts_worker import TTSWorker
+from speculation import SpeculativeReply
+from concurrent.futures import ThreadPoolExecutor
+from llm_client import LLMClient, FakeModel
+from resume_jobs import ResumeJobRunner
+from resume_cache import ResumeCache, sha256_of_file
+from pdf_extract import EXTRACTOR_VERSION, extract_pdf_text
+from skill_index import SkillTaxonomy
+from soft_skills import SoftSkillScorer
+from sentiment_service import SentimentService, create_sentiment_backend
+from report_store import ReportStore, PRACTICE, INTERVIEW
+from transcription import TranscriptionService, create_backend
+from lazy_models import models, lazy, lazy_import
+
+# Heavy libraries load on first use (or during warm-up), not when the app starts
+cv2 = lazy_import('cv2')
+sr = lazy_import('speech_recognition')
+genai = lazy_import('google.generativeai')
+docx = lazy_import('docx')
 
 app = Flask(__name__)
 app.secret_key = 'your-secret-key-here-change-in-production'
 app.config['UPLOAD_FOLDER'] = 'uploads/resumes'
 app.config['MAX_CONTENT_LENGTH'] = 10 * 1024 * 1024  # 10MB max file size
+# Score history is kept per browser: it is keyed by the session id, so the session cookie must outlive the browser
+app.config['PERMANENT_SESSION_LIFETIME'] = timedelta(days=365)
 ALLOWED_EXTENSIONS = {'pdf', 'doc', 'docx'}
 
-# Global variables - English Practice
-camera = None
-is_recording = False
-recording_start_time = None
-all_transcripts = []
-all_scores = []
-video_frames = []
-audio_frames = []
-current_feedback = {}
-scroll_text = ""
-scroll_speed = 3
+# Shared camera - one capture thread feeds every /video_feed client
+camera_stream = CameraStream(0)
+frame_cache = EncodedFrameCache()
+stream_clients = StreamRegistry()
+DEFAULT_JPEG_QUALITY = 95  # OpenCV's default
+
+# Per-browser-session practice and interview state
+sessions = SessionRegistry()
+
+# Practice and interview reports: written in the background, indexed in reports/index.sqlite3
+reports = ReportStore()
 
 # Sample prompts for reading
 SAMPLE_TEXTS = [
@@ -53,50 +74,65 @@ SAMPLE_TEXTS = [
     "Collaboration and teamwork are essential ingredients for achieving extraordinary results"
 ]
 
-# Speech recognition
-recognizer = sr.Recognizer()
-speech_thread = None
-audio_thread = None
+# Speech-to-text backend shared by all sessions: google (online), vosk or whisper (offline), fake (tests)
+SPEECH_BACKEND = os.environ.get('SPEECH_BACKEND', 'google')
+# Live partial transcripts need a local backend (vosk, whisper or fake). Google produces none, so
+# this one produces them while Google produces the final text. Vosk needs its model unpacked in
+# models/vosk-model-small-en-us-0.15 - nothing is downloaded, and without it there are no partials.
+# Set it to '' to turn partials off.
+SPEECH_PARTIAL_BACKEND = os.environ.get('SPEECH_PARTIAL_BACKEND', 'vosk')
+transcriber = TranscriptionService(
+    lazy('speech backend', lambda: create_backend(SPEECH_BACKEND)), max_workers=4,
+    partial_backend=lazy('partial speech backend', lambda: create_backend(SPEECH_PARTIAL_BACKEND, fallback=False))
+    if SPEECH_PARTIAL_BACKEND else None)
 
 # Configure Google Gemini AI for dynamic conversations (Optional - works with fallback)
 GEMINI_API_KEY = "YOUR_API_KEY_HERE"  # Get free key from: https://makersuite.google.com/app/apikey
-try:
-    if GEMINI_API_KEY != "YOUR_API_KEY_HERE":
-        genai.configure(api_key=GEMINI_API_KEY)
-        ai_model = genai.GenerativeModel('gemini-pro')
-        print("✅ Google Gemini AI initialized")
-    else:
-        ai_model = None
-        print("ℹ️ Using fallback conversation mode (no API key)")
-except Exception as e:
-    print(f"⚠️ Could not initialize Gemini AI: {e}")
+LLM_BACKEND = os.environ.get('LLM_BACKEND', 'gemini')  # gemini, or fake for offline testing
+
+def load_gemini_model():
+    """Configure Gemini - runs on the first AI call or during warm-up"""
+    genai.configure(api_key=GEMINI_API_KEY)
+    model = genai.GenerativeModel('gemini-pro')
+    print("✅ Google Gemini AI initialized")
+    return model
+
+if LLM_BACKEND == 'fake':
+    ai_model = FakeModel()
+    print("ℹ️ Using fake AI model (offline testing)")
+elif GEMINI_API_KEY != "YOUR_API_KEY_HERE":
+    ai_model = lazy('gemini', load_gemini_model)  # If it cannot load, AI calls fail and use their fallbacks
+else:
     ai_model = None
+    print("ℹ️ Using fallback conversation mode (no API key)")
+
+# Every AI call goes through this client: bounded pool, timeouts, rate limit and response cache.
+# Failed or slow calls raise, and callers fall back to their keyword/template paths.
+llm = LLMClient(ai_model, max_workers=2, timeout=20.0, rate=1.0, burst=5)
 
 # Global variables - Interview Practice
-interview_active = False
-interview_questions = []
-current_question_index = 0
-interview_responses = []
-interview_messages = []
-interview_start_time = None
-interview_thread = None
-tts_engine = None
-ai_speaking = False
-user_listening = False
-message_queue = Queue()
-conversation_history = []  # Store entire conversation for context
+# One engine and prompt cache shared by every interview. pyttsx3 has one engine per process, so synthesis
+# is serialized; prompts play on each interview's own thread while it holds its own audio device
+tts = TTSWorker()
+handoffs = HandoffStats()  # Prompt-to-listening handoffs of every interview
+speculation_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="speculate")  # Drafts replies during answers
+
+def current_session_id():
+    """Get the id of the current browser session, assigning one on first use"""
+    if not session.permanent:
+        session.permanent = True  # Also upgrades cookies issued before history existed
+    if 'sid' not in session:
+        session['sid'] = uuid.uuid4().hex
+        sessions.prune()  # Drop idle sessions whenever a new one is created
+    return session['sid']
 
 # --- Resume Parsing Functions ---
 def extract_text_from_pdf(pdf_path):
-    """Extract text from PDF file"""
+    """Extract text from PDF file - only the first MAX_RESUME_CHARS characters are used"""
     try:
-        text = ""
-        with open(pdf_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
+        text = extract_pdf_text(pdf_path)
         print(f"✅ Extracted {len(text)} characters from PDF")
-        return text.strip()
+        return text
     except Exception as e:
         print(f"⚠️ Error extracting PDF: {e}")
         return ""
@@ -104,7 +140,7 @@ def extract_text_from_pdf(pdf_path):
 def extract_text_from_docx(docx_path):
     """Extract text from Word document"""
     try:
-        doc = Document(docx_path)
+        doc = docx.Document(docx_path)
         text = "\n".join([paragraph.text for paragraph in doc.paragraphs])
         print(f"✅ Extracted {len(text)} characters from DOCX")
         return text.strip()
@@ -123,15 +159,25 @@ def parse_resume(file_path):
         return ""
 
 # --- AI Interview Question Generation ---
+# Resume/answer topics, keywords and question banks (data/skills.json), compiled once
+skills = SkillTaxonomy()
+
 def generate_interview_questions_from_resume(resume_text):
     """Generate personalized interview questions from resume using AI"""
+    return generate_questions_with_source(resume_text)[0]
+
+def generate_questions_with_source(resume_text):
+    """
+    Interview questions for a resume and where they came from: 'ai', or 'keywords' /
+    'default' when there was no AI or it failed
+    """
     
     if not resume_text or len(resume_text) < 50:
         print("⚠️ Resume text too short, using default questions")
-        return generate_default_questions()
+        return generate_default_questions(), 'default'
     
     # Try to use AI to generate questions
-    if ai_model is not None:
+    if llm.available:
         try:
             prompt = f"""You are an experienced HR interviewer. Based on the following resume, generate exactly 6 interview questions that:
 1. Are specific to the candidate's experience and skills mentioned in their resume
@@ -145,50 +191,40 @@ Resume:
 
 Generate exactly 6 questions, one per line. Just the questions, no numbering or extra text."""
 
-            response = ai_model.generate_content(prompt)
-            questions = [q.strip() for q in response.text.strip().split('\n') if q.strip() and len(q.strip()) > 10]
+            # /start_interview waits for this, so don't let a slow call hold it up for long
+            text = llm.generate(prompt, timeout=10.0)
+            questions = [q.strip() for q in text.split('\n') if q.strip() and len(q.strip()) > 10]
             
             # Filter out any numbering
             questions = [q.lstrip('0123456789.-) ') for q in questions]
             
             if len(questions) >= 4:
                 print(f"✅ Generated {len(questions)} AI questions from resume")
-                return questions[:6]  # Return max 6 questions
+                return questions[:6], 'ai'  # Return max 6 questions
             else:
                 print("⚠️ AI generated too few questions, using enhanced default")
-                return generate_enhanced_questions_from_keywords(resume_text)
+                return generate_enhanced_questions_from_keywords(resume_text), 'keywords'
                 
         except Exception as e:
             print(f"⚠️ AI question generation error: {e}")
-            return generate_enhanced_questions_from_keywords(resume_text)
+            return generate_enhanced_questions_from_keywords(resume_text), 'keywords'
     else:
         # Fallback: Generate questions based on keywords
-        return generate_enhanced_questions_from_keywords(resume_text)
+        return generate_enhanced_questions_from_keywords(resume_text), 'keywords'
+
+def resume_keyword_hits(resume_text):
+    """Which resume topics appear in the resume"""
+    found = skills.resume.match(resume_text)
+    return {topic: topic in found for topic in skills.resume.topics}
 
 def generate_enhanced_questions_from_keywords(resume_text):
     """Generate questions based on keywords found in resume"""
-    text_lower = resume_text.lower()
-    questions = []
-    
-    # Always start with introduction
-    questions.append("Thank you for joining today. Let's start - can you walk me through your professional background?")
-    
-    # Check for specific technologies/skills
-    if any(word in text_lower for word in ['python', 'java', 'javascript', 'c++', 'programming']):
-        questions.append("I see you have programming experience. Can you describe a challenging technical problem you solved and your approach?")
+    hits = resume_keyword_hits(resume_text)
     
-    if any(word in text_lower for word in ['ai', 'machine learning', 'deep learning', 'neural network']):
-        questions.append("You've worked with AI and machine learning. Can you tell me about a specific ML project and the impact it had?")
-    
-    if any(word in text_lower for word in ['team', 'lead', 'manage', 'collaboration']):
-        questions.append("Tell me about a time when you had to work with a difficult team member. How did you handle it?")
-    
-    if any(word in text_lower for word in ['project', 'developed', 'built', 'created']):
-        questions.append("Walk me through your most successful project from start to finish. What made it successful?")
-    
-    # Generic but important questions
-    questions.append("What motivates you in your professional life, and how do you handle setbacks?")
-    questions.append("Where do you see yourself in 3-5 years, and why is this role the right next step?")
+    # Introduction first, then one question per topic found, then the generic but important ones
+    questions = list(skills.resume_opening)
+    questions.extend(topic['question'] for name, topic in skills.resume_topics.items() if hits.get(name))
+    questions.extend(skills.resume_closing)
     
     return questions[:6]
 
@@ -209,86 +245,24 @@ def generate_interview_questions(resume_text=""):
         return generate_interview_questions_from_resume(resume_text)
     return generate_default_questions()
 
-def init_tts_engine():
-    """Initialize text-to-speech engine with more human-like voice"""
-    global tts_engine
-    if tts_engine is None:
-        try:
-            tts_engine = pyttsx3.init()
-            
-            # Get available voices
-            voices = tts_engine.getProperty('voices')
-            
-            # Try to find a better quality voice (prefer female, English)
-            selected_voice = None
-            for voice in voices:
-                voice_name = voice.name.lower()
-                # Prefer Microsoft voices (better quality)
-                if 'zira' in voice_name or 'hazel' in voice_name:  # Female voices
-                    selected_voice = voice.id
-                    break
-                elif 'david' in voice_name:  # Male voice as backup
-                    selected_voice = voice.id
-            
-            if selected_voice:
-                tts_engine.setProperty('voice', selected_voice)
-            elif len(voices) > 1:
-                tts_engine.setProperty('voice', voices[1].id)
-            
-            # Optimize for more natural speech
-            tts_engine.setProperty('rate', 170)  # Slightly faster, more natural
-            tts_engine.setProperty('volume', 1.0)  # Full volume
-            
-            print(f"✅ TTS initialized with voice: {tts_engine.getProperty('voice')}")
-        except Exception as e:
-            print(f"⚠️ TTS engine initialization failed: {e}")
-            tts_engine = None
-    return tts_engine
-
-def speak_text_sync(text):
-    """Speak text synchronously (blocking) - Creates fresh engine each time to avoid blocking"""
-    global ai_speaking
-    import time
-    
+def speak_text_sync(text, interview=None):
+    """
+    Speak text synchronously (blocking) on the shared TTS worker.
+    Cached prompts play immediately; the worker holds the audio device while playing.
+    """
     try:
-        ai_speaking = True
+        if interview is not None:
+            interview.ai_speaking = True
         print(f"🗣️ 🔊 AI SPEAKING OUT LOUD: {text[:80]}...")
         print(f"🔊 FULL TEXT: {text}")
         print("🎤 >>> CHECK YOUR SPEAKERS - VOICE SHOULD BE PLAYING NOW <<<")
         
-        # Create a fresh engine instance for each speak call (prevents blocking issues)
-        engine = pyttsx3.init()
-        
-        # Set voice properties
-        voices = engine.getProperty('voices')
-        if len(voices) > 1:
-            # Try to use a better voice
-            for voice in voices:
-                if 'david' in voice.name.lower() or 'zira' in voice.name.lower():
-                    engine.setProperty('voice', voice.id)
-                    break
-        
-        engine.setProperty('rate', 170)  # Speech rate
-        engine.setProperty('volume', 1.0)  # Maximum volume
+        if not tts.speak(text, device=interview.audio_device if interview is not None else None):
+            raise RuntimeError("TTS worker could not speak")
         
-        # Speak and wait
-        engine.say(text)
-        engine.runAndWait()
-        
-        # CRITICAL: Add delay after speaking to prevent audio cutoff
-        time.sleep(0.3)  # 300ms delay to ensure audio completes
-        
-        # Clean up
-        try:
-            engine.stop()
-            del engine  # Force garbage collection
-        except Exception:
-            pass
-        
-        # Additional small delay before next operation
-        time.sleep(0.2)
-        
-        ai_speaking = False
+        if interview is not None:
+            interview.prompt_ended()
+            interview.ai_speaking = False
         print("✅ ✅ ✅ FINISHED SPEAKING - DID YOU HEAR IT? ✅ ✅ ✅")
         print("-" * 80)
         return True
@@ -297,7 +271,9 @@ def speak_text_sync(text):
         print(f"⚠️ TTS error: {e}")
         import traceback
         traceback.print_exc()
-        ai_speaking = False
+        if interview is not None:
+            interview.prompt_ended()
+            interview.ai_speaking = False
         return False
 
 def get_follow_up_response(_user_answer):
@@ -319,84 +295,17 @@ def generate_ai_response(user_answer, conversation_context):
     Generate dynamic AI response based on user's answer using Gemini AI
     This creates natural, contextual follow-up questions or comments
     """
-    global ai_model
-    
-    # Enhanced fallback system with pattern matching
-    answer_lower = user_answer.lower()
-    
-    # Analyze the answer for keywords and generate appropriate follow-ups
+    # Enhanced fallback system - follow-ups for every topic the answer touches, found in one scan
     follow_up_questions = []
-    
-    # Career/job related
-    if any(word in answer_lower for word in ['job', 'work', 'career', 'company', 'position']):
-        follow_up_questions.extend([
-            "That's great to hear. What specific skills do you think make you a strong fit for this role?",
-            "Interesting. Can you tell me about a project or achievement you're particularly proud of in your career?",
-            "I see. What are you looking for in your next career opportunity?"
-        ])
-    
-    # Skills/technical related
-    if any(word in answer_lower for word in ['skill', 'learn', 'experience', 'technology', 'develop']):
-        follow_up_questions.extend([
-            "That's impressive. How do you stay updated with new developments in your field?",
-            "Great. Can you share an example where you applied those skills to solve a real problem?",
-            "Excellent. What new skills are you currently working on developing?"
-        ])
-    
-    # Team/collaboration related
-    if any(word in answer_lower for word in ['team', 'collaborate', 'together', 'group', 'people']):
-        follow_up_questions.extend([
-            "Teamwork is important. How do you handle conflicts or disagreements within a team?",
-            "That's good. Can you describe your ideal team environment?",
-            "I appreciate that. What role do you typically take in team projects?"
-        ])
-    
-    # Challenge/problem solving
-    if any(word in answer_lower for word in ['challenge', 'problem', 'difficult', 'obstacle', 'issue']):
-        follow_up_questions.extend([
-            "That sounds challenging. Walk me through your approach to solving complex problems.",
-            "Interesting. What did you learn from that experience?",
-            "Thank you for sharing. How do you handle pressure or tight deadlines?"
-        ])
-    
-    # Leadership/management
-    if any(word in answer_lower for word in ['lead', 'manage', 'mentor', 'guide', 'responsibility']):
-        follow_up_questions.extend([
-            "Leadership is key. What's your management or leadership style?",
-            "That's valuable. How do you motivate and inspire your team members?",
-            "Good to know. Can you share an example of when you had to make a tough decision?"
-        ])
-    
-    # Motivation/goals
-    if any(word in answer_lower for word in ['motivate', 'goal', 'passion', 'drive', 'inspire']):
-        follow_up_questions.extend([
-            "That's inspiring. Where do you see yourself professionally in the next few years?",
-            "Excellent. What drives you to excel in your work every day?",
-            "I appreciate that. How do you measure success in your career?"
-        ])
-    
-    # AI/Technology specific (since resume mentions AI)
-    if any(word in answer_lower for word in ['ai', 'artificial', 'intelligence', 'machine learning', 'data']):
-        follow_up_questions.extend([
-            "AI is fascinating. What excites you most about working in this field?",
-            "That's cutting-edge. How do you think AI will transform the industry in the coming years?",
-            "Great insight. Can you describe a challenging AI project you've worked on?"
-        ])
+    for topic in skills.answers.match(user_answer):
+        follow_up_questions.extend(skills.answer_topics[topic]['follow_ups'])
     
     # Generic acknowledgments if no patterns match
     if not follow_up_questions:
-        follow_up_questions = [
-            "Thank you for sharing that. Can you tell me more about your professional background?",
-            "That's interesting. What would you say is your greatest professional strength?",
-            "I appreciate your answer. How would your colleagues describe working with you?",
-            "Good to know. What's a recent accomplishment you're proud of?",
-            "That makes sense. What kind of work environment helps you thrive?",
-            "Excellent. Can you walk me through your decision-making process?",
-            "I see. What feedback have you received that helped you grow professionally?"
-        ]
+        follow_up_questions = list(skills.generic_follow_ups)
     
     # Try Gemini AI if available
-    if ai_model is not None:
+    if llm.available:
         try:
             # Build conversation context
             context = "You are a professional HR interviewer conducting a job interview. "
@@ -415,9 +324,8 @@ def generate_ai_response(user_answer, conversation_context):
             context += "4. Don't repeat questions already asked\n\n"
             context += "Your response:"
             
-            # Generate AI response
-            response = ai_model.generate_content(context)
-            ai_response = response.text.strip()
+            # Generate AI response - the candidate is waiting, so give up quickly
+            ai_response = llm.generate(context, timeout=5.0)
             
             print(f"🤖 AI Generated Response: {ai_response[:100]}...")
             return ai_response
@@ -429,14 +337,36 @@ def generate_ai_response(user_answer, conversation_context):
     # Use intelligent fallback
     return random.choice(follow_up_questions)
 
-def generate_improvement_report(resume_text, interview_responses, conversation_history):
+def compose_acknowledgment(user_answer, conversation_context):
+    """
+    Short reply to an answer before moving on to the next question.
+    Contextual when Gemini is available, otherwise one of the fixed acknowledgments.
+    """
+    if llm.available:
+        try:
+            context = "You are a professional HR interviewer conducting a job interview.\n\n"
+            context += "Interview conversation so far:\n"
+            for msg in conversation_context[-4:]:
+                role = "Interviewer" if msg['type'] == 'ai' else "Candidate"
+                context += f"{role}: {msg['content']}\n"
+            context += f"\nCandidate's answer so far: {user_answer}\n\n"
+            context += "Acknowledge the answer in one short, friendly sentence. Do not ask a question.\n\n"
+            context += "Your response:"
+            
+            return llm.generate(context, timeout=3.0) + " Let's continue to the next question."
+        except Exception as e:
+            print(f"⚠️ AI generation error: {e}")
+    
+    return random.choice(ACKNOWLEDGMENTS)
+
+def generate_interview_improvement_report(resume_text, interview_responses, conversation_history):
     """Generate a comprehensive improvement report based on interview performance"""
     
     print("📊 Generating improvement report...")
     
     # (user answers previously collected here are not used in this function)
     
-    if ai_model is not None:
+    if llm.available:
         try:
             prompt = f"""You are an expert career coach and interview trainer. Analyze the following interview performance and provide a comprehensive improvement report.
 
@@ -478,8 +408,7 @@ Generate a detailed improvement report with the following sections:
 
 Keep the tone constructive, encouraging, and actionable. Be specific with examples."""
 
-            response = ai_model.generate_content(prompt)
-            report = response.text.strip()
+            report = llm.generate(prompt, timeout=60.0)
             print("✅ AI improvement report generated")
             return report
             
@@ -574,203 +503,192 @@ Good luck with your job search! Keep practicing and refining your approach.
     
     return report
 
-def interview_conversation_thread():
+# --- Interviewer prompts ---
+# Fixed lines are module constants so the TTS worker can synthesize them ahead of time
+GREETING = "Hello and welcome! I've reviewed your resume and prepared some questions for you. Let's begin!"
+STILL_LISTENING_PROMPT = "I'm still here listening. Please take your time and answer when ready."
+MOVE_ON_PROMPT = "Let's move on to the next question."
+REPEAT_PROMPT = "I'm sorry, I didn't quite catch that. Could you please repeat your answer?"
+SKIP_PROMPT = "Let's move to the next question."
+RECOGNITION_ERROR_PROMPT = "I'm having technical difficulties with speech recognition. Let's try the next question."
+ELABORATE_PROMPT = "I'd love to hear more details. Could you elaborate on your answer?"
+CLOSING = "Thank you so much for your time! You've provided some great answers. Let me prepare your personalized improvement report now."
+REPORT_READY_PROMPT = "Your improvement report is ready! You can view and download it now."
+ERROR_PROMPT = "I encountered an issue. Let's try to continue."
+ACKNOWLEDGMENTS = [opening + "Let's continue to the next question." for opening in (
+    "Great answer! ",
+    "Thank you for sharing that. ",
+    "That's very helpful. ",
+    "Excellent response. ",
+    "I appreciate that insight. "
+)]
+
+def interview_prompts(questions):
+    """Every line the interviewer may speak, in roughly the order it is needed"""
+    return ([GREETING] + list(questions) + ACKNOWLEDGMENTS +
+            [STILL_LISTENING_PROMPT, REPEAT_PROMPT, ELABORATE_PROMPT, MOVE_ON_PROMPT, SKIP_PROMPT,
+             CLOSING, REPORT_READY_PROMPT, RECOGNITION_ERROR_PROMPT, ERROR_PROMPT])
+
+def interview_conversation_thread(interview):
     """
     Conduct structured interview with pre-generated questions from resume.
     CRITICAL PATTERN: SPEAK → Close Audio → LISTEN → Close Mic → Repeat
-    This ensures TTS and microphone never compete for audio device.
+    The audio device arbiter ensures TTS and microphone never compete for the
+    audio device, and hands it over as soon as the other side releases it.
     """
-    global interview_active, current_question_index, ai_speaking, user_listening
-    global interview_questions, interview_responses, interview_messages, conversation_history
+    questions = interview.questions
     
     print("🎬 Starting structured interview with resume-based questions")
-    print(f"📋 Total questions to ask: {len(interview_questions)}")
-    
-    # Initialize recognizer
-    recognizer = sr.Recognizer()
-    recognizer.energy_threshold = 300
-    recognizer.dynamic_energy_threshold = True
+    print(f"📋 Total questions to ask: {len(questions)}")
     
     # Speak initial greeting (OUTSIDE any mic context)
-    greeting = "Hello and welcome! I've reviewed your resume and prepared some questions for you. Let's begin!"
+    greeting = GREETING
     
-    interview_messages.append({
-        'type': 'ai',
-        'content': greeting,
-        'timestamp': time.time()
-    })
-    conversation_history.append({
-        'type': 'ai',
-        'content': greeting,
-        'timestamp': time.time()
-    })
-    message_queue.put({'type': 'ai', 'content': greeting})
+    interview.post_message('ai', greeting)
     
     print(f"🤖 AI: {greeting}")
-    speak_text_sync(greeting)
-    time.sleep(3.0)  # Longer pause after greeting to ensure audio device is released
+    speak_text_sync(greeting, interview)
     
-    current_question_index = 0
+    interview.current_question_index = 0
     retry_count = 0
     max_retries = 2
     
     # ========================================
     # MAIN INTERVIEW LOOP
     # ========================================
-    while interview_active and current_question_index < len(interview_questions):
+    while interview.active and interview.current_question_index < len(questions):
         try:
-            question = interview_questions[current_question_index]
+            question = questions[interview.current_question_index]
             print(f"\n{'='*80}")
-            print(f"🎙️ Question {current_question_index + 1}/{len(interview_questions)}")
+            print(f"🎙️ Question {interview.current_question_index + 1}/{len(questions)}")
             print(f"{'='*80}")
             
             # ========================================
             # STEP 1: SPEAK THE QUESTION (Outside mic context)
             # ========================================
-            interview_messages.append({
-                'type': 'ai',
-                'content': question,
-                'timestamp': time.time()
-            })
-            conversation_history.append({
-                'type': 'ai',
-                'content': question,
-                'timestamp': time.time()
-            })
-            message_queue.put({'type': 'ai', 'content': question})
+            interview.post_message('ai', question)
             
             print(f"🤖 AI: {question}")
-            ai_speaking = True
-            speak_text_sync(question)
-            ai_speaking = False
+            speak_text_sync(question, interview)
             print("✅ Question spoken successfully!")
             
-            # CRITICAL: Wait for audio device to be fully released
-            time.sleep(3.0)
-            
             # ========================================
             # STEP 2: LISTEN FOR ANSWER (Inside mic context)
             # ========================================
             print("🎧 Listening for your answer...")
-            user_listening = True
+            interview.user_listening = True
             answer = None
             listen_success = False
             
+            # Prepare the next turn while the candidate answers: the next question's
+            # audio, and an acknowledgment drafted from the partial transcript
+            more_questions = interview.current_question_index + 1 < len(questions)
+            if more_questions:
+                tts.prefetch([questions[interview.current_question_index + 1]])
+            history = list(interview.conversation_history)
+            speculative = SpeculativeReply(speculation_pool,
+                                           lambda text: compose_acknowledgment(text, history),
+                                           prefetch=tts.prefetch_draft)
+            
+            def on_partial(text):
+                interview.set_partial(text)
+                # A windowed partial only has the end of a long answer - nothing to draft a reply from
+                if more_questions and stream.complete:
+                    speculative.update(text)
+            
+            # Partial hypotheses are shown live while the candidate is still talking
+            interview.set_partial("")
+            stream = transcriber.stream(on_partial=on_partial)
+            
             try:
-                with sr.Microphone() as source:
-                    print("🎤 Adjusting for ambient noise...")
-                    recognizer.adjust_for_ambient_noise(source, duration=1)
+                # The capture thread opens the microphone once TTS has released the audio device
+                with StreamingSpeechCapture(on_partial=stream.update, hangover_ms=800,
+                                            max_utterance_s=120, device=interview.audio_device) as capture:
+                    if capture.ready.wait(10.0) and capture.ready_at and interview.last_prompt_end:
+                        handoff = capture.ready_at - interview.last_prompt_end
+                        interview.add_handoff(handoff)
+                        handoffs.record(handoff)
+                        print(f"⏱️ Listening {handoff * 1000:.0f} ms after the question ended")
                     print("🎤 Microphone ready - Please speak now!")
                     
-                    try:
-                        audio = recognizer.listen(source, timeout=60, phrase_time_limit=120)
-                        user_listening = False
-                        print("🎤 Audio captured, processing...")
-                        
-                        if not interview_active:
-                            break
-                        
-                        # Recognize speech using Google
-                        answer = recognizer.recognize_google(audio)
-                        listen_success = True
-                        print(f"👤 User said: {answer}")
-                        
-                    except sr.WaitTimeoutError:
-                        user_listening = False
-                        print("⚠️ Timeout - No speech detected")
-                        
-                        if retry_count < max_retries:
-                            retry_count += 1
-                            # Mic context closes here automatically
-                            time.sleep(1.0)
-                            
-                            prompt = "I'm still here listening. Please take your time and answer when ready."
-                            print(f"🤖 AI: {prompt}")
-                            
-                            interview_messages.append({
-                                'type': 'ai',
-                                'content': prompt,
-                                'timestamp': time.time()
-                            })
-                            message_queue.put({'type': 'ai', 'content': prompt})
-                            
-                            speak_text_sync(prompt)
-                            time.sleep(3.0)
-                            continue  # Retry same question
-                        else:
-                            # Max retries reached, skip question
-                            retry_count = 0
-                            current_question_index += 1
-                            
-                            time.sleep(1.0)
-                            skip_msg = "Let's move on to the next question."
-                            print(f"🤖 AI: {skip_msg}")
-                            
-                            interview_messages.append({
-                                'type': 'ai',
-                                'content': skip_msg,
-                                'timestamp': time.time()
-                            })
-                            message_queue.put({'type': 'ai', 'content': skip_msg})
-                            
-                            speak_text_sync(skip_msg)
-                            time.sleep(3.0)
-                            continue
+                    audio = capture.listen(timeout=60, should_stop=lambda: not interview.active)
+                    answer_end = time.time()
+                    interview.user_listening = False
+                    print("🎤 Audio captured, processing...")
+                    
+                    if audio is None or not interview.active:
+                        break
+                
+                # Microphone is now closed - safe to speak. The prompts below must stay
+                # outside the capture block: TTS cannot get the device while it is open.
+                
+                # Recognize the full answer on the shared transcription pool
+                answer = stream.finish(audio)
+                answer_prosody = audio.prosody
+                listen_success = True
+                print(f"👤 User said: {answer}")
+                
+            except sr.WaitTimeoutError:
+                interview.user_listening = False
+                print("⚠️ Timeout - No speech detected")
+                
+                if retry_count < max_retries:
+                    retry_count += 1
+                    prompt = STILL_LISTENING_PROMPT
+                    print(f"🤖 AI: {prompt}")
+                    
+                    interview.post_message('ai', prompt, history=False)
+                    
+                    speak_text_sync(prompt, interview)
+                    continue  # Retry same question
+                else:
+                    # Max retries reached, skip question
+                    retry_count = 0
+                    interview.current_question_index += 1
+                    
+                    skip_msg = MOVE_ON_PROMPT
+                    print(f"🤖 AI: {skip_msg}")
+                    
+                    interview.post_message('ai', skip_msg, history=False)
+                    
+                    speak_text_sync(skip_msg, interview)
+                    continue
+            
+            except sr.UnknownValueError:
+                interview.user_listening = False
+                print("⚠️ Could not understand audio")
+                
+                if retry_count < max_retries:
+                    retry_count += 1
+                    retry_msg = REPEAT_PROMPT
+                    print(f"🤖 AI: {retry_msg}")
                     
-                    except sr.UnknownValueError:
-                        user_listening = False
-                        print("⚠️ Could not understand audio")
-                        
-                        if retry_count < max_retries:
-                            retry_count += 1
-                            time.sleep(1.0)
-                            
-                            retry_msg = "I'm sorry, I didn't quite catch that. Could you please repeat your answer?"
-                            print(f"🤖 AI: {retry_msg}")
-                            
-                            interview_messages.append({
-                                'type': 'ai',
-                                'content': retry_msg,
-                                'timestamp': time.time()
-                            })
-                            message_queue.put({'type': 'ai', 'content': retry_msg})
-                            
-                            speak_text_sync(retry_msg)
-                            time.sleep(3.0)
-                            continue
-                        else:
-                            retry_count = 0
-                            current_question_index += 1
-                            
-                            time.sleep(1.0)
-                            skip_msg = "Let's move to the next question."
-                            speak_text_sync(skip_msg)
-                            time.sleep(3.0)
-                            continue
+                    interview.post_message('ai', retry_msg, history=False)
                     
-                    except sr.RequestError as e:
-                        user_listening = False
-                        print(f"⚠️ Speech recognition error: {e}")
-                        
-                        time.sleep(1.0)
-                        error_msg = "I'm having technical difficulties with speech recognition. Let's try the next question."
-                        
-                        interview_messages.append({
-                            'type': 'ai',
-                            'content': error_msg,
-                            'timestamp': time.time()
-                        })
-                        message_queue.put({'type': 'ai', 'content': error_msg})
-                        
-                        speak_text_sync(error_msg)
-                        time.sleep(3.0)
-                        current_question_index += 1
-                        continue
+                    speak_text_sync(retry_msg, interview)
+                    continue
+                else:
+                    retry_count = 0
+                    interview.current_question_index += 1
+                    
+                    skip_msg = SKIP_PROMPT
+                    speak_text_sync(skip_msg, interview)
+                    continue
+            
+            except sr.RequestError as e:
+                interview.user_listening = False
+                print(f"⚠️ Speech recognition error: {e}")
+                
+                error_msg = RECOGNITION_ERROR_PROMPT
+                
+                interview.post_message('ai', error_msg, history=False)
                 
-                # Microphone is now closed - safe to speak
+                speak_text_sync(error_msg, interview)
+                interview.current_question_index += 1
+                continue
                 
             except Exception as mic_error:
-                user_listening = False
+                interview.user_listening = False
                 print(f"⚠️ Microphone error: {mic_error}")
                 time.sleep(1.0)
                 continue
@@ -783,165 +701,87 @@ def interview_conversation_thread():
                 
                 # Check if answer is too short
                 if len(answer.strip()) < 5:
-                    time.sleep(1.0)
-                    prompt = "I'd love to hear more details. Could you elaborate on your answer?"
+                    prompt = ELABORATE_PROMPT
                     print(f"🤖 AI: {prompt}")
                     
-                    interview_messages.append({
-                        'type': 'ai',
-                        'content': prompt,
-                        'timestamp': time.time()
-                    })
-                    message_queue.put({'type': 'ai', 'content': prompt})
+                    interview.post_message('ai', prompt, history=False)
                     
-                    speak_text_sync(prompt)
-                    time.sleep(3.0)
+                    speak_text_sync(prompt, interview)
                     continue  # Ask same question again
                 
-                # Valid answer - store it
-                interview_messages.append({
-                    'type': 'user',
-                    'content': answer,
-                    'timestamp': time.time()
-                })
-                conversation_history.append({
-                    'type': 'user',
-                    'content': answer,
-                    'timestamp': time.time()
-                })
-                message_queue.put({'type': 'user', 'content': answer})
-                
-                interview_responses.append({
-                    'question': question,
-                    'question_number': current_question_index + 1,
-                    'answer': answer,
-                    'timestamp': time.time()
-                })
-                
-                # Move to next question
-                current_question_index += 1
+                # Valid answer - store it and move to next question
+                interview.post_message('user', answer)
+                interview.add_response(question, answer, answer_prosody)
                 
                 # ========================================
                 # STEP 4: ACKNOWLEDGE OR FINISH (Outside mic context)
                 # ========================================
-                time.sleep(1.0)  # Brief pause before speaking
-                
-                if current_question_index >= len(interview_questions):
+                if interview.current_question_index >= len(questions):
                     # All questions completed - generate report
-                    closing = "Thank you so much for your time! You've provided some great answers. Let me prepare your personalized improvement report now."
+                    closing = CLOSING
                     print(f"🤖 AI: {closing}")
                     
-                    interview_messages.append({
-                        'type': 'ai',
-                        'content': closing,
-                        'timestamp': time.time()
-                    })
-                    conversation_history.append({
-                        'type': 'ai',
-                        'content': closing,
-                        'timestamp': time.time()
-                    })
-                    message_queue.put({'type': 'ai', 'content': closing})
+                    interview.post_message('ai', closing)
                     
-                    speak_text_sync(closing)
-                    time.sleep(2.0)
+                    speak_text_sync(closing, interview)
                     
                     # Generate improvement report
                     print("📊 Generating improvement report...")
-                    resume_text = session.get('resume_text', '')
-                    improvement_report = generate_improvement_report(resume_text, interview_responses, conversation_history)
-                    session['improvement_report'] = improvement_report
+                    interview.improvement_report = generate_interview_improvement_report(
+                        interview.resume_text, interview.responses, interview.conversation_history)
                     
-                    report_msg = "Your improvement report is ready! You can view and download it now."
+                    report_msg = REPORT_READY_PROMPT
                     print(f"🤖 AI: {report_msg}")
                     
-                    interview_messages.append({
-                        'type': 'ai',
-                        'content': report_msg,
-                        'timestamp': time.time()
-                    })
-                    message_queue.put({'type': 'ai', 'content': report_msg})
+                    interview.post_message('ai', report_msg, history=False)
                     
-                    speak_text_sync(report_msg)
+                    speak_text_sync(report_msg, interview)
                     break
                     
                 else:
                     # More questions remaining - acknowledge and continue
-                    acknowledgments = [
-                        "Great answer! ",
-                        "Thank you for sharing that. ",
-                        "That's very helpful. ",
-                        "Excellent response. ",
-                        "I appreciate that insight. "
-                    ]
-                    ack = random.choice(acknowledgments) + "Let's continue to the next question."
+                    ack, speculated = speculative.reply(answer)
+                    print(f"⏱️ Reply ready {(time.time() - answer_end) * 1000:.0f} ms after the answer ended"
+                          f"{' (drafted while listening)' if speculated else ''}")
                     print(f"🤖 AI: {ack}")
                     
-                    interview_messages.append({
-                        'type': 'ai',
-                        'content': ack,
-                        'timestamp': time.time()
-                    })
-                    message_queue.put({'type': 'ai', 'content': ack})
+                    interview.post_message('ai', ack, history=False)
                     
-                    speak_text_sync(ack)
-                    time.sleep(3.0)
+                    speak_text_sync(ack, interview)
         
         except Exception as e:
             print(f"⚠️ Error in interview loop: {e}")
             import traceback
             traceback.print_exc()
             
-            user_listening = False
-            ai_speaking = False
+            interview.user_listening = False
+            interview.ai_speaking = False
             
-            if interview_active:
-                time.sleep(1.0)
-                error_msg = "I encountered an issue. Let's try to continue."
-                speak_text_sync(error_msg)
-                time.sleep(2.0)
-                current_question_index += 1
+            if interview.active:
+                error_msg = ERROR_PROMPT
+                speak_text_sync(error_msg, interview)
+                interview.current_question_index += 1
     
     # ========================================
     # CLEANUP
     # ========================================
     print("🏁 Interview completed!")
-    interview_active = False
-    user_listening = False
-    ai_speaking = False
+    interview.active = False
+    interview.user_listening = False
+    interview.ai_speaking = False
 
 # --- Text-based soft skill analysis ---
-def analyze_text_softskills(text):
-    """Analyze text for confidence, clarity, and fluency"""
-    feedback = {}
-
-    # Sentiment as confidence (0-30 points) using TextBlob
-    blob = TextBlob(text)
-    sentiment_polarity = blob.sentiment.polarity  # Returns -1 to 1
-    confidence_score = ((sentiment_polarity + 1) / 2) * 30
-    feedback["confidence"] = round(confidence_score, 1)
-
-    # Clarity (grammar)
-    try:
-        corrected = blob.correct()
-        errors = len(str(corrected).split()) - len(str(blob).split())
-        clarity_score = max(0, 30 - abs(errors) * 5)
-    except Exception as e:
-        print(f"⚠️ Error computing clarity score: {e}")
-        clarity_score = 25
-    feedback["clarity"] = round(clarity_score, 1)
-
-    # Fluency
-    sentences = text.split(".")
-    avg_sentence_length = sum(len(s.split()) for s in sentences) / max(1, len(sentences))
-    filler_words = sum(text.lower().count(w) for w in ["um", "uh", "like", "you know"])
-    fluency_score = min(max(avg_sentence_length * 3 - filler_words * 5, 0), 20)
-    feedback["fluency"] = round(fluency_score, 1)
-
-    # Overall score
-    feedback["score"] = round(feedback["confidence"] + feedback["clarity"] + feedback["fluency"], 1)
-    
-    return feedback
+# Confidence uses TextBlob polarity by default. With SENTIMENT_BACKEND=transformer (ONNX),
+# transformer-quantized or transformer-torch, answers from every session are micro-batched through the model
+SENTIMENT_BACKEND = os.environ.get('SENTIMENT_BACKEND', 'textblob')
+sentiment_service = None
+if SENTIMENT_BACKEND != 'textblob':
+    sentiment_service = SentimentService(lazy('sentiment backend', lambda: create_sentiment_backend(SENTIMENT_BACKEND)))
+scorer = SoftSkillScorer(sentiment=sentiment_service)  # Spelling model and correction cache shared by all sessions
+
+def analyze_text_softskills(text, prosody=None):
+    """Analyze text for confidence, clarity, and fluency (and delivery, given the audio's prosody)"""
+    return scorer.score(text, prosody)
 
 # --- Generate comprehensive improvement report ---
 def generate_improvement_report(transcripts, scores, duration):
@@ -968,15 +808,22 @@ def generate_improvement_report(transcripts, scores, duration):
     avg_confidence = sum(s["confidence"] for s in scores) / len(scores)
     avg_clarity = sum(s["clarity"] for s in scores) / len(scores)
     avg_fluency = sum(s["fluency"] for s in scores) / len(scores)
-    avg_total = sum(s["score"] for s in scores) / len(scores)
+    delivery_scores = [s["delivery"] for s in scores if "delivery" in s]
+    avg_delivery = sum(delivery_scores) / len(delivery_scores) if delivery_scores else None
+    max_score = 100 if delivery_scores else 80
+    # Segments without enough audio for a delivery score are scaled to the same maximum
+    avg_total = sum(s["score"] * max_score / s["max_score"] for s in scores) / len(scores)
+    total_words = sum(s["words"] for s in scores)  # Counted once when each segment was scored
     
     # Session summary
     report["session_summary"] = {
         "duration_seconds": round(duration, 1),
         "total_segments": len(transcripts),
-        "total_words": sum(len(t.split()) for t in transcripts),
-        "average_words_per_segment": round(sum(len(t.split()) for t in transcripts) / len(transcripts), 1) if transcripts else 0,
-        "overall_score": round(avg_total, 1)
+        "total_words": total_words,
+        "average_words_per_segment": round(total_words / len(scores), 1),
+        "filler_words": sum(s["fillers"] for s in scores),
+        "overall_score": round(avg_total, 1),
+        "max_score": max_score
     }
     
     # Performance metrics
@@ -986,6 +833,8 @@ def generate_improvement_report(transcripts, scores, duration):
         "fluency": round(avg_fluency, 1),
         "consistency": round(100 - (np.std([s["score"] for s in scores]) * 5), 1)
     }
+    if avg_delivery is not None:
+        report["performance_metrics"]["delivery"] = round(avg_delivery, 1)
     
     # Identify strengths
     if avg_confidence >= 20:
@@ -994,6 +843,8 @@ def generate_improvement_report(transcripts, scores, duration):
         report["strengths"].append("✅ Excellent grammar and clarity")
     if avg_fluency >= 15:
         report["strengths"].append("✅ Good fluency and sentence structure")
+    if avg_delivery is not None and avg_delivery >= 15:
+        report["strengths"].append("✅ Lively, well-paced vocal delivery")
     
     # Areas for improvement
     if avg_confidence < 20:
@@ -1002,6 +853,8 @@ def generate_improvement_report(transcripts, scores, duration):
         report["areas_for_improvement"].append("⚠️ Clarity - Focus on grammar and clear articulation")
     if avg_fluency < 15:
         report["areas_for_improvement"].append("⚠️ Fluency - Reduce filler words and improve sentence structure")
+    if avg_delivery is not None and avg_delivery < 15:
+        report["areas_for_improvement"].append("⚠️ Delivery - Vary your pitch, keep a steady pace and avoid long pauses")
     
     # Detailed recommendations
     if avg_confidence < 20:
@@ -1044,6 +897,19 @@ def generate_improvement_report(transcripts, scores, duration):
             ]
         })
     
+    if avg_delivery is not None and avg_delivery < 15:
+        report["detailed_recommendations"].append({
+            "skill": "Vocal Delivery",
+            "current_score": round(avg_delivery, 1),
+            "target_score": "15-20",
+            "suggestions": [
+                "Vary your pitch to stress key points instead of speaking in a monotone",
+                "Aim for a steady, conversational pace - not rushed, not dragging",
+                "Keep pauses short and deliberate rather than long hesitations",
+                "Record yourself and listen for flat or hurried passages"
+            ]
+        })
+    
     # Overall improvement tips
     report["general_tips"] = [
         "🎯 Practice regularly with this tool to track improvement",
@@ -1054,12 +920,13 @@ def generate_improvement_report(transcripts, scores, duration):
         "🔄 Iterate - each session should show measurable improvement"
     ]
     
-    # Score interpretation
-    if avg_total >= 60:
+    # Score interpretation (thresholds are out of 80)
+    relative_total = avg_total * 80 / max_score
+    if relative_total >= 60:
         report["interpretation"] = "Excellent! You demonstrate strong communication skills."
-    elif avg_total >= 40:
+    elif relative_total >= 40:
         report["interpretation"] = "Good performance with room for targeted improvement."
-    elif avg_total >= 20:
+    elif relative_total >= 20:
         report["interpretation"] = "Fair - Focus on the recommended areas to improve significantly."
     else:
         report["interpretation"] = "Needs improvement - Practice regularly and focus on fundamentals."
@@ -1067,42 +934,32 @@ def generate_improvement_report(transcripts, scores, duration):
     return report
 
 # --- Speech recognition thread ---
-def listen_speech():
-    """Continuously listen for speech when recording"""
-    global current_feedback, all_transcripts, all_scores, is_recording
+def listen_speech(practice):
+    """
+    Recognize and analyze speech while this session is recording.
+    The microphone is captured continuously on its own thread and split into
+    utterances by voice activity, so capture never waits for recognition.
+    """
+    capture = StreamingSpeechCapture()
+    capture.start()
+    print("🎤 Speech recognition initialized")
     
-    with sr.Microphone() as source:
-        print("🎤 Speech recognition initialized")
-        recognizer.adjust_for_ambient_noise(source, duration=1)
-        
-        while True:
-            if not is_recording:
-                time.sleep(0.5)
-                continue
-            
+    try:
+        while practice.is_recording:
             try:
-                print("🎙 Listening...")
-                audio = recognizer.listen(source, phrase_time_limit=6)
-                
-                if not is_recording:
-                    break
+                audio = capture.get_utterance(timeout=0.5)
+                if audio is None:
+                    continue
                 
-                text = recognizer.recognize_google(audio)
+                text = transcriber.transcribe(audio)
                 print(f"🗣 Detected: {text}")
                 
                 # Analyze the text
-                analysis = analyze_text_softskills(text)
-                print(f"📊 Analysis: Conf={analysis['confidence']}, Clar={analysis['clarity']}, Flu={analysis['fluency']}, Total={analysis['score']}")
+                analysis = analyze_text_softskills(text, audio.prosody)
+                print(f"📊 Analysis: Conf={analysis['confidence']}, Clar={analysis['clarity']}, Flu={analysis['fluency']}, Delivery={analysis.get('delivery', '-')}, Total={analysis['score']}")
                 
-                current_feedback = {
-                    "text": text,
-                    "analysis": analysis,
-                    "timestamp": time.time()
-                }
-                
-                # Store for final report
-                all_transcripts.append(text)
-                all_scores.append(analysis)
+                # Store for live feedback and final report
+                practice.add_result(text, analysis)
                 
             except sr.UnknownValueError:
                 pass  # Could not understand
@@ -1111,69 +968,78 @@ def listen_speech():
             except Exception as e:
                 print(f"⚠ Error: {e}")
                 time.sleep(1)
+    finally:
+        capture.stop()
 
 # --- Video feed generator ---
-def generate_frames():
-    """Generate video frames with overlays"""
-    global camera, is_recording, scroll_text, video_frames
+def render_frame(frame, overlay, width=None):
+    """Draw a session's overlay state onto a camera frame, then resize"""
+    is_recording, scroll_text, scroll_x, feedback = overlay
+    
+    # Nothing to draw - encode the shared frame as is
+    if not (is_recording or scroll_text or feedback) and not (width and width < frame.shape[1]):
+        return frame
+    
+    # The captured frame is shared by all clients - draw on a private copy
+    frame = frame.copy()
+    
+    # Add scrolling text on a semi-transparent background if recording
+    if scroll_text:
+        compositor.banner(frame, 10, 60, 0.5)
+        compositor.text(frame, [(scroll_text, (0, 255, 255))], (scroll_x, 45), 0.8, 2)
+    
+    # Add feedback overlay
+    if feedback:
+        confidence, clarity, fluency, delivery, score, max_score = feedback
+        feedback_lines = [
+            f"Confidence: {confidence:.1f}/30",
+            f"Clarity: {clarity:.1f}/30",
+            f"Fluency: {fluency:.1f}/20"
+        ]
+        if delivery is not None:  # Missing when there was too little audio
+            feedback_lines.append(f"Delivery: {delivery:.1f}/20")
+        feedback_lines.append(f"Total: {score:.1f}/{max_score}")
+        compositor.text(frame, [(line, (0, 255, 0)) for line in feedback_lines], (10, 80), 0.6, 2, line_height=30)
     
-    if camera is None or not camera.isOpened():
-        camera = cv2.VideoCapture(0)
+    # Add recording indicator
+    if is_recording:
+        cv2.circle(frame, (frame.shape[1] - 30, 30), 10, (0, 0, 255), -1)
+        cv2.putText(frame, "REC", (frame.shape[1] - 80, 35), 
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 255), 2)
     
-    scroll_x = 0
+    # Downscale for this stream if requested
+    if width and width < frame.shape[1]:
+        height = int(frame.shape[0] * width / frame.shape[1])
+        frame = cv2.resize(frame, (width, height), interpolation=cv2.INTER_AREA)
     
-    while True:
-        success, frame = camera.read()
-        if not success:
-            break
-        
-        frame = cv2.flip(frame, 1)
-        
-        # Record frame if active
-        if is_recording:
-            video_frames.append(frame.copy())
-        
-        # Add scrolling text if recording
-        if is_recording and scroll_text:
-            scroll_x -= scroll_speed
-            if scroll_x < -len(scroll_text) * 15:
-                scroll_x = frame.shape[1]
+    return frame
+
+def generate_frames(practice, client):
+    """Generate video frames with this session's overlays, paced for this client"""
+    stream_clients.add(client)
+    try:
+        for version, shared_frame in camera_stream.frames():
+            # Record frame if active
+            if practice.is_recording:
+                practice.record_frame(version, shared_frame)
             
-            # Add semi-transparent background
-            overlay = frame.copy()
-            cv2.rectangle(overlay, (0, 10), (frame.shape[1], 60), (0, 0, 0), -1)
-            cv2.addWeighted(overlay, 0.5, frame, 0.5, 0, frame)
+            if not client.should_send(version):
+                continue
             
-            cv2.putText(frame, scroll_text, (int(scroll_x), 45), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 255), 2)
-        
-        # Add feedback overlay
-        if current_feedback:
-            y_offset = 80
-            feedback_lines = [
-                f"Confidence: {current_feedback['analysis']['confidence']:.1f}/30",
-                f"Clarity: {current_feedback['analysis']['clarity']:.1f}/30",
-                f"Fluency: {current_feedback['analysis']['fluency']:.1f}/20",
-                f"Total: {current_feedback['analysis']['score']:.1f}/80"
-            ]
+            # Encode once per frame/overlay/quality/size and share with other clients
+            overlay = practice.overlay_state(version, shared_frame.shape[1])
+            quality, width = client.encode_settings(shared_frame.shape[1])
+            jpeg = frame_cache.get(version, overlay, quality, width,
+                                   lambda: render_frame(shared_frame, overlay, width))
+            if jpeg is None:
+                continue
             
-            for line in feedback_lines:
-                cv2.putText(frame, line, (10, y_offset), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
-                y_offset += 30
-        
-        # Add recording indicator
-        if is_recording:
-            cv2.circle(frame, (frame.shape[1] - 30, 30), 10, (0, 0, 255), -1)
-            cv2.putText(frame, "REC", (frame.shape[1] - 80, 35), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 255), 2)
-        
-        # Encode frame
-        _, buffer = cv2.imencode('.jpg', frame)
-        frame = buffer.tobytes()
-        
-        yield (b'--frame\r\n'
-               b'Content-Type: image/jpeg\r\n\r\n' + frame + b'\r\n')
+            client.before_yield(len(jpeg))
+            yield (b'--frame\r\n'
+                   b'Content-Type: image/jpeg\r\n\r\n' + jpeg + b'\r\n')
+            client.after_yield()
+    finally:
+        stream_clients.remove(client)
 
 # --- Routes ---
 @app.route('/')
@@ -1193,78 +1059,95 @@ def interview_practice():
 
 @app.route('/video_feed')
 def video_feed():
-    """Video streaming route"""
-    return Response(generate_frames(),
+    """
+    Video streaming route. Optional per-stream settings:
+    ?quality=10-100, ?width=<pixels>, ?adaptive=1 to adjust to the client's speed
+    """
+    session_id = current_session_id()
+    practice = sessions.practice(session_id)
+    quality = min(max(request.args.get('quality', DEFAULT_JPEG_QUALITY, type=int), 10), 100)
+    width = request.args.get('width', type=int)
+    if width is not None:
+        width = min(max(width, 160), 1920)
+    adaptive = request.args.get('adaptive', '0') in ('1', 'true')
+    client = StreamClient(session_id, quality, width, adaptive)
+    return Response(generate_frames(practice, client),
                    mimetype='multipart/x-mixed-replace; boundary=frame')
 
+@app.route('/video_feed_stats')
+def video_feed_stats():
+    """Per-client video stream statistics for this session (?all=1 for every session)"""
+    session_id = None if request.args.get('all') == '1' else current_session_id()
+    return jsonify({
+        'clients': stream_clients.stats(session_id),
+        'camera_frames': camera_stream.frames_captured,
+        'encodes': frame_cache.encodes,
+        'encode_cache_hits': frame_cache.hits
+    })
+
 @app.route('/start_recording', methods=['POST'])
 def start_recording():
     """Start recording session"""
-    global is_recording, recording_start_time, all_transcripts, all_scores
-    global video_frames, scroll_text, speech_thread, current_feedback
-    
-    if not is_recording:
-        is_recording = True
-        recording_start_time = time.time()
-        all_transcripts = []
-        all_scores = []
-        video_frames = []
-        current_feedback = {}  # Clear old feedback
-        rng = np.random.default_rng()
-        scroll_text = rng.choice(SAMPLE_TEXTS)
-
+    practice = sessions.practice(current_session_id())
+    rng = np.random.default_rng()
+    
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    video_path = os.path.join(RECORDINGS_FOLDER, f"recording_{timestamp}_{current_session_id()[:8]}.mp4")
+    
+    if practice.start(str(rng.choice(SAMPLE_TEXTS)), video_path):
         print("🎬 Starting new recording session")
 
         # Start speech recognition thread if not running
-        if speech_thread is None or not speech_thread.is_alive():
-            speech_thread = threading.Thread(target=listen_speech, daemon=True)
-            speech_thread.start()
+        if practice.speech_thread is None or not practice.speech_thread.is_alive():
+            practice.speech_thread = threading.Thread(target=listen_speech, args=(practice,), daemon=True)
+            practice.speech_thread.start()
 
-        return jsonify({"status": "started", "text": scroll_text})
+        return jsonify({"status": "started", "text": practice.scroll_text})
     
     return jsonify({"status": "already_recording"})
 
 @app.route('/stop_recording', methods=['POST'])
 def stop_recording():
     """Stop recording and generate report"""
-    global is_recording, recording_start_time, all_transcripts, all_scores
+    practice = sessions.practice(current_session_id())
+    result = practice.stop()
     
-    if is_recording:
-        is_recording = False
-        duration = time.time() - recording_start_time
+    if result is not None:
+        all_transcripts, all_scores, duration, recorder = result
         
         # Generate report
         report = generate_improvement_report(all_transcripts, all_scores, duration)
         
-        # Save report
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        report_filename = f"reports/report_{timestamp}.json"
+        # Save report (written in the background)
+        report_id = reports.save(PRACTICE, report, session_id=current_session_id())
         
-        os.makedirs("reports", exist_ok=True)
-        with open(report_filename, 'w', encoding='utf-8') as f:
-            json.dump(report, f, indent=2, ensure_ascii=False)
+        # The video was written while recording; wait for the last frames, so the file is complete
+        # before the client is told it can download it
+        finished = recorder is not None and recorder.join(SAVE_TIMEOUT)
+        if recorder is not None and not finished:
+            print(f"⚠️ Recording {recorder.path} was not finished within {SAVE_TIMEOUT:.0f}s")
+        saved = finished and recorder.saved
         
         return jsonify({
             "status": "stopped",
             "report": report,
-            "filename": report_filename
+            "filename": report_id,
+            "video_filename": os.path.basename(recorder.path) if saved else None,
+            "video_frames_dropped": recorder.frames_dropped if recorder is not None else 0
         })
     
     return jsonify({"status": "not_recording"})
 
-@app.route('/get_feedback')
-def get_feedback():
-    """Get current feedback"""
-    global current_feedback, is_recording
+def feedback_payload(practice):
+    """Current practice feedback as a JSON-serializable dict"""
+    is_recording, feedback_copy = practice.feedback_snapshot()
     
-    if is_recording and current_feedback and 'analysis' in current_feedback:
-        feedback_copy = current_feedback.copy()
-        print(f"📊 Sending feedback: {feedback_copy['analysis']}")
-        return jsonify(feedback_copy)
+    if is_recording and 'analysis' in feedback_copy:
+        return feedback_copy
     
     # Return empty scores if recording but no speech yet
     if is_recording:
-        return jsonify({
+        return {
             "status": "listening",
             "analysis": {
                 "confidence": 0,
@@ -1273,46 +1156,134 @@ def get_feedback():
                 "score": 0
             },
             "text": ""
-        })
+        }
     
-    return jsonify({"status": "not_recording", "analysis": None})
+    return {"status": "not_recording", "analysis": None}
+
+@app.route('/get_feedback')
+def get_feedback():
+    """Get current feedback (polling fallback for /events)"""
+    feedback = feedback_payload(sessions.practice(current_session_id()))
+    if feedback.get('text'):
+        print(f"📊 Sending feedback: {feedback['analysis']}")
+    return jsonify(feedback)
 
 @app.route('/set_speed', methods=['POST'])
 def set_speed():
     """Set scrolling text speed"""
-    global scroll_speed
+    practice = sessions.practice(current_session_id())
     data = request.json
     speed = data.get('speed', 3)
     
     if 1 <= speed <= 20:
-        scroll_speed = speed
-        return jsonify({"status": "success", "speed": scroll_speed})
+        practice.scroll_speed = speed
+        return jsonify({"status": "success", "speed": practice.scroll_speed})
     
     return jsonify({"status": "error", "message": "Speed must be between 1 and 20"})
 
 @app.route('/download_report/<path:filename>')
 def download_report(filename):
-    """Download report file"""
-    try:
-        # Get the full path to the file
-        file_path = os.path.join(os.getcwd(), filename)
-        
-        if not os.path.exists(file_path):
-            return jsonify({"error": f"File not found: {filename}"}), 404
-        
-        return send_file(file_path, 
-                        as_attachment=True,
-                        download_name=os.path.basename(filename),
-                        mimetype='application/json')
-    except Exception as e:
-        print(f"❌ Error downloading report: {e}")
-        return jsonify({"error": str(e)}), 404
+    """Download a report by id (older links used its file path)"""
+    report_id = os.path.splitext(os.path.basename(filename))[0]
+    report = reports.get(report_id)
+    
+    if report is None:
+        return jsonify({"error": f"File not found: {filename}"}), 404
+    
+    return send_file(BytesIO(json.dumps(report, indent=2, ensure_ascii=False).encode('utf-8')),
+                    as_attachment=True,
+                    download_name=f"{report_id}.json",
+                    mimetype='application/json')
+
+@app.route('/reports')
+def list_reports():
+    """Index of saved reports, newest first. ?kind=practice|interview, ?mine=1 and ?limit=N filter it"""
+    kind = request.args.get('kind')
+    if kind not in (None, PRACTICE, INTERVIEW):
+        return jsonify({"error": f"Unknown report kind: {kind}"}), 400
+    session_id = current_session_id() if request.args.get('mine') == '1' else None
+    limit = min(request.args.get('limit', 50, type=int), 500)
+    return jsonify({"reports": reports.list(kind, session_id, limit)})
+
+@app.route('/history')
+def report_history():
+    """
+    This browser's confidence, clarity, fluency and overall score over time. ?kind=practice|interview
+    and ?limit=N filter it. Reports saved before sessions were recorded belong to no browser's history.
+    """
+    kind = request.args.get('kind')
+    if kind not in (None, PRACTICE, INTERVIEW):
+        return jsonify({"error": f"Unknown report kind: {kind}"}), 400
+    limit = min(request.args.get('limit', 100, type=int), 1000)
+    return jsonify(reports.history(current_session_id(), kind, limit))
+
+@app.route('/recognition_stats')
+def recognition_stats():
+    """Speech recognition, prompt-to-listening handoff, TTS cache, AI call, scoring, model loading and report store statistics"""
+    stats = transcriber.stats()
+    stats['audio_device'] = handoffs.stats()
+    stats['tts'] = tts.stats()
+    stats['llm'] = llm.stats()
+    stats['soft_skills'] = scorer.stats()
+    stats['models'] = models.stats()
+    stats['reports'] = reports.stats()
+    if sentiment_service is not None:
+        stats['sentiment'] = sentiment_service.stats()
+    return jsonify(stats)
+
+@app.route('/download_recording/<filename>')
+def download_recording(filename):
+    """Download a recorded practice video"""
+    file_path = os.path.join(os.getcwd(), RECORDINGS_FOLDER, secure_filename(filename))
+    
+    if not os.path.exists(file_path):
+        return jsonify({"error": f"Recording not found: {filename}"}), 404
+    
+    return send_file(file_path, as_attachment=True, download_name=os.path.basename(file_path),
+                    mimetype='video/mp4')
 
 # --- Interview Practice Routes ---
 def allowed_file(filename):
     """Check if file extension is allowed"""
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+# --- Resume cache ---
+# Bump (or the skills.json version) when the question prompt or rules change, so cached sets are regenerated
+QUESTION_GENERATOR_VERSION = 2
+resume_cache = ResumeCache()
+
+def parse_resume_cached(file_path):
+    """parse_resume() with the extracted text cached by file content hash and extractor version"""
+    digest = sha256_of_file(file_path)
+    name = f"text-{EXTRACTOR_VERSION}"
+    cached = resume_cache.get(digest, name)
+    if cached is not None:
+        print(f"⚡ Resume text from cache ({len(cached['text'])} characters)")
+        return cached['text']
+    text = parse_resume(file_path)
+    if text:  # Extraction errors return "" - don't remember those
+        resume_cache.put(digest, name, {'text': text})
+    return text
+
+def generate_questions_cached(resume_text):
+    """generate_interview_questions_from_resume() with question sets cached by resume content and generator"""
+    mode = 'ai' if llm.available else 'keywords'
+    name = f"questions-v{QUESTION_GENERATOR_VERSION}.{skills.version}-{mode}"
+    digest = hashlib.sha256(resume_text.encode('utf-8')).hexdigest()
+    cached = resume_cache.get(digest, name)
+    if cached is not None:
+        print(f"⚡ {len(cached)} interview questions from cache")
+        return cached
+    questions, source = generate_questions_with_source(resume_text)
+    # An AI failure falls back to keyword/default questions - retry the AI next time instead of caching them
+    if resume_text and (mode == 'keywords' or source == 'ai'):
+        resume_cache.put(digest, name, questions)
+    return questions
+
+# Resume parsing, question generation and audio synthesis run in the background after upload
+resume_jobs = ResumeJobRunner(parse_resume_cached, generate_questions_cached,
+                              prefetch=lambda questions: tts.prefetch(interview_prompts(questions)))
+
 @app.route('/upload_resume', methods=['POST'])
 def upload_resume():
     """Handle resume upload"""
@@ -1331,28 +1302,30 @@ def upload_resume():
         if not allowed_file(file.filename):
             return jsonify({"error": "Invalid file type. Please upload PDF, DOC, or DOCX"}), 400
         
-        # Create upload directory if it doesn't exist
-        os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
-        
-        # Save file with secure filename
+        # Save file under its content hash - uploading the same resume again reuses the stored copy
         filename = secure_filename(file.filename)
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        unique_filename = f"{timestamp}_{filename}"
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], unique_filename)
+        extension = os.path.splitext(filename)[1].lower()
+        _, filepath, is_new = resume_cache.store_upload(file, app.config['UPLOAD_FOLDER'], extension)
+        unique_filename = os.path.basename(filepath)
+        if not is_new:
+            print(f"♻️ Resume already uploaded before - reusing {unique_filename}")
         
-        file.save(filepath)
+        # Parse it and generate questions now, while the candidate gets ready
+        job = resume_jobs.submit(filepath)
         
         # Store resume info in session
         session['resume_filename'] = unique_filename
         session['resume_path'] = filepath
         session['original_filename'] = filename
+        session['resume_job'] = job.id
         
-        print(f"✅ Resume uploaded: {filename} -> {unique_filename}")
+        print(f"✅ Resume uploaded: {filename} -> {unique_filename} (preparation job {job.id})")
         
         return jsonify({
             "status": "success",
             "message": "Resume uploaded successfully",
-            "filename": unique_filename
+            "filename": unique_filename,
+            "job_id": job.id
         }), 200
         
     except Exception as e:
@@ -1378,128 +1351,155 @@ def get_resume_info():
         })
     return jsonify({'filename': None})
 
+@app.route('/resume_status')
+def resume_status():
+    """Progress of the background preparation of the uploaded resume"""
+    job = resume_jobs.get(session.get('resume_job'))
+    if job is None:
+        return jsonify({'status': 'none'})
+    return jsonify(job.snapshot())
+
 @app.route('/start_interview', methods=['POST'])
 def start_interview():
     """Start AI interview session with resume-based questions"""
-    global interview_active, interview_questions, current_question_index
-    global interview_responses, interview_messages, interview_start_time, interview_thread
-    global conversation_history
-    
-    if not interview_active:
-        interview_active = True
-        interview_start_time = time.time()
-        current_question_index = 0
-        interview_responses = []
-        interview_messages = []
-        conversation_history = []  # Clear conversation history for new interview
-        
-        # Parse uploaded resume and generate questions
-        resume_filename = session.get('resume_filename', '')
-        resume_path = session.get('resume_path', '')
-        
-        print(f"📄 Resume file: {resume_filename}")
-        print(f"📂 Resume path: {resume_path}")
-        
-        # Extract text from resume
+    interview = sessions.interview(current_session_id())
+    
+    if interview.active:
+        return jsonify({'status': 'already_active'})
+    
+    # Parse uploaded resume and generate questions
+    resume_filename = session.get('resume_filename', '')
+    resume_path = session.get('resume_path', '')
+    
+    print(f"📄 Resume file: {resume_filename}")
+    print(f"📂 Resume path: {resume_path}")
+    
+    # Use the questions prepared in the background after upload, waiting if the job is still running
+    job = resume_jobs.get(session.get('resume_job'))
+    if job is not None and job.wait(timeout=30.0):
+        resume_text, questions = job.resume_text, job.questions
+        print(f"✅ Using prepared resume job {job.id} ({len(questions)} questions)")
+    else:
+        # No job (e.g. the server restarted since upload) or it failed - prepare inline
         resume_text = ""
         if resume_path and os.path.exists(resume_path):
-            resume_text = parse_resume(resume_path)
-            session['resume_text'] = resume_text  # Store for report generation
+            resume_text = parse_resume_cached(resume_path)
             print(f"✅ Extracted {len(resume_text)} characters from resume")
         else:
             print("⚠️ No resume found, using default questions")
         
         # Generate questions from resume
-        interview_questions = generate_interview_questions_from_resume(resume_text)
-        print(f"📋 Generated {len(interview_questions)} questions")
-        
-        print("🎬 Starting resume-based AI interview session")
-        
-        # Start interview conversation thread
-        if interview_thread is None or not interview_thread.is_alive():
-            interview_thread = threading.Thread(target=interview_conversation_thread, daemon=True)
-            interview_thread.start()
-        
-        # The greeting will be spoken by the thread
-        greeting = "Starting your personalized interview..."
-        
-        return jsonify({
-            'status': 'success',
-            'greeting_text': greeting,
-            'total_questions': len(interview_questions)
-        })
+        questions = generate_questions_cached(resume_text)
+        print(f"📋 Generated {len(questions)} questions")
+        tts.prefetch(interview_prompts(questions))  # Synthesize while the greeting plays
+    
+    if not interview.start(questions, resume_text):
+        return jsonify({'status': 'already_active'})
+    interview.resume_filename = session.get('original_filename', 'Unknown')
+    
+    print("🎬 Starting resume-based AI interview session")
     
-    return jsonify({'status': 'already_active'})
+    # Start interview conversation thread
+    if interview.thread is None or not interview.thread.is_alive():
+        interview.thread = threading.Thread(target=interview_conversation_thread, args=(interview,), daemon=True)
+        interview.thread.start()
+    
+    # The greeting will be spoken by the thread
+    greeting = "Starting your personalized interview..."
+    
+    return jsonify({
+        'status': 'success',
+        'greeting_text': greeting,
+        'total_questions': len(questions)
+    })
 
 
 @app.route('/end_interview', methods=['POST'])
 def end_interview():
     """End AI interview session"""
-    global interview_active
-    
-    interview_active = False
-    duration = time.time() - interview_start_time if interview_start_time else 0
+    interview = sessions.interview(current_session_id())
+    interview.active = False
     
     # Save interview data
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    interview_data = {
-        'timestamp': timestamp,
-        'duration': duration,
-        'questions': interview_questions,
-        'responses': interview_responses,
-        'messages': interview_messages,
-        'resume_filename': session.get('original_filename', 'Unknown')
-    }
+    interview_data = {'timestamp': timestamp}
+    interview_data.update(interview.report_data())
     
-    # Save to file
-    os.makedirs('reports/interviews', exist_ok=True)
-    report_file = f'reports/interviews/interview_{timestamp}.json'
-    with open(report_file, 'w', encoding='utf-8') as f:
-        json.dump(interview_data, f, indent=2, ensure_ascii=False)
+    # Score every answer in one batch, using the prosody captured with it
+    responses = interview_data['responses'] = [dict(r) for r in interview_data['responses']]
+    scores = scorer.score_batch([r['answer'] for r in responses], [r.get('prosody') for r in responses])
+    for response, analysis in zip(responses, scores):
+        response['analysis'] = analysis
+    if scores:
+        interview_data['average_score_percent'] = round(sum(a['score'] * 100 / a['max_score'] for a in scores) / len(scores), 1)
     
-    session['last_interview_report'] = report_file
+    # Save report (written in the background)
+    report_id = reports.save(INTERVIEW, interview_data, session_id=current_session_id())
+    session['last_interview_report'] = report_id
     
-    print(f"✅ Interview ended - Report saved: {report_file}")
+    print(f"✅ Interview ended - Report {report_id} queued for saving")
     
     return jsonify({
         'status': 'success',
-        'report_file': report_file,
-        'questions_answered': len(interview_responses)
+        'report_file': report_id,
+        'questions_answered': len(interview_data['responses'])
     })
 
+def interview_payload(interview):
+    """Interview state plus the messages the browser has not seen yet"""
+    state = interview.state_snapshot()
+    state['new_messages'] = interview.drain_messages()
+    return state
+
 @app.route('/get_interview_state')
 def get_interview_state():
-    """Get current interview state"""
-    global ai_speaking, user_listening, current_question_index
-    
-    # Get new messages from queue
-    new_messages = []
-    while not message_queue.empty():
-        try:
-            new_messages.append(message_queue.get_nowait())
-        except Exception:
-            break
-    
-    current_q = None
-    if current_question_index < len(interview_questions):
-        current_q = {
-            'number': current_question_index + 1,
-            'text': interview_questions[current_question_index]
-        }
-    
-    return jsonify({
-        'ai_speaking': ai_speaking,
-        'listening': user_listening,
-        'current_question': current_q,
-        'questions_answered': len(interview_responses),
-        'interview_complete': current_question_index >= len(interview_questions),
-        'new_messages': new_messages
-    })
+    """Get current interview state (polling fallback for /events)"""
+    return jsonify(interview_payload(sessions.interview(current_session_id())))
+
+def sse_event(event, data):
+    """Format one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def session_events(user_session, channel, keepalive=15.0):
+    """
+    Server-Sent Events for one browser tab. Waits on the session's change
+    notifier and pushes the practice feedback or interview state as soon as
+    it changes, instead of the page polling every second.
+    """
+    part = user_session.interview if channel == 'interview' else user_session.practice
+    payload = interview_payload if channel == 'interview' else feedback_payload
+    event = 'interview' if channel == 'interview' else 'feedback'
+
+    yield "retry: 2000\n\n"  # Reconnect delay for the browser
+    yield sse_event(event, payload(part))
+    seen = part.version
+    changes = user_session.changes.version
+    while True:
+        new_changes = user_session.changes.wait(changes, timeout=keepalive)
+        if new_changes == changes:
+            yield ": keep-alive\n\n"  # Lets the server notice closed connections
+            continue
+        changes = new_changes
+        user_session.last_seen = time.time()
+        if part.version != seen:
+            seen = part.version
+            yield sse_event(event, payload(part))
+
+@app.route('/events')
+def events():
+    """Stream practice feedback (?channel=practice) or interview state (?channel=interview)"""
+    channel = request.args.get('channel', 'practice')
+    if channel not in ('practice', 'interview'):
+        return jsonify({'status': 'error', 'message': 'Unknown channel'}), 400
+    user_session = sessions.get(current_session_id())
+    return Response(session_events(user_session, channel),
+                    mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
 
 @app.route('/get_improvement_report', methods=['GET'])
 def get_improvement_report():
     """Get the improvement report generated after interview"""
-    report = session.get('improvement_report', '')
+    report = sessions.interview(current_session_id()).improvement_report
     
     if report:
         return jsonify({
@@ -1515,12 +1515,13 @@ def get_improvement_report():
 @app.route('/interview_report')
 def interview_report():
     """Display interview report"""
-    if 'last_interview_report' in session:
-        report_file = session['last_interview_report']
-        if os.path.exists(report_file):
-            with open(report_file, 'r', encoding='utf-8') as f:
-                report_data = json.load(f)
-            return jsonify(report_data)
+    report_id = session.get('last_interview_report')
+    if report_id is None:
+        latest = reports.latest(INTERVIEW, current_session_id())
+        report_id = latest['id'] if latest else None
+    report_data = reports.get(report_id) if report_id else None
+    if report_data is not None:
+        return jsonify(report_data)
     return jsonify({'error': 'No interview report available'})
 
 if __name__ == '__main__':
@@ -1531,4 +1532,8 @@ if __name__ == '__main__':
     print("Access the application at: http://localhost:5000")
     print("="*60 + "\n")
     
+    # Load models and libraries in the background so the first real request does not wait for them
+    if os.environ.get('WARM_UP_MODELS', '1') == '1':
+        models.warm_up()
+    
     app.run(debug=True, host='0.0.0.0', port=5000, threaded=True)